@@ -0,0 +1,133 @@
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from bson.binary import Binary
+
+if __package__:
+    from .db import INTERVIEW_SESSIONS, INTERVIEWS, get_async_interview_artifacts_collection
+else:
+    from db import INTERVIEW_SESSIONS, INTERVIEWS, get_async_interview_artifacts_collection
+
+try:
+    import zstandard
+except ImportError:  # zlib is used instead
+    zstandard = None
+
+# Move raw, rarely read fields (resume text, LLM output, full session
+# answers) out of the hot documents into compressed interview_artifacts.
+ARTIFACT_OFFLOAD_ENABLED = os.getenv("ARTIFACT_OFFLOAD_ENABLED", "1").lower() not in {"0", "false", "no"}
+# zstd, zlib or none. zstd needs the optional zstandard package and falls
+# back to zlib without it; the codec is stored with every blob.
+ARTIFACT_CODEC = os.getenv("ARTIFACT_CODEC", "zstd")
+ARTIFACT_COMPRESSION_LEVEL = int(os.getenv("ARTIFACT_COMPRESSION_LEVEL", "6"))
+# Days raw artifacts are kept after the owning document was created; 0
+# keeps them for good.
+RESUME_ARTIFACT_TTL_DAYS = float(os.getenv("RESUME_ARTIFACT_TTL_DAYS", "90"))
+SESSION_ARTIFACT_TTL_DAYS = float(os.getenv("SESSION_ARTIFACT_TTL_DAYS", "0"))
+
+# Offloaded fields per owning collection.
+INTERVIEW_RAW_FIELDS = ("resume_text", "llm_raw_output")
+SESSION_RAW_FIELDS = ("answers",)
+TTL_DAYS = {INTERVIEWS: RESUME_ARTIFACT_TTL_DAYS, INTERVIEW_SESSIONS: SESSION_ARTIFACT_TTL_DAYS}
+
+
+def _codec() -> str:
+    if ARTIFACT_CODEC == "zstd" and zstandard is None:
+        return "zlib"
+    return ARTIFACT_CODEC
+
+
+def compress(data: bytes) -> Tuple[str, bytes]:
+    codec = _codec()
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=ARTIFACT_COMPRESSION_LEVEL).compress(data)
+    if codec == "zlib":
+        return codec, zlib.compress(data, min(ARTIFACT_COMPRESSION_LEVEL, 9))
+    return "none", data
+
+
+def decompress(codec: str, blob: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd artifacts")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == "zlib":
+        return zlib.decompress(blob)
+    return blob
+
+
+def split_document(document: dict, fields: Iterable[str]) -> Tuple[dict, Dict[str, object]]:
+    """Returns (hot document, offloaded fields). Empty fields stay out of
+    both."""
+    hot = dict(document)
+    raw = {}
+    for field in fields:
+        value = hot.pop(field, None)
+        if value not in (None, "", []):
+            raw[field] = value
+    return hot, raw
+
+
+def build_artifact(owner_id: ObjectId, source: str, raw: Dict[str, object], created_at: datetime) -> dict:
+    """Side document for ``raw``, sharing the owner's ``_id``."""
+    payload = json.dumps(raw, default=str, separators=(",", ":")).encode("utf-8")
+    codec, blob = compress(payload)
+    ttl_days = TTL_DAYS.get(source, 0)
+    return {
+        "_id": owner_id,
+        "source": source,
+        "fields": sorted(raw),
+        "codec": codec,
+        "data": Binary(blob),
+        "raw_bytes": len(payload),
+        "stored_bytes": len(blob),
+        "created_at": created_at,
+        "expires_at": created_at + timedelta(days=ttl_days) if ttl_days > 0 else None,
+    }
+
+
+def prepare_offload(document: dict, source: str, fields: Iterable[str]) -> Tuple[dict, Optional[dict]]:
+    """Split a new document into what goes to ``source`` and its artifact.
+
+    Assigns the ``_id`` up front so both can be written independently.
+    Returns (hot document, artifact or None).
+    """
+    if not ARTIFACT_OFFLOAD_ENABLED:
+        return document, None
+    hot, raw = split_document(document, fields)
+    if not raw:
+        return document, None
+    hot.setdefault("_id", ObjectId())
+    return hot, build_artifact(hot["_id"], source, raw, hot.get("created_at") or datetime.utcnow())
+
+
+async def save_artifacts(artifacts: Iterable[Optional[dict]]) -> None:
+    artifacts = [artifact for artifact in artifacts if artifact is not None]
+    if artifacts:
+        await get_async_interview_artifacts_collection().insert_many(artifacts, ordered=False)
+
+
+async def upsert_artifact(artifact: Optional[dict]) -> None:
+    """Write one artifact, replacing any earlier one for the same owner (a
+    retried or concurrent request)."""
+    if artifact is not None:
+        await get_async_interview_artifacts_collection().replace_one({"_id": artifact["_id"]}, artifact, upsert=True)
+
+
+async def load_raw_fields(document: dict, fields: Iterable[str]) -> Dict[str, object]:
+    """Raw fields of ``document``, read from the document itself when it
+    predates offloading, otherwise from its artifact. Expired or missing
+    artifacts give an empty result."""
+    fields = tuple(fields)
+    raw = {field: document[field] for field in fields if field in document}
+    if len(raw) == len(fields):
+        return raw
+    artifact = await get_async_interview_artifacts_collection().find_one({"_id": document["_id"]})
+    if artifact:
+        stored = json.loads(decompress(artifact["codec"], bytes(artifact["data"])))
+        raw.update({field: stored[field] for field in fields if field in stored and field not in raw})
+    return raw
@@ -1,6 +1,8 @@
 import os
 import random
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException
@@ -9,9 +11,11 @@ from jose import JWTError, jwt
 from pydantic import BaseModel, EmailStr, Field
 
 if __package__:
-    from .db import get_admins_collection
+    from .cache import TTLCache
+    from .db import get_async_admins_collection
 else:
-    from db import get_admins_collection
+    from cache import TTLCache
+    from db import get_async_admins_collection
 
 router = APIRouter(prefix="/auth", tags=["Admin Auth"])
 
@@ -20,6 +24,18 @@ ALGORITHM = "HS256"
 EXPIRE_MIN = 60
 
 security = HTTPBearer()
+# For endpoints that are public but reveal more to admins.
+optional_security = HTTPBearer(auto_error=False)
+
+# Admin documents are cached per process, so a change made through another
+# worker is picked up after at most ADMIN_CACHE_TTL_SECONDS.
+ADMIN_CACHE_TTL_SECONDS = float(os.getenv("ADMIN_CACHE_TTL_SECONDS", "30"))
+ADMIN_CACHE_MAX_ENTRIES = int(os.getenv("ADMIN_CACHE_MAX_ENTRIES", "1024"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "4096"))
+
+_admin_cache = TTLCache(ADMIN_CACHE_MAX_ENTRIES, ADMIN_CACHE_TTL_SECONDS)
+# Decoded claims, each kept until the token's own exp.
+_token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES, EXPIRE_MIN * 60)
 
 
 class AdminRegister(BaseModel):
@@ -68,20 +84,47 @@ def create_token(data: dict):
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_admin(cred: HTTPAuthorizationCredentials = Depends(security)):
+def decode_token(token: str) -> dict:
+    claims = _token_cache.get(token)
+    if claims is not None:
+        if claims["exp"] > time.time():
+            return claims
+        _token_cache.pop(token)
+
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    _token_cache.put(token, claims, ttl_seconds=claims["exp"] - time.time())
+    return claims
+
+
+def invalidate_admin(admin_id) -> None:
+    _admin_cache.pop(str(admin_id))
+
+
+async def get_current_admin(cred: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(cred.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(cred.credentials)
         admin_id = payload.get("admin_id")
         if not admin_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-        admin = get_admins_collection().find_one({"_id": ObjectId(admin_id)})
-        if not admin:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return admin
+        admin = _admin_cache.get(admin_id)
+        if admin is None:
+            admin = await get_async_admins_collection().find_one({"_id": ObjectId(admin_id)})
+            if not admin:
+                raise HTTPException(status_code=401, detail="Invalid token")
+            _admin_cache.put(admin_id, admin)
+        # Callers get their own copy so the cached document stays intact.
+        return dict(admin)
     except (JWTError, Exception):
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+async def get_optional_admin(cred: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    """The admin for a bearer token, or None without one; a bad token is still 401."""
+    if cred is None:
+        return None
+    return await get_current_admin(cred)
+
+
 def admin_to_out(admin_doc: dict) -> AdminOut:
     return AdminOut(
         id=str(admin_doc["_id"]),
@@ -93,15 +136,15 @@ def admin_to_out(admin_doc: dict) -> AdminOut:
 
 
 @router.post("/admin/register")
-def register(data: AdminRegister):
+async def register(data: AdminRegister):
     if data.password != data.confirm_password:
         raise HTTPException(status_code=400, detail="Passwords do not match")
 
-    admins = get_admins_collection()
-    if admins.find_one({"email": data.email}):
+    admins = get_async_admins_collection()
+    if await admins.find_one({"email": data.email}):
         raise HTTPException(status_code=400, detail="Admin exists")
 
-    admins.insert_one(
+    await admins.insert_one(
         {
             "first_name": data.first_name,
             "last_name": data.last_name,
@@ -118,9 +161,9 @@ def register(data: AdminRegister):
 
 
 @router.post("/admin/login")
-def login(data: AdminLogin):
-    admins = get_admins_collection()
-    admin = admins.find_one({"email": data.email})
+async def login(data: AdminLogin):
+    admins = get_async_admins_collection()
+    admin = await admins.find_one({"email": data.email})
     if not admin or admin.get("password") != data.password:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
@@ -129,19 +172,19 @@ def login(data: AdminLogin):
 
 
 @router.get("/admin/protected")
-def protected(admin: dict = Depends(get_current_admin)):
+async def protected(admin: dict = Depends(get_current_admin)):
     return {"message": f"Hello {admin.get('first_name', 'Admin')}"}
 
 
 @router.post("/admin/forgot-password")
-def admin_forgot_password(data: ForgotPassword):
-    admins = get_admins_collection()
-    admin = admins.find_one({"email": data.email})
+async def admin_forgot_password(data: ForgotPassword):
+    admins = get_async_admins_collection()
+    admin = await admins.find_one({"email": data.email})
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
     otp = str(random.randint(100000, 999999))
-    admins.update_one(
+    await admins.update_one(
         {"_id": admin["_id"]},
         {
             "$set": {
@@ -151,15 +194,16 @@ def admin_forgot_password(data: ForgotPassword):
             }
         },
     )
+    invalidate_admin(admin["_id"])
 
     # Integrate real email/SMS provider here. Returning OTP helps local testing.
     return {"message": "OTP generated", "otp": otp}
 
 
 @router.post("/admin/verify-otp")
-def admin_verify_otp(data: VerifyOTP):
-    admins = get_admins_collection()
-    admin = admins.find_one({"email": data.email, "otp": data.otp})
+async def admin_verify_otp(data: VerifyOTP):
+    admins = get_async_admins_collection()
+    admin = await admins.find_one({"email": data.email, "otp": data.otp})
     if not admin:
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
@@ -167,20 +211,21 @@ def admin_verify_otp(data: VerifyOTP):
     if not otp_expires or otp_expires < utc_now():
         raise HTTPException(status_code=400, detail="OTP expired")
 
-    admins.update_one(
+    await admins.update_one(
         {"_id": admin["_id"]},
         {
             "$set": {"reset_allowed_until": utc_now() + timedelta(minutes=10)},
             "$unset": {"otp": "", "otp_expires": ""},
         },
     )
+    invalidate_admin(admin["_id"])
     return {"message": "OTP verified"}
 
 
 @router.post("/admin/reset-password")
-def admin_reset_password(data: ResetPassword):
-    admins = get_admins_collection()
-    admin = admins.find_one({"email": data.email})
+async def admin_reset_password(data: ResetPassword):
+    admins = get_async_admins_collection()
+    admin = await admins.find_one({"email": data.email})
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
@@ -188,7 +233,7 @@ def admin_reset_password(data: ResetPassword):
     if not reset_allowed_until or reset_allowed_until < utc_now():
         raise HTTPException(status_code=400, detail="OTP verification required")
 
-    admins.update_one(
+    await admins.update_one(
         {"_id": admin["_id"]},
         {
             "$set": {
@@ -198,10 +243,11 @@ def admin_reset_password(data: ResetPassword):
             "$unset": {"reset_allowed_until": ""},
         },
     )
+    invalidate_admin(admin["_id"])
 
     return {"message": "Password reset successful"}
 
 
 @router.get("/admin/details", response_model=AdminOut)
-def get_admin_details(admin: dict = Depends(get_current_admin)):
+async def get_admin_details(admin: dict = Depends(get_current_admin)):
     return admin_to_out(admin)
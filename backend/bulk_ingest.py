@@ -0,0 +1,357 @@
+import asyncio
+import io
+import json
+import os
+import zipfile
+from typing import AsyncIterator, Iterable, List, Tuple, Union
+
+from bson import ObjectId
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi.responses import StreamingResponse
+from pymongo.errors import BulkWriteError, PyMongoError
+
+if __package__:
+    from .artifacts import INTERVIEW_RAW_FIELDS, prepare_offload, save_artifacts
+    from .db import INTERVIEWS, get_async_interview_artifacts_collection, get_async_interviews_collection
+    from .extraction import EXTRACT_WORKERS, RESUME_MAX_BYTES, ExtractionError, sniff_document_type
+    from .metrics import stage
+    from .question_cache import question_index
+    from .resume_router import (
+        HF_API_KEY,
+        RESUME_CACHE_ENABLED,
+        _analysis_response,
+        _build_interview_document,
+        _cache_key,
+        _cached_response,
+        _extract_text,
+        _generate_questions,
+        _get_cached_analysis,
+        _pack_question_embeddings,
+    )
+else:
+    from artifacts import INTERVIEW_RAW_FIELDS, prepare_offload, save_artifacts
+    from db import INTERVIEWS, get_async_interview_artifacts_collection, get_async_interviews_collection
+    from extraction import EXTRACT_WORKERS, RESUME_MAX_BYTES, ExtractionError, sniff_document_type
+    from metrics import stage
+    from question_cache import question_index
+    from resume_router import (
+        HF_API_KEY,
+        RESUME_CACHE_ENABLED,
+        _analysis_response,
+        _build_interview_document,
+        _cache_key,
+        _cached_response,
+        _extract_text,
+        _generate_questions,
+        _get_cached_analysis,
+        _pack_question_embeddings,
+    )
+
+router = APIRouter()
+
+BULK_EXTRACT_CONCURRENCY = int(os.getenv("BULK_EXTRACT_CONCURRENCY", str(EXTRACT_WORKERS)))
+# Kept below LLM_MAX_CONCURRENCY so a large batch leaves room for live traffic.
+BULK_LLM_CONCURRENCY = int(os.getenv("BULK_LLM_CONCURRENCY", "8"))
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "25"))
+BULK_INSERT_LINGER_MS = float(os.getenv("BULK_INSERT_LINGER_MS", "200"))
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", "500"))
+BULK_MAX_TOTAL_BYTES = int(os.getenv("BULK_MAX_TOTAL_BYTES", str(256 * 1024 * 1024)))
+# Largest zip upload read; plain files are capped at RESUME_MAX_BYTES.
+BULK_MAX_ARCHIVE_BYTES = int(os.getenv("BULK_MAX_ARCHIVE_BYTES", str(BULK_MAX_TOTAL_BYTES)))
+
+BulkItem = Tuple[str, Union[bytes, Exception]]
+
+_DONE = object()
+
+
+class BatchTooLarge(Exception):
+    """The uploads exceed ``BULK_MAX_FILES`` or ``BULK_MAX_TOTAL_BYTES``."""
+
+
+def _is_archive(data: bytes) -> bool:
+    # A DOCX is a zip too; only other zips are treated as archives.
+    return data.startswith(b"PK\x03\x04") and sniff_document_type(data) != "docx"
+
+
+def expand_uploads(uploads: Iterable[BulkItem]) -> List[BulkItem]:
+    """Flatten uploads (plain files and zip archives) into per-resume items.
+
+    Items that cannot be processed carry the error instead of the bytes so
+    they are reported alongside the rest of the batch.
+    """
+    items: List[BulkItem] = []
+    total_bytes = 0
+
+    def add(name: str, data: Union[bytes, Exception]) -> None:
+        nonlocal total_bytes
+        if len(items) >= BULK_MAX_FILES:
+            raise BatchTooLarge(f"Batch exceeds {BULK_MAX_FILES} files")
+        if isinstance(data, bytes):
+            total_bytes += len(data)
+            if total_bytes > BULK_MAX_TOTAL_BYTES:
+                raise BatchTooLarge(f"Batch exceeds {BULK_MAX_TOTAL_BYTES} bytes")
+        items.append((name, data))
+
+    for filename, data in uploads:
+        if isinstance(data, Exception) or not _is_archive(data):
+            add(filename, data)
+            continue
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile:
+            add(filename, ExtractionError("Corrupt zip archive"))
+            continue
+        with archive:
+            for info in archive.infolist():
+                basename = info.filename.rsplit("/", 1)[-1]
+                if info.is_dir() or info.filename.startswith("__MACOSX/") or basename.startswith("."):
+                    continue
+                name = f"{filename}/{info.filename}"
+                # Checked before reading so a zip bomb is never inflated.
+                if info.file_size > RESUME_MAX_BYTES:
+                    add(name, ExtractionError(f"File exceeds {RESUME_MAX_BYTES} bytes", status_code=413))
+                    continue
+                try:
+                    add(name, archive.read(info))
+                except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as exc:
+                    add(name, ExtractionError(f"Could not read archive member: {exc}"))
+    return items
+
+
+def _write_failures(exc: PyMongoError, ids: list) -> dict:
+    """Error message per ``_id`` of an unordered ``insert_many`` of ``ids``."""
+    if isinstance(exc, BulkWriteError):
+        return {ids[error["index"]]: error.get("errmsg", "Write failed") for error in exc.details.get("writeErrors", [])}
+    return {_id: str(exc) for _id in ids}
+
+
+def _file_result(name: str, response: dict) -> dict:
+    return {
+        "event": "file",
+        "file": name,
+        "status": "ok",
+        "interview_id": response["interview_id"],
+        "cached": response["cached"],
+        "parse_error": response["parse_error"],
+        "semantic_match": response.get("semantic_match"),
+    }
+
+
+def _file_error(name: str, exc: Exception) -> dict:
+    detail = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+    return {
+        "event": "file",
+        "file": name,
+        "status": "error",
+        "status_code": getattr(exc, "status_code", 500),
+        "error": detail,
+    }
+
+
+async def ingest_resumes(
+    items: List[BulkItem],
+    use_cache: bool = RESUME_CACHE_ENABLED,
+    extract_concurrency: int = BULK_EXTRACT_CONCURRENCY,
+    llm_concurrency: int = BULK_LLM_CONCURRENCY,
+    insert_batch_size: int = BULK_INSERT_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """Analyze many resumes as a pipeline and yield per-file results as
+    they complete, followed by one summary event.
+
+    Extraction and LLM calls have separate concurrency limits so the CPU
+    pool and the LLM endpoint are both kept busy; parsed interviews are
+    written with ``insert_many`` in small batches. A failing file only
+    produces an error result for that file.
+    """
+    extract_slots = asyncio.Semaphore(extract_concurrency)
+    llm_slots = asyncio.Semaphore(llm_concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+    to_insert: asyncio.Queue = asyncio.Queue()
+
+    async def analyze(name: str, data: Union[bytes, Exception]) -> None:
+        try:
+            if isinstance(data, Exception):
+                raise data
+            cache_key = _cache_key(data)
+            if use_cache:
+                cached = await _get_cached_analysis(cache_key)
+                if cached is not None:
+                    await results.put(_file_result(name, _cached_response(cached)))
+                    return
+
+            async with extract_slots:
+                resume_text = await _extract_text(data)
+            # Semantic cache hits skip the LLM but still hold a slot briefly.
+            async with llm_slots:
+                llm_output, extracted_info, semantic_match = await _generate_questions(resume_text)
+
+            document, normalized_result, parse_error = _build_interview_document(
+                resume_text, llm_output, cache_key, extracted_info, semantic_match
+            )
+            await to_insert.put((name, document, normalized_result, parse_error, cache_key, semantic_match))
+        except Exception as exc:
+            await results.put(_file_error(name, exc))
+
+    async def flush(batch: list) -> None:
+        try:
+            # One encode call for the whole batch instead of one per interview.
+            embeddings = await _pack_question_embeddings([entry[2] for entry in batch])
+        except Exception:
+            # Scoring encodes the questions itself when vectors are missing.
+            embeddings = [None] * len(batch)
+
+        documents, artifacts = [], []
+        # Ids are assigned up front so partial failures can be matched back.
+        for entry, packed in zip(batch, embeddings):
+            entry[1]["_id"] = ObjectId()
+            if packed is not None:
+                entry[1]["question_embeddings"] = packed
+            document, artifact = prepare_offload(entry[1], INTERVIEWS, INTERVIEW_RAW_FIELDS)
+            documents.append(document)
+            if artifact is not None:
+                artifacts.append(artifact)
+
+        failed = {}
+        with stage("resume.db_insert_many"):
+            try:
+                await save_artifacts(artifacts)
+            except PyMongoError as exc:
+                failed.update(_write_failures(exc, [artifact["_id"] for artifact in artifacts]))
+            # An interview whose raw fields weren't saved is not stored either.
+            documents = [document for document in documents if document["_id"] not in failed]
+            if documents:
+                try:
+                    await get_async_interviews_collection().insert_many(documents, ordered=False)
+                except PyMongoError as exc:
+                    failures = _write_failures(exc, [document["_id"] for document in documents])
+                    failed.update(failures)
+                    orphans = [artifact["_id"] for artifact in artifacts if artifact["_id"] in failures]
+                    if orphans:
+                        try:
+                            await get_async_interview_artifacts_collection().delete_many({"_id": {"$in": orphans}})
+                        except PyMongoError:
+                            pass
+
+        for name, document, normalized_result, parse_error, cache_key, semantic_match in batch:
+            if document["_id"] in failed:
+                await results.put(_file_error(name, RuntimeError(failed[document["_id"]])))
+                continue
+            response = _analysis_response(
+                str(document["_id"]), normalized_result, parse_error, cache_key, semantic_match, document["degraded"]
+            )
+            if parse_error is None and semantic_match is None:
+                # Later resumes in the same batch can reuse these questions.
+                try:
+                    await question_index.index_profile(response["interview_id"], normalized_result["extracted_information"])
+                except Exception:
+                    pass
+            await results.put(_file_result(name, response))
+
+    async def flush_or_report(batch: list) -> None:
+        try:
+            await flush(batch)
+        except Exception as exc:
+            for entry in batch:
+                await results.put(_file_error(entry[0], exc))
+
+    async def writer() -> None:
+        loop = asyncio.get_running_loop()
+        finished = False
+        while not finished:
+            first = await to_insert.get()
+            if first is _DONE:
+                return
+            batch = [first]
+            deadline = loop.time() + BULK_INSERT_LINGER_MS / 1000
+            while len(batch) < insert_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(to_insert.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if entry is _DONE:
+                    finished = True
+                    break
+                batch.append(entry)
+            await flush_or_report(batch)
+
+    async def run() -> None:
+        try:
+            await asyncio.gather(*(analyze(name, data) for name, data in items))
+            await to_insert.put(_DONE)
+            await writer_task
+        finally:
+            # Always end the result stream, or the consumer waits forever.
+            results.put_nowait(_DONE)
+
+    writer_task = asyncio.create_task(writer())
+    runner_task = asyncio.create_task(run())
+    succeeded = failed_count = 0
+    try:
+        while True:
+            result = await results.get()
+            if result is _DONE:
+                break
+            if result["status"] == "ok":
+                succeeded += 1
+            else:
+                failed_count += 1
+            yield result
+        yield {"event": "summary", "total": len(items), "succeeded": succeeded, "failed": failed_count}
+    finally:
+        # The client went away (or the batch finished): stop any stragglers.
+        runner_task.cancel()
+        writer_task.cancel()
+
+
+async def _read_uploads(files: List[UploadFile]) -> List[BulkItem]:
+    """Read uploads without buffering more of each than could be accepted.
+
+    Plain files are read up to ``RESUME_MAX_BYTES`` and zips up to
+    ``BULK_MAX_ARCHIVE_BYTES``; a larger file becomes an error item. Raises
+    BatchTooLarge as soon as the batch is over its file or byte limit.
+    """
+    if len(files) > BULK_MAX_FILES:
+        raise BatchTooLarge(f"Batch exceeds {BULK_MAX_FILES} files")
+    uploads: List[BulkItem] = []
+    total_bytes = 0
+    for file in files:
+        name = file.filename or "upload"
+        head = await file.read(4)
+        # DOCX files are zips too; they are size-checked again on extraction.
+        limit = BULK_MAX_ARCHIVE_BYTES if head == b"PK\x03\x04" else RESUME_MAX_BYTES
+        data = head + await file.read(limit + 1 - len(head))
+        if len(data) > limit:
+            uploads.append((name, ExtractionError(f"File exceeds {limit} bytes", status_code=413)))
+            continue
+        total_bytes += len(data)
+        if total_bytes > BULK_MAX_TOTAL_BYTES:
+            raise BatchTooLarge(f"Batch exceeds {BULK_MAX_TOTAL_BYTES} bytes")
+        uploads.append((name, data))
+    return uploads
+
+
+async def _ndjson(results: AsyncIterator[dict]):
+    async for result in results:
+        yield json.dumps(result) + "\n"
+
+
+@router.post("/analyze-resume/bulk")
+async def analyze_resume_bulk(
+    files: List[UploadFile] = File(...),
+    no_cache: bool = Query(False, description="Skip the result cache and force a fresh analysis"),
+):
+    if not HF_API_KEY:
+        raise HTTPException(status_code=500, detail="HF_API_KEY not set")
+
+    try:
+        items = expand_uploads(await _read_uploads(files))
+    except BatchTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+
+    return StreamingResponse(
+        _ndjson(ingest_resumes(items, use_cache=RESUME_CACHE_ENABLED and not no_cache)),
+        media_type="application/x-ndjson",
+    )
@@ -1,15 +1,69 @@
 import os
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient
 from pymongo.collection import Collection
-from pymongo.errors import PyMongoError
+from pymongo.errors import OperationFailure, PyMongoError
 
 DEFAULT_MONGO_URI = "mongodb://127.0.0.1:27017"
 DEFAULT_MONGO_DB_NAME = "ai_mock_interviews"
+# In-memory database for local runs and benchmarks (needs mongomock-motor,
+# see requirements-dev.txt). Sync and async clients share one store.
+MOCK_MONGO_URI = "mongomock://"
+
+INTERVIEWS = "interviews"
+INTERVIEW_SESSIONS = "interview_sessions"
+ADMINS = "admins"
+RESUME_JOBS = "resume_jobs"
+INTERVIEW_ARTIFACTS = "interview_artifacts"
+SESSION_ROLLUPS = "session_rollups"
+
+# Every index the app relies on, applied once at startup by ensure_indexes().
+INDEXES: Dict[str, List[IndexModel]] = {
+    INTERVIEWS: [
+        IndexModel([("created_at", ASCENDING)]),
+        IndexModel([("cache_key", ASCENDING)]),
+        # Loads the semantic question index.
+        IndexModel([("profile_embedding.model", ASCENDING), ("profile_embedded_at", DESCENDING)], sparse=True),
+    ],
+    INTERVIEW_SESSIONS: [
+        # Keyset pagination of the admin session listing: newest first,
+        # _id breaking ties, optionally narrowed by candidate or mode.
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("candidate_email", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        IndexModel([("session_mode", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        # Started sessions that were never completed; unset once complete.
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    ADMINS: [
+        IndexModel([("email", ASCENDING)], unique=True),
+    ],
+    RESUME_JOBS: [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+        # Finished jobs are removed once expires_at passes.
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    INTERVIEW_ARTIFACTS: [
+        # Raw blobs are removed once expires_at passes; unset means kept.
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    SESSION_ROLLUPS: [
+        IndexModel([("day", ASCENDING), ("mode", ASCENDING)], unique=True),
+    ],
+}
+
+# Indexes replaced by ones in INDEXES; dropped by ensure_indexes.
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    # Superseded by the (..., created_at, _id) keyset indexes.
+    INTERVIEW_SESSIONS: ["created_at_1", "candidate_email_1_created_at_-1", "session_mode_1_created_at_-1"],
+    # The semantic index refresh is keyed on profile_embedded_at.
+    INTERVIEWS: ["profile_embedding.model_1_created_at_-1"],
+}
 
 _client: Optional[MongoClient] = None
-_client_uri: Optional[str] = None
+_async_client: Optional[AsyncIOMotorClient] = None
 
 
 def _get_mongo_uri() -> str:
@@ -20,37 +74,145 @@ def _get_db_name() -> str:
     return os.getenv("MONGO_DB_NAME", DEFAULT_MONGO_DB_NAME)
 
 
-def get_interviews_collection() -> Collection:
-    collection = get_db()["interviews"]
-    collection.create_index("created_at")
-    return collection
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
 
 
-def get_interview_sessions_collection() -> Collection:
-    collection = get_db()["interview_sessions"]
-    collection.create_index("created_at")
-    return collection
+def _client_options() -> dict:
+    write_concern = os.getenv("MONGO_WRITE_CONCERN", "1")
+    options = {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+        "maxIdleTimeMS": _optional_int("MONGO_MAX_IDLE_TIME_MS"),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+        "socketTimeoutMS": _optional_int("MONGO_SOCKET_TIMEOUT_MS"),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+        "w": int(write_concern) if write_concern.isdigit() else write_concern,
+    }
+    return {key: value for key, value in options.items() if value is not None}
 
 
-def get_client() -> MongoClient:
-    global _client, _client_uri
-    mongo_uri = _get_mongo_uri()
+def _is_mock_uri(uri: str) -> bool:
+    return uri.startswith(MOCK_MONGO_URI)
 
-    # Recreate client if URI changed (e.g. env loaded after import).
-    if _client is None or _client_uri != mongo_uri:
-        _client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        _client_uri = mongo_uri
+
+def get_client() -> MongoClient:
+    global _client
+    # Created on first use, after main has loaded .env.
+    if _client is None:
+        mongo_uri = _get_mongo_uri()
+        if _is_mock_uri(mongo_uri):
+            import mongomock
+
+            _client = mongomock.MongoClient()
+        else:
+            _client = MongoClient(mongo_uri, **_client_options())
     return _client
 
 
+def get_async_client() -> AsyncIOMotorClient:
+    global _async_client
+    if _async_client is None:
+        mongo_uri = _get_mongo_uri()
+        if _is_mock_uri(mongo_uri):
+            from mongomock_motor import AsyncMongoMockClient
+
+            _async_client = AsyncMongoMockClient(mock_mongo_client=get_client())
+        else:
+            _async_client = AsyncIOMotorClient(mongo_uri, **_client_options())
+    return _async_client
+
+
 def get_db():
     return get_client()[_get_db_name()]
 
 
+def get_interviews_collection() -> Collection:
+    return get_db()[INTERVIEWS]
+
+
+def get_interview_sessions_collection() -> Collection:
+    return get_db()[INTERVIEW_SESSIONS]
+
+
 def get_admins_collection() -> Collection:
-    collection = get_db()["admins"]
-    collection.create_index("email", unique=True)
-    return collection
+    return get_db()[ADMINS]
+
+
+def get_interview_artifacts_collection() -> Collection:
+    return get_db()[INTERVIEW_ARTIFACTS]
+
+
+def get_session_rollups_collection() -> Collection:
+    return get_db()[SESSION_ROLLUPS]
+
+
+def get_async_db():
+    return get_async_client()[_get_db_name()]
+
+
+def get_async_interviews_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[INTERVIEWS]
+
+
+def get_async_interview_sessions_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[INTERVIEW_SESSIONS]
+
+
+def get_async_admins_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[ADMINS]
+
+
+def get_async_resume_jobs_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[RESUME_JOBS]
+
+
+def get_async_interview_artifacts_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[INTERVIEW_ARTIFACTS]
+
+
+def get_async_session_rollups_collection() -> AsyncIOMotorCollection:
+    return get_async_db()[SESSION_ROLLUPS]
+
+
+def ensure_indexes() -> None:
+    db = get_db()
+    for collection_name, indexes in INDEXES.items():
+        db[collection_name].create_indexes(indexes)
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        existing = db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                try:
+                    db[collection_name].drop_index(name)
+                except OperationFailure:
+                    # Dropped meanwhile by another instance starting up.
+                    pass
+
+
+async def ensure_indexes_async() -> None:
+    db = get_async_db()
+    for collection_name, indexes in INDEXES.items():
+        await db[collection_name].create_indexes(indexes)
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        for name in names:
+            if name in existing:
+                try:
+                    await db[collection_name].drop_index(name)
+                except OperationFailure:
+                    pass
+
+
+def close_client() -> None:
+    global _client, _async_client
+    if _async_client is not None:
+        _async_client.close()
+    if _client is not None:
+        _client.close()
+    _client = None
+    _async_client = None
 
 
 def ping_mongo() -> bool:
@@ -59,3 +221,11 @@ def ping_mongo() -> bool:
         return True
     except PyMongoError:
         return False
+
+
+async def ping_mongo_async() -> bool:
+    try:
+        await get_async_client().admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
@@ -0,0 +1,336 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+if __package__:
+    from .inference_scheduler import EMBED_BATCHING_ENABLED, EMBED_MAX_BATCH_SIZE, BatchingEncoder
+    from .metrics import counter_lines, registry, stage
+else:
+    from inference_scheduler import EMBED_BATCHING_ENABLED, EMBED_MAX_BATCH_SIZE, BatchingEncoder
+    from metrics import counter_lines, registry, stage
+
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-mpnet-base-v2")
+# torch | torch-int8 | onnx | hash (see _BACKEND_FACTORIES).
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Optional ONNX file inside the model repo, e.g. "onnx/model_qint8_avx512_vnni.onnx".
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "")
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Optional on-disk tier (SQLite file) that survives restarts.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+
+# Vectors from different models or backends are not interchangeable, so
+# cached and stored embeddings are keyed by this id. The default backend
+# keeps the plain model name.
+EMBEDDING_ID = (
+    EMBEDDING_MODEL_NAME
+    if EMBEDDING_BACKEND == "torch"
+    else f"{EMBEDDING_MODEL_NAME}#{EMBEDDING_BACKEND}{':' + EMBEDDING_ONNX_FILE if EMBEDDING_ONNX_FILE else ''}"
+)
+
+_backend = None
+_backend_lock = threading.Lock()
+_batcher: Optional[BatchingEncoder] = None
+
+
+class EmbeddingBackend(ABC):
+    """Turns a list of texts into a 2-D float array, one row per text."""
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        ...
+
+
+def _hf_token() -> Optional[str]:
+    token = os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACE_HUB_TOKEN") or os.getenv("HF_API_KEY")
+    if token:
+        os.environ.setdefault("HF_TOKEN", token)
+        os.environ.setdefault("HUGGINGFACE_HUB_TOKEN", token)
+    return token
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    def __init__(self, model_name: str, quantize: bool = False):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        self.model = SentenceTransformer(model_name, token=_hf_token())
+        if quantize:
+            import torch
+
+            # Dynamic int8 quantization of the Linear layers: weights are
+            # stored as int8, activations quantized on the fly. CPU only.
+            self.model = torch.ao.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """ONNX Runtime inference through sentence-transformers' onnx backend.
+
+    Requires ``pip install "sentence-transformers[onnx]"``.
+    """
+
+    def __init__(self, model_name: str, onnx_file: str = ""):
+        from sentence_transformers import SentenceTransformer
+
+        self.name = model_name
+        model_kwargs = {"file_name": onnx_file} if onnx_file else None
+        self.model = SentenceTransformer(model_name, backend="onnx", model_kwargs=model_kwargs, token=_hf_token())
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+
+class HashEmbeddingBackend(EmbeddingBackend):
+    """Deterministic bag-of-words vectors from hashed words.
+
+    Needs no model download, so tests and benchmarks can exercise scoring
+    and retrieval end to end. Not meant for real evaluations.
+    """
+
+    name = "hash"
+    dim = 256
+
+    def encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                matrix[row, int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % self.dim] += 1.0
+        return matrix
+
+
+_BACKEND_FACTORIES = {
+    "torch": lambda: SentenceTransformerBackend(EMBEDDING_MODEL_NAME),
+    "torch-int8": lambda: SentenceTransformerBackend(EMBEDDING_MODEL_NAME, quantize=True),
+    "onnx": lambda: OnnxBackend(EMBEDDING_MODEL_NAME, EMBEDDING_ONNX_FILE),
+    "hash": HashEmbeddingBackend,
+}
+
+
+def register_backend(name: str, factory) -> None:
+    _BACKEND_FACTORIES[name] = factory
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                factory = _BACKEND_FACTORIES.get(EMBEDDING_BACKEND)
+                if factory is None:
+                    raise ValueError(
+                        f"Unknown EMBEDDING_BACKEND {EMBEDDING_BACKEND!r}; "
+                        f"expected one of {sorted(_BACKEND_FACTORIES)}"
+                    )
+                with stage("embedding.model_load"):
+                    _backend = factory()
+    return _backend
+
+
+def is_backend_loaded() -> bool:
+    return _backend is not None
+
+
+def warm_up() -> None:
+    """Load the backend and run one encode to pay first-call overhead up front."""
+    get_embedding_backend().encode(["warm up the embedding model"], EMBED_MAX_BATCH_SIZE)
+
+
+def _model_encode(texts: List[str]) -> np.ndarray:
+    return get_embedding_backend().encode(texts, EMBED_MAX_BATCH_SIZE)
+
+
+def get_batcher() -> BatchingEncoder:
+    global _batcher
+    if _batcher is None:
+        _batcher = BatchingEncoder(_model_encode)
+    return _batcher
+
+
+def stop_batcher() -> None:
+    if _batcher is not None:
+        _batcher.stop()
+
+
+def _encode_uncached(texts: List[str]) -> np.ndarray:
+    if EMBED_BATCHING_ENABLED:
+        return get_batcher().encode(texts)
+    return _model_encode(texts)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").split())
+
+
+class EmbeddingCache:
+    """LRU cache of embedding vectors keyed by model name and normalized text.
+
+    The in-memory tier is capped by total vector bytes. When ``path`` is set,
+    vectors are also written to a SQLite file that is consulted on misses.
+    """
+
+    def __init__(self, max_bytes: int, path: str = ""):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text))"
+            )
+            self._db.commit()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for text in texts:
+                vector = self._entries.get((model_name, text))
+                if vector is not None:
+                    self._entries.move_to_end((model_name, text))
+                    found[text] = vector
+            self.hits += len(found)
+
+            missing = [text for text in texts if text not in found]
+            if missing and self._db is not None:
+                for text in missing:
+                    row = self._db.execute(
+                        "SELECT vector FROM embeddings WHERE model = ? AND text = ?", (model_name, text)
+                    ).fetchone()
+                    if row is not None:
+                        vector = np.frombuffer(row[0], dtype=np.float32)
+                        found[text] = vector
+                        self._store(model_name, text, vector)
+                        self.persistent_hits += 1
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, model_name: str, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for text, vector in vectors.items():
+                self._store(model_name, text, np.asarray(vector, dtype=np.float32))
+            if self._db is not None and vectors:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, text, vector) VALUES (?, ?, ?)",
+                    [
+                        (model_name, text, np.asarray(vector, dtype=np.float32).tobytes())
+                        for text, vector in vectors.items()
+                    ],
+                )
+                self._db.commit()
+
+    def _store(self, model_name: str, text: str, vector: np.ndarray) -> None:
+        key = (model_name, text)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.persistent_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+embedding_cache = EmbeddingCache(EMBEDDING_CACHE_MAX_BYTES, EMBEDDING_CACHE_PATH)
+
+
+def _cache_metrics() -> list:
+    stats = embedding_cache.stats()
+    return [
+        *counter_lines(
+            "embedding_cache_lookups_total",
+            "Embedding cache lookups by outcome.",
+            {
+                '{result="hit"}': stats["hits"],
+                '{result="persistent_hit"}': stats["persistent_hits"],
+                '{result="miss"}': stats["misses"],
+            },
+        ),
+        *counter_lines("embedding_cache_bytes", "Bytes held by the in-memory embedding cache.", {"": stats["bytes"]}, "gauge"),
+    ]
+
+
+registry.add_collector(_cache_metrics)
+
+
+def encode_texts(
+    texts: Sequence[str],
+    cacheable: Optional[Sequence[bool]] = None,
+    precomputed: Optional[Dict[str, np.ndarray]] = None,
+) -> np.ndarray:
+    """Embed ``texts`` with one batched model call for all cache misses.
+
+    Texts are normalized and deduplicated first. Vectors in ``precomputed``
+    (keyed by normalized text) are used as-is. Only texts whose
+    ``cacheable`` flag is set are looked up in and written to the cache;
+    the rest (e.g. free-form candidate answers) are encoded but not kept.
+    """
+    normalized = [normalize_text(text) for text in texts]
+    if cacheable is None:
+        cacheable = [True] * len(normalized)
+
+    vectors: Dict[str, np.ndarray] = {}
+    if precomputed:
+        vectors.update({text: precomputed[text] for text in normalized if text in precomputed})
+
+    cacheable_texts = list(dict.fromkeys(t for t, c in zip(normalized, cacheable) if c and t not in vectors))
+    vectors.update(embedding_cache.get_many(EMBEDDING_ID, cacheable_texts))
+
+    missing: List[str] = [text for text in dict.fromkeys(normalized) if text not in vectors]
+    if missing:
+        encoded = _encode_uncached(missing)
+        fresh = dict(zip(missing, np.asarray(encoded, dtype=np.float32)))
+        keep = set(cacheable_texts)
+        embedding_cache.put_many(EMBEDDING_ID, {t: v for t, v in fresh.items() if t in keep})
+        vectors.update(fresh)
+
+    if not normalized:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([vectors[text] for text in normalized])
+
+
+def pack_embeddings(texts: Sequence[str], matrix: np.ndarray) -> dict:
+    """Compact document form: float16 vectors in one binary blob."""
+    from bson.binary import Binary
+
+    matrix = np.asarray(matrix, dtype=np.float16)
+    return {
+        "model": EMBEDDING_ID,
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "texts": list(texts),
+        "vectors": Binary(matrix.tobytes()),
+    }
+
+
+def unpack_embeddings(packed: Optional[dict]) -> Dict[str, np.ndarray]:
+    if not packed or packed.get("model") != EMBEDDING_ID or not packed.get("dim"):
+        return {}
+    matrix = np.frombuffer(bytes(packed["vectors"]), dtype=np.float16).reshape(-1, packed["dim"])
+    return {text: row.astype(np.float32) for text, row in zip(packed["texts"], matrix)}
@@ -0,0 +1,155 @@
+import asyncio
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import docx
+import pdfplumber
+
+if __package__:
+    from .profiling import current_profile, run_with_profile
+else:
+    from profiling import current_profile, run_with_profile
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(5 * 1024 * 1024)))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACT_MAX_PENDING = int(os.getenv("EXTRACT_MAX_PENDING", str(EXTRACT_WORKERS * 4)))
+# Per-document limit, queueing on the pool included. A worker still busy
+# after this long is killed along with its pool.
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "30"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Bounds how many extractions are queued on the pool, and so the copies of
+# upload bytes pickled for worker processes. Uploads are read before this
+# is acquired; their size is capped by RESUME_MAX_BYTES, not by this.
+_pending = asyncio.Semaphore(EXTRACT_MAX_PENDING)
+
+
+class ExtractionError(ValueError):
+    def __init__(self, detail: str, status_code: int = 400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # Keep status_code when the error crosses the process boundary.
+        return (ExtractionError, (self.detail, self.status_code))
+
+
+def sniff_document_type(data: bytes) -> Optional[str]:
+    if data.startswith(b"%PDF-"):
+        return "pdf"
+    if data.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return "docx"
+        except zipfile.BadZipFile:
+            return None
+    return None
+
+
+# -----------------------------------
+# Extract Text from PDF
+# -----------------------------------
+def extract_text_from_pdf(data: bytes, max_pages: int = RESUME_MAX_PAGES) -> str:
+    text = ""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        if len(pdf.pages) > max_pages:
+            raise ExtractionError(f"Resume has more than {max_pages} pages", status_code=413)
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                # Form feed between pages, so running headers can be found.
+                text += page_text + "\f"
+            # Release cached layout objects as we go.
+            page.close()
+    return text
+
+
+# -----------------------------------
+# Extract Text from DOCX
+# -----------------------------------
+def extract_text_from_docx(data: bytes) -> str:
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+def _extract(kind: str, data: bytes) -> str:
+    if kind == "pdf":
+        return extract_text_from_pdf(data)
+    return extract_text_from_docx(data)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor, terminate: bool = False) -> None:
+    """Drop a pool so the next call starts a fresh one."""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    if terminate:
+        # A hung parse never returns its worker; kill it rather than leak it.
+        # terminate_workers() is Python 3.14+.
+        if hasattr(pool, "terminate_workers"):
+            pool.terminate_workers()
+            return
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def check_upload_size(data: bytes) -> None:
+    if len(data) > RESUME_MAX_BYTES:
+        raise ExtractionError(f"File exceeds {RESUME_MAX_BYTES} bytes", status_code=413)
+
+
+async def extract_resume_text(data: bytes) -> str:
+    """Parse an uploaded PDF/DOCX in the worker pool, off the event loop."""
+    check_upload_size(data)
+    kind = sniff_document_type(data)
+    if kind is None:
+        raise ExtractionError("Only PDF and DOCX supported")
+
+    session = current_profile()
+    async with _pending:
+        loop = asyncio.get_running_loop()
+        pool = _get_pool()
+        if session is None:
+            job = loop.run_in_executor(pool, _extract, kind, data)
+        else:
+            # The worker process writes its own profile; merged on save.
+            part = session.part_path("extract")
+            session.add_part(part)
+            job = loop.run_in_executor(pool, run_with_profile, part, _extract, kind, data)
+        try:
+            return await asyncio.wait_for(job, EXTRACT_TIMEOUT_SECONDS)
+        except ExtractionError:
+            raise
+        except asyncio.TimeoutError as exc:
+            _discard_pool(pool, terminate=True)
+            raise ExtractionError(
+                f"Parsing the {kind.upper()} file took longer than {EXTRACT_TIMEOUT_SECONDS:g}s", status_code=504
+            ) from exc
+        except BrokenProcessPool as exc:
+            # A worker died (OOM kill, segfault); the pool is unusable now.
+            _discard_pool(pool)
+            raise ExtractionError("Resume parser is unavailable, please retry", status_code=503) from exc
+        except Exception as exc:
+            raise ExtractionError(f"Could not parse {kind.upper()} file: {exc}") from exc
+
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,169 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+EMBED_BATCHING_ENABLED = os.getenv("EMBED_BATCHING_ENABLED", "1").lower() not in {"0", "false", "no"}
+EMBED_MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH_SIZE", "64"))
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "10"))
+# 0 leaves torch's default intra-op thread count untouched.
+EMBED_TORCH_THREADS = int(os.getenv("EMBED_TORCH_THREADS", "0"))
+# Longest a caller waits in encode() for its batch, in seconds.
+EMBEDDING_BATCH_TIMEOUT = float(os.getenv("EMBEDDING_BATCH_TIMEOUT", "30"))
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingEncoder:
+    """Coalesces encode calls from concurrent requests into shared batches.
+
+    Callers block in :meth:`encode` while a single worker thread drains the
+    queue, waiting at most ``max_wait_seconds`` after the first request for
+    others to join, up to ``max_batch_size`` texts per model call. A caller
+    gives up with ``TimeoutError`` after ``timeout_seconds``.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = EMBED_MAX_BATCH_SIZE,
+        max_wait_seconds: float = EMBED_MAX_WAIT_MS / 1000,
+        torch_threads: int = EMBED_TORCH_THREADS,
+        timeout_seconds: float = EMBEDDING_BATCH_TIMEOUT,
+    ):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.torch_threads = torch_threads
+        self.timeout_seconds = timeout_seconds
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.batch_size_histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.batch_size_histogram["+Inf"] = 0
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        with self._stats_lock:
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            # Still queued: the worker skips it. Already running: the
+            # result is dropped.
+            future.cancel()
+            raise TimeoutError(f"Embedding batch did not finish within {self.timeout_seconds:g}s") from None
+
+    def _ensure_started(self) -> None:
+        # Started lazily so a server that preloads the app before forking
+        # gets one worker thread per process.
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        threads_set = self.torch_threads <= 0
+        carried = None
+        while True:
+            first = carried if carried is not None else self._queue.get()
+            carried = None
+            if first is _STOP:
+                return
+
+            batch = [first]
+            # Dequeued but not yet in the batch or carried over.
+            taken = None
+            stop_after = False
+            try:
+                if not threads_set:
+                    import torch
+
+                    torch.set_num_threads(self.torch_threads)
+                    threads_set = True
+
+                size = len(first[0])
+                deadline = time.monotonic() + self.max_wait_seconds
+                while size < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        taken = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if taken is _STOP:
+                        taken = None
+                        stop_after = True
+                        break
+                    if size + len(taken[0]) > self.max_batch_size:
+                        # Would overshoot the cap; it starts the next batch. A
+                        # single request larger than the cap runs on its own.
+                        carried, taken = taken, None
+                        break
+                    size += len(taken[0])
+                    batch.append(taken)
+                    taken = None
+
+                self._process(batch, size)
+            except Exception as exc:
+                # Whatever broke, nobody who was dequeued is left waiting.
+                logger.exception("Embedding batch of %d requests failed", len(batch))
+                for _, future in batch + ([taken] if taken else []):
+                    if not future.done():
+                        future.set_exception(exc)
+            if stop_after:
+                return
+
+    def _process(self, batch: list, size: int) -> None:
+        # Callers that timed out while queued are skipped.
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if batch:
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            vectors = np.asarray(self._encode_fn(texts))
+            offset = 0
+            for item_texts, future in batch:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+        with self._stats_lock:
+            self.batches += 1
+            bucket = next((b for b in BATCH_SIZE_BUCKETS if size <= b), "+Inf")
+            self.batch_size_histogram[bucket] += 1
+
+    def stop(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+                "batch_size_histogram": {str(k): v for k, v in self.batch_size_histogram.items()},
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_seconds * 1000,
+            }
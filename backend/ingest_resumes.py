@@ -0,0 +1,106 @@
+"""Bulk-ingest a cohort of resumes without going through the HTTP API.
+
+Accepts PDF/DOCX files, zip archives of them, and directories (searched
+recursively). Prints one JSON line per file as it completes, then a
+summary line. Exits non-zero if any file failed.
+
+    python ingest_resumes.py cohort.zip extra/*.pdf --llm-concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except Exception:
+    pass
+
+if __package__:
+    from .bulk_ingest import (
+        BULK_EXTRACT_CONCURRENCY,
+        BULK_INSERT_BATCH_SIZE,
+        BULK_LLM_CONCURRENCY,
+        BatchTooLarge,
+        expand_uploads,
+        ingest_resumes,
+    )
+    from .db import close_client
+    from .extraction import shutdown_extraction_pool
+    from .llm_router import close_llm_router
+    from .resume_router import HF_API_KEY, RESUME_CACHE_ENABLED
+else:
+    from bulk_ingest import (
+        BULK_EXTRACT_CONCURRENCY,
+        BULK_INSERT_BATCH_SIZE,
+        BULK_LLM_CONCURRENCY,
+        BatchTooLarge,
+        expand_uploads,
+        ingest_resumes,
+    )
+    from db import close_client
+    from extraction import shutdown_extraction_pool
+    from llm_router import close_llm_router
+    from resume_router import HF_API_KEY, RESUME_CACHE_ENABLED
+
+SUFFIXES = {".pdf", ".docx", ".zip"}
+
+
+def _collect(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file() and child.suffix.lower() in SUFFIXES:
+                    yield str(child), child.read_bytes()
+        else:
+            yield str(path), path.read_bytes()
+
+
+async def _run(args) -> int:
+    items = expand_uploads(_collect(args.paths))
+    failed = 0
+    try:
+        async for result in ingest_resumes(
+            items,
+            use_cache=RESUME_CACHE_ENABLED and not args.no_cache,
+            extract_concurrency=args.extract_concurrency,
+            llm_concurrency=args.llm_concurrency,
+            insert_batch_size=args.batch_size,
+        ):
+            print(json.dumps(result), flush=True)
+            if result["event"] == "summary":
+                failed = result["failed"]
+    finally:
+        await close_llm_router()
+        shutdown_extraction_pool()
+        close_client()
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Resume files, zip archives or directories")
+    parser.add_argument("--extract-concurrency", type=int, default=BULK_EXTRACT_CONCURRENCY)
+    parser.add_argument("--llm-concurrency", type=int, default=BULK_LLM_CONCURRENCY)
+    parser.add_argument("--batch-size", type=int, default=BULK_INSERT_BATCH_SIZE, help="Documents per insert_many")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyze resumes seen before")
+    args = parser.parse_args()
+
+    if not HF_API_KEY:
+        parser.error("HF_API_KEY not set")
+    missing = [path for path in args.paths if not Path(path).exists()]
+    if missing:
+        parser.error(f"No such file or directory: {', '.join(missing)}")
+    try:
+        sys.exit(asyncio.run(_run(args)))
+    except BatchTooLarge as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
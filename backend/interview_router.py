@@ -1,19 +1,41 @@
+import hashlib
+import logging
 import os
-from datetime import datetime
-from typing import List, Literal, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException
+import numpy as np
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
+from pymongo.errors import PyMongoError
 
 if __package__:
-    from .db import get_interview_sessions_collection
+    from .artifacts import SESSION_RAW_FIELDS, prepare_offload, save_artifacts, upsert_artifact
+    from .db import INTERVIEW_SESSIONS, get_async_interview_sessions_collection, get_async_interviews_collection
+    from .embeddings import embedding_cache, encode_texts, get_batcher, unpack_embeddings
+    from .metrics import SESSION_ANSWER_SCORES, stage
+    from .profiling import profile_call
+    from .session_results import COMPLETED, IN_PROGRESS, record_session
 else:
-    from db import get_interview_sessions_collection
+    from artifacts import SESSION_RAW_FIELDS, prepare_offload, save_artifacts, upsert_artifact
+    from db import INTERVIEW_SESSIONS, get_async_interview_sessions_collection, get_async_interviews_collection
+    from embeddings import embedding_cache, encode_texts, get_batcher, unpack_embeddings
+    from metrics import SESSION_ANSWER_SCORES, stage
+    from profiling import profile_call
+    from session_results import COMPLETED, IN_PROGRESS, record_session
 
 router = APIRouter(prefix="/interview", tags=["Interview"])
+logger = logging.getLogger(__name__)
 
 Level = Literal["Low", "Medium", "High"]
-_st_model = None
+
+# Started sessions that never complete are removed after this long.
+SESSION_DRAFT_TTL_HOURS = float(os.getenv("SESSION_DRAFT_TTL_HOURS", "24"))
+# Upper bound on answer indexes submitted to one session.
+SESSION_MAX_ANSWERS = int(os.getenv("SESSION_MAX_ANSWERS", "100"))
 
 
 class QuestionAnswer(BaseModel):
@@ -36,36 +58,49 @@ class FaceMetrics(BaseModel):
     movement_score: Optional[float] = None
 
 
-class InterviewSessionPayload(BaseModel):
+class SessionStartPayload(BaseModel):
     session_mode: Optional[Literal["interview", "gd"]] = "interview"
+    interview_id: Optional[str] = None
     candidate_email: Optional[str] = None
     candidate_name: Optional[str] = None
+
+
+class InterviewSessionPayload(SessionStartPayload):
     answers: List[QuestionAnswer]
     face_metrics: FaceMetrics
 
 
-def _get_sentence_model():
-    global _st_model
-    if _st_model is None:
-        token = os.getenv("HF_TOKEN") or os.getenv("HUGGINGFACE_HUB_TOKEN") or os.getenv("HF_API_KEY")
-        if token:
-            os.environ.setdefault("HF_TOKEN", token)
-            os.environ.setdefault("HUGGINGFACE_HUB_TOKEN", token)
+class AnswerSubmission(BaseModel):
+    index: int = Field(ge=0, lt=SESSION_MAX_ANSWERS)
+    answer: QuestionAnswer
+
+
+class SessionCompletePayload(BaseModel):
+    # The client's final answer list; defaults to the submitted answers.
+    answers: Optional[List[QuestionAnswer]] = None
+    face_metrics: FaceMetrics
 
-        from sentence_transformers import SentenceTransformer
 
-        _st_model = SentenceTransformer("sentence-transformers/all-mpnet-base-v2", token=token)
-    return _st_model
+async def _load_question_embeddings(interview_id: Optional[str]) -> Dict[str, np.ndarray]:
+    if not interview_id:
+        return {}
+    try:
+        object_id = ObjectId(interview_id)
+    except InvalidId:
+        return {}
+    with stage("session.load_embeddings"):
+        document = await get_async_interviews_collection().find_one(
+            {"_id": object_id}, projection={"question_embeddings": 1}
+        )
+    return unpack_embeddings((document or {}).get("question_embeddings"))
 
 
-def _score_answers_batch(answers: List[QuestionAnswer]) -> dict:
+def _score_answers_batch(
+    answers: List[QuestionAnswer],
+    precomputed: Optional[Dict[str, np.ndarray]] = None,
+) -> dict:
     if not answers:
-        return {
-            "question_scores": [],
-            "average_score": 0.0,
-            "completion_rate": 0.0,
-            "quality": "Low",
-        }
+        return _evaluate_scores([], 0.0)
 
     expected_texts = [(a.expected_answer or a.question or "").strip() for a in answers]
     candidate_texts = [(a.answer_text or "").strip() for a in answers]
@@ -73,24 +108,31 @@ def _score_answers_batch(answers: List[QuestionAnswer]) -> dict:
     non_empty = [a for a in candidate_texts if a]
     completion_rate = len(non_empty) / len(answers)
 
-    model = _get_sentence_model()
-    expected_emb = model.encode(expected_texts, convert_to_tensor=True)
-    candidate_emb = model.encode(candidate_texts, convert_to_tensor=True)
+    # Expected-side texts repeat across candidates and are cached; answers
+    # are encoded in the same batch but not kept. Empty answers score 0.
+    answered = [i for i, text in enumerate(candidate_texts) if text]
+    with stage("session.encode"):
+        embeddings = encode_texts(
+            expected_texts + [candidate_texts[i] for i in answered],
+            cacheable=[True] * len(expected_texts) + [False] * len(answered),
+            precomputed=precomputed,
+        )
+    expected_emb = embeddings[: len(expected_texts)]
+    candidate_emb = embeddings[len(expected_texts):]
 
-    from sentence_transformers import util
+    question_scores = [0.0] * len(answers)
+    for row, i in enumerate(answered):
+        a, b = expected_emb[i], candidate_emb[row]
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        similarity = float(np.dot(a, b)) / denom if denom else 0.0
+        similarity = max(0.0, min(1.0, similarity))
+        question_scores[i] = round(similarity * 10, 2)
 
-    diagonal_sim = util.cos_sim(expected_emb, candidate_emb).diagonal()
+    return _evaluate_scores(question_scores, completion_rate)
 
-    question_scores = []
-    for i, sim in enumerate(diagonal_sim):
-        if not candidate_texts[i]:
-            question_scores.append(0.0)
-            continue
-        similarity = float(sim.item())
-        similarity = max(0.0, min(1.0, similarity))
-        question_scores.append(round(similarity * 10, 2))
 
-    average_score = round(sum(question_scores) / len(question_scores), 2)
+def _evaluate_scores(question_scores: List[float], completion_rate: float) -> dict:
+    average_score = round(sum(question_scores) / len(question_scores), 2) if question_scores else 0.0
 
     if average_score >= 7.0 and completion_rate >= 0.8:
         quality = "High"
@@ -115,35 +157,58 @@ def _overall_result(confidence: Level, nervousness: Level, answer_quality: str)
     return "Moderate performance"
 
 
+def _session_summary(answer_eval: dict, face_metrics: FaceMetrics) -> dict:
+    return {
+        "answer_quality": answer_eval["quality"],
+        "question_scores": answer_eval["question_scores"],
+        "average_answer_score": answer_eval["average_score"],
+        "completion_rate": answer_eval["completion_rate"],
+        "confidence_level": face_metrics.confidence_level,
+        "nervousness_level": face_metrics.nervousness_level,
+        "overall_result": _overall_result(
+            face_metrics.confidence_level,
+            face_metrics.nervousness_level,
+            answer_eval["quality"],
+        ),
+    }
+
+
+async def _record_rollup(document: dict) -> None:
+    try:
+        await record_session(document)
+    except PyMongoError:
+        # The session itself is stored; rebuild_session_rollups.py
+        # repairs a missed rollup update.
+        pass
+
+
 @router.post("/session/complete")
-def complete_interview_session(payload: InterviewSessionPayload):
+async def complete_interview_session(payload: InterviewSessionPayload):
+    """Score and store a whole session in one call."""
     try:
-        answer_eval = _score_answers_batch(payload.answers)
-        summary = {
-            "answer_quality": answer_eval["quality"],
-            "question_scores": answer_eval["question_scores"],
-            "average_answer_score": answer_eval["average_score"],
-            "completion_rate": answer_eval["completion_rate"],
-            "confidence_level": payload.face_metrics.confidence_level,
-            "nervousness_level": payload.face_metrics.nervousness_level,
-            "overall_result": _overall_result(
-                payload.face_metrics.confidence_level,
-                payload.face_metrics.nervousness_level,
-                answer_eval["quality"],
-            ),
-        }
+        precomputed = await _load_question_embeddings(payload.interview_id)
+        # Encoding is CPU-bound; keep it off the event loop.
+        answer_eval = await run_in_threadpool(profile_call, _score_answers_batch, payload.answers, precomputed)
+        summary = _session_summary(answer_eval, payload.face_metrics)
 
         document = {
             "session_mode": payload.session_mode or "interview",
+            "interview_id": payload.interview_id,
             "candidate_email": payload.candidate_email,
             "candidate_name": payload.candidate_name,
+            "status": COMPLETED,
             "answers": [a.model_dump() for a in payload.answers],
+            "answer_count": len(payload.answers),
             "face_metrics": payload.face_metrics.model_dump(),
             "summary": summary,
             "created_at": datetime.utcnow(),
         }
-        collection = get_interview_sessions_collection()
-        insert_result = collection.insert_one(document)
+        document, artifact = prepare_offload(document, INTERVIEW_SESSIONS, SESSION_RAW_FIELDS)
+        collection = get_async_interview_sessions_collection()
+        with stage("session.db_insert"):
+            await save_artifacts([artifact])
+            insert_result = await collection.insert_one(document)
+        await _record_rollup(document)
 
         return {
             "message": "Interview session stored",
@@ -153,3 +218,173 @@ def complete_interview_session(payload: InterviewSessionPayload):
         }
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to save session: {exc}") from exc
+
+
+# ---------------------------------------------------------------------------
+# Incremental sessions: start, submit each answer as it is recorded (scored
+# in the background), then complete by aggregating the stored scores.
+# ---------------------------------------------------------------------------
+
+
+def _session_object_id(session_id: str) -> ObjectId:
+    try:
+        return ObjectId(session_id)
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+def _answer_key(answer: QuestionAnswer) -> str:
+    """Identifies the texts a score was computed from, so a stale score
+    (the answer was resubmitted) is never reused."""
+    expected = (answer.expected_answer or answer.question or "").strip()
+    return hashlib.sha1(f"{expected}\0{(answer.answer_text or '').strip()}".encode("utf-8")).hexdigest()
+
+
+async def _score_submitted_answer(
+    session_id: ObjectId, interview_id: Optional[str], index: int, answer: QuestionAnswer
+) -> None:
+    try:
+        precomputed = await _load_question_embeddings(interview_id)
+        answer_eval = await run_in_threadpool(profile_call, _score_answers_batch, [answer], precomputed)
+        await get_async_interview_sessions_collection().update_one(
+            {"_id": session_id, "status": IN_PROGRESS},
+            {"$set": {f"answer_scores.{index}": {"score": answer_eval["question_scores"][0], "key": _answer_key(answer)}}},
+        )
+        SESSION_ANSWER_SCORES.inc(when="submitted")
+    except Exception:
+        # Completion scores any answer left without a matching score.
+        pass
+
+
+def _submitted_answers(session: dict) -> List[QuestionAnswer]:
+    submitted = session.get("submitted_answers") or {}
+    return [QuestionAnswer(**submitted[index]) for index in sorted(submitted, key=int)]
+
+
+async def _aggregate_answer_scores(session: dict, answers: List[QuestionAnswer]) -> dict:
+    """Evaluation of ``answers`` from the scores stored as they were
+    submitted; only answers without a matching score are encoded now."""
+    stored = session.get("answer_scores") or {}
+    question_scores = [0.0] * len(answers)
+    missing = []
+    answered = 0
+    for i, answer in enumerate(answers):
+        if not (answer.answer_text or "").strip():
+            continue
+        answered += 1
+        score = stored.get(str(i))
+        if score and score.get("key") == _answer_key(answer):
+            question_scores[i] = score["score"]
+        else:
+            missing.append(i)
+
+    if missing:
+        precomputed = await _load_question_embeddings(session.get("interview_id"))
+        late = await run_in_threadpool(profile_call, _score_answers_batch, [answers[i] for i in missing], precomputed)
+        for i, score in zip(missing, late["question_scores"]):
+            question_scores[i] = score
+        SESSION_ANSWER_SCORES.inc(len(missing), when="completion")
+    return _evaluate_scores(question_scores, answered / len(answers) if answers else 0.0)
+
+
+@router.post("/session/start")
+async def start_interview_session(payload: SessionStartPayload):
+    now = datetime.utcnow()
+    document = {
+        "session_mode": payload.session_mode or "interview",
+        "interview_id": payload.interview_id,
+        "candidate_email": payload.candidate_email,
+        "candidate_name": payload.candidate_name,
+        "status": IN_PROGRESS,
+        "submitted_answers": {},
+        "answer_scores": {},
+        "created_at": now,
+        # Cleared on completion; abandoned sessions expire.
+        "expires_at": now + timedelta(hours=SESSION_DRAFT_TTL_HOURS),
+    }
+    with stage("session.db_insert"):
+        insert_result = await get_async_interview_sessions_collection().insert_one(document)
+    return {"session_id": str(insert_result.inserted_id), "session_mode": document["session_mode"]}
+
+
+@router.post("/session/{session_id}/answers", status_code=202)
+async def submit_session_answer(session_id: str, submission: AnswerSubmission, background_tasks: BackgroundTasks):
+    """Store one answer and score it after the response is sent.
+    Resubmitting an index replaces the answer."""
+    object_id = _session_object_id(session_id)
+    answer = submission.answer
+    session = await get_async_interview_sessions_collection().find_one_and_update(
+        {"_id": object_id, "status": IN_PROGRESS},
+        {"$set": {f"submitted_answers.{submission.index}": answer.model_dump()}},
+        projection={"interview_id": 1},
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or already completed")
+
+    scoring = bool((answer.answer_text or "").strip())
+    if scoring:
+        background_tasks.add_task(_score_submitted_answer, object_id, session.get("interview_id"), submission.index, answer)
+    return {"session_id": session_id, "index": submission.index, "scoring": scoring}
+
+
+@router.post("/session/{session_id}/complete")
+async def complete_started_session(session_id: str, payload: SessionCompletePayload):
+    object_id = _session_object_id(session_id)
+    collection = get_async_interview_sessions_collection()
+    session = await collection.find_one({"_id": object_id, "status": IN_PROGRESS})
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found or already completed")
+
+    try:
+        answers = payload.answers if payload.answers is not None else _submitted_answers(session)
+        answer_eval = await _aggregate_answer_scores(session, answers)
+        summary = _session_summary(answer_eval, payload.face_metrics)
+
+        answer_dicts = [a.model_dump() for a in answers]
+        raw = {"_id": object_id, "created_at": session["created_at"], "answers": answer_dicts}
+        raw, artifact = prepare_offload(raw, INTERVIEW_SESSIONS, SESSION_RAW_FIELDS)
+        completed = {
+            "status": COMPLETED,
+            "answer_count": len(answers),
+            "face_metrics": payload.face_metrics.model_dump(),
+            "summary": summary,
+            "completed_at": datetime.utcnow(),
+        }
+        if "answers" in raw:
+            completed["answers"] = raw["answers"]
+        with stage("session.db_update"):
+            result = await collection.update_one(
+                {"_id": object_id, "status": IN_PROGRESS},
+                {"$set": completed, "$unset": {"submitted_answers": "", "answer_scores": "", "expires_at": ""}},
+            )
+            if not result.modified_count:
+                raise HTTPException(status_code=409, detail="Session was completed concurrently")
+            # Only the request that completed the session writes its
+            # artifact, so a losing racer can't replace the winner's answers.
+            try:
+                await upsert_artifact(artifact)
+            except Exception:
+                logger.exception("Session %s artifact write failed; keeping answers inline", session_id)
+                await collection.update_one({"_id": object_id}, {"$set": {"answers": answer_dicts}})
+        await _record_rollup({**session, **completed})
+
+        return {
+            "message": "Interview session stored",
+            "session_id": session_id,
+            "session_mode": session.get("session_mode") or "interview",
+            "summary": summary,
+        }
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to save session: {exc}") from exc
+
+
+@router.get("/embedding-cache")
+def embedding_cache_stats():
+    return embedding_cache.stats()
+
+
+@router.get("/embedding-scheduler")
+def embedding_scheduler_stats():
+    return get_batcher().stats()
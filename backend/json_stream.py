@@ -0,0 +1,93 @@
+import json
+from typing import List, Optional, Tuple
+
+
+class IncrementalJSONParser:
+    """Yields members of a streamed JSON object as soon as each one closes.
+
+    Text is fed in arbitrary chunks (e.g. LLM completion deltas). Anything
+    before the first ``{`` (such as a markdown fence) is skipped. Members
+    nested inside objects up to ``max_depth`` levels are reported as
+    ``(path, value)`` tuples, e.g. ``(("interview_questions", "hr"), [...])``.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.done = False
+        self._text = ""
+        self._pos = 0
+        self._stack: List[dict] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start: Optional[int] = None
+        self._last_string: Optional[Tuple[int, int]] = None
+
+    def feed(self, chunk: str) -> List[tuple]:
+        if self.done:
+            return []
+        self._text += chunk
+        events = []
+        text = self._text
+
+        while self._pos < len(text):
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+
+            if not self._stack:
+                if char == "{":
+                    self._stack.append(self._frame("{", ()))
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = (self._string_start, i + 1)
+                continue
+
+            top = self._stack[-1]
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":" and top["kind"] == "{" and self._last_string:
+                top["key"] = json.loads(text[self._last_string[0]:self._last_string[1]])
+                top["value_start"] = i + 1
+            elif char in "{[":
+                if top["kind"] == "{":
+                    path = top["path"] + (top["key"],)
+                else:
+                    path = top["path"] + (None,)
+                self._stack.append(self._frame(char, path))
+            elif char in ",}]":
+                if top["kind"] == "{":
+                    self._finish_member(top, i, events)
+                if char != ",":
+                    self._stack.pop()
+                    if not self._stack:
+                        self.done = True
+                        break
+
+        return events
+
+    @staticmethod
+    def _frame(kind: str, path: tuple) -> dict:
+        return {"kind": kind, "path": path, "key": None, "value_start": None}
+
+    def _finish_member(self, frame: dict, end: int, events: list) -> None:
+        key, start = frame["key"], frame["value_start"]
+        frame["key"] = frame["value_start"] = None
+        if key is None or start is None:
+            return
+        path = frame["path"] + (key,)
+        # Members of objects inside arrays have a None in their path.
+        if len(path) > self.max_depth or None in path:
+            return
+        try:
+            value = json.loads(self._text[start:end])
+        except ValueError:
+            return
+        events.append((path, value))
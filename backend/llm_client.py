@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator
+
+import httpx
+
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+
+
+class LLMError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"LLM request failed with status {status_code}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AsyncLLMClient:
+    """Chat-completions client sharing one pooled HTTP connection set.
+
+    At most ``max_concurrency`` requests are in flight upstream at once;
+    additional callers wait on a semaphore instead of opening new sockets.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        headers: dict,
+        connect_timeout: float = LLM_CONNECT_TIMEOUT,
+        read_timeout: float = LLM_READ_TIMEOUT,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        max_connections: int = LLM_MAX_CONNECTIONS,
+    ):
+        self.api_url = api_url
+        self._http = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(self, payload: dict) -> dict:
+        async with self._semaphore:
+            response = await self._http.post(self.api_url, json=payload)
+        if response.status_code != 200:
+            raise LLMError(response.status_code, response.text)
+        return response.json()
+
+    async def stream(self, payload: dict) -> AsyncIterator[str]:
+        """Request a streamed completion and yield content deltas as they arrive."""
+        async with self._semaphore:
+            async with self._http.stream("POST", self.api_url, json={**payload, "stream": True}) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    raise LLMError(response.status_code, body.decode("utf-8", errors="replace"))
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        continue
+                    choices = chunk.get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
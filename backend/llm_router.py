@@ -0,0 +1,379 @@
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, List, Optional
+
+import httpx
+
+if __package__:
+    from .llm_client import AsyncLLMClient, LLMError
+    from .metrics import LLM_ATTEMPTS, LLM_HEDGES, counter_lines, registry
+else:
+    from llm_client import AsyncLLMClient, LLMError
+    from metrics import LLM_ATTEMPTS, LLM_HEDGES, counter_lines, registry
+
+# Ordered JSON list of backends, e.g.
+# [{"name": "hf", "url": "...", "model": "...", "api_key_env": "HF_API_KEY"},
+#  {"name": "local", "url": "http://vllm:8000/v1/chat/completions"}]
+# Unset means the single HF_API_URL backend.
+LLM_BACKENDS = os.getenv("LLM_BACKENDS", "")
+# Deadline for one upstream attempt, and for the whole call across retries
+# and hedges.
+LLM_ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "60"))
+LLM_TOTAL_BUDGET = float(os.getenv("LLM_TOTAL_BUDGET", "120"))
+# Start a duplicate attempt on the next backend when the current ones have
+# not answered after this many seconds; 0 disables hedging.
+LLM_HEDGE_DELAY = float(os.getenv("LLM_HEDGE_DELAY", "20"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "3"))
+# Consecutive failures that open a backend's circuit, and how long it stays
+# open before one trial request is let through.
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Client errors that may succeed on another attempt.
+RETRYABLE_CLIENT_ERRORS = frozenset({408, 429})
+
+
+class LLMUnavailable(LLMError):
+    """No backend produced a completion within the budget."""
+
+
+class LLMRejected(LLMError):
+    """A backend refused the request itself (a 4xx other than 408/429).
+
+    Bad credentials, an unknown model or a malformed payload get the same
+    answer from every attempt, so the call is not retried and the backend's
+    breaker is left alone. Reported as a 500: the fault is in how this
+    server calls the LLM, not in the client's upload.
+    """
+
+    def __init__(self, upstream_status: int, detail: str):
+        super().__init__(500, f"LLM backend rejected the request with HTTP {upstream_status}: {detail}")
+        self.upstream_status = upstream_status
+
+
+class CircuitBreaker:
+    """Closed until ``threshold`` consecutive failures, then open for
+    ``cooldown`` seconds; after that a single trial call decides whether
+    it closes again (half-open)."""
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, cooldown: float = LLM_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._trial:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        # The attempt was cancelled (a hedge lost the race): no verdict.
+        self._trial = False
+
+
+class LLMBackend:
+    def __init__(self, name: str, url: str, headers: dict, model: Optional[str] = None):
+        self.name = name
+        self.model = model
+        self.client = AsyncLLMClient(url, headers)
+        self.breaker = CircuitBreaker()
+
+    def payload(self, payload: dict) -> dict:
+        return {**payload, "model": self.model} if self.model else payload
+
+
+def _failure_reason(exc: BaseException) -> str:
+    if isinstance(exc, LLMError):
+        return f"http_{exc.status_code}"
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return "timeout"
+    if isinstance(exc, httpx.HTTPError):
+        return "transport"
+    if isinstance(exc, ValueError):
+        return "invalid_response"
+    return "error"
+
+
+def _rejection(exc: BaseException) -> Optional[LLMRejected]:
+    """The LLMRejected for ``exc`` if retrying cannot help, else None."""
+    if isinstance(exc, LLMError):
+        status, detail = exc.status_code, exc.detail
+    elif isinstance(exc, httpx.HTTPStatusError):
+        status, detail = exc.response.status_code, exc.response.text
+    else:
+        return None
+    if status >= 500 or status < 400 or status in RETRYABLE_CLIENT_ERRORS:
+        return None
+    return LLMRejected(status, detail)
+
+
+class LLMRouter:
+    """Sends each completion to an ordered list of backends.
+
+    The first attempt goes to the first backend whose circuit is closed.
+    A failed attempt is retried on the next backend straight away, unless
+    the backend rejected the request itself (see LLMRejected); a slow one
+    is hedged with a duplicate on the next backend after
+    ``hedge_delay`` seconds, and whichever answers first wins. At most
+    ``max_attempts`` attempts are made, each within ``attempt_timeout``,
+    and the call gives up when ``total_budget`` runs out.
+    """
+
+    def __init__(
+        self,
+        backends: List[LLMBackend],
+        attempt_timeout: float = LLM_ATTEMPT_TIMEOUT,
+        total_budget: float = LLM_TOTAL_BUDGET,
+        hedge_delay: float = LLM_HEDGE_DELAY,
+        max_attempts: int = LLM_MAX_ATTEMPTS,
+    ):
+        if not backends:
+            raise ValueError("At least one LLM backend is required")
+        self.backends = backends
+        self.attempt_timeout = attempt_timeout
+        self.total_budget = total_budget
+        self.hedge_delay = hedge_delay
+        self.max_attempts = max_attempts
+
+    def _next_backend(self, start: int):
+        """First backend from ``start`` (wrapping) whose circuit lets a call
+        through; returns (backend, next start) or (None, start)."""
+        for offset in range(len(self.backends)):
+            index = (start + offset) % len(self.backends)
+            if self.backends[index].breaker.allow():
+                return self.backends[index], index + 1
+        return None, start
+
+    async def _attempt(self, backend: LLMBackend, payload: dict, timeout: float) -> dict:
+        try:
+            result = await asyncio.wait_for(backend.client.complete(backend.payload(payload)), timeout)
+        except Exception as exc:
+            LLM_ATTEMPTS.inc(backend=backend.name, outcome=_failure_reason(exc))
+            rejection = _rejection(exc)
+            if rejection is not None:
+                # The backend is up and answered; no verdict on its health.
+                backend.breaker.release()
+                raise rejection from exc
+            # Any other error counts, including a 200 whose body isn't JSON,
+            # so a half-open trial always settles.
+            backend.breaker.record_failure()
+            raise
+        except BaseException:
+            backend.breaker.release()
+            LLM_ATTEMPTS.inc(backend=backend.name, outcome="cancelled")
+            raise
+        backend.breaker.record_success()
+        LLM_ATTEMPTS.inc(backend=backend.name, outcome="ok")
+        return result
+
+    async def complete(self, payload: dict) -> dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.total_budget
+        running = {}
+        attempts = 0
+        cursor = 0
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            nonlocal attempts, cursor
+            backend, cursor = self._next_backend(cursor)
+            if backend is None:
+                return False
+            attempts += 1
+            timeout = min(self.attempt_timeout, deadline - loop.time())
+            running[asyncio.ensure_future(self._attempt(backend, payload, timeout))] = backend
+            return True
+
+        try:
+            if not launch():
+                raise LLMUnavailable(503, "All LLM backends are unavailable (circuit open)")
+            while running:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                can_hedge = self.hedge_delay > 0 and attempts < self.max_attempts
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=min(self.hedge_delay, remaining) if can_hedge else remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if can_hedge and launch():
+                        LLM_HEDGES.inc()
+                    continue
+                for task in done:
+                    running.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+                    if isinstance(last_error, LLMRejected):
+                        raise last_error
+                    if attempts < self.max_attempts:
+                        launch()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                # Let the losing attempts finish cancelling and release their connections.
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if last_error is None or deadline - loop.time() <= 0:
+            raise LLMUnavailable(504, f"No LLM completion within {self.total_budget:g}s")
+        detail = getattr(last_error, "detail", None) or str(last_error) or type(last_error).__name__
+        raise LLMUnavailable(502, f"All LLM attempts failed: {detail}") from last_error
+
+    async def stream(self, payload: dict) -> AsyncIterator[str]:
+        """Streamed completion from the first backend that starts answering.
+
+        Not hedged: once deltas have been sent the stream can't switch
+        backends, so failover only happens before the first delta.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.total_budget
+        cursor = 0
+        last_error: Optional[BaseException] = None
+
+        for _ in range(self.max_attempts):
+            remaining = deadline - loop.time()
+            backend, cursor = self._next_backend(cursor)
+            if backend is None or remaining <= 0:
+                break
+            deltas = backend.client.stream(backend.payload(payload)).__aiter__()
+            # Set once the breaker has a verdict; a stream cancelled or
+            # closed by the consumer before that releases the trial.
+            settled = False
+            try:
+                try:
+                    first = await asyncio.wait_for(deltas.__anext__(), min(self.attempt_timeout, remaining))
+                except StopAsyncIteration:
+                    settled = True
+                    backend.breaker.record_success()
+                    return
+                except Exception as exc:
+                    settled = True
+                    LLM_ATTEMPTS.inc(backend=backend.name, outcome=_failure_reason(exc))
+                    rejection = _rejection(exc)
+                    if rejection is not None:
+                        backend.breaker.release()
+                        raise rejection from exc
+                    backend.breaker.record_failure()
+                    last_error = exc
+                    continue
+
+                yield first
+                try:
+                    async for delta in deltas:
+                        yield delta
+                except Exception as exc:
+                    settled = True
+                    backend.breaker.record_failure()
+                    LLM_ATTEMPTS.inc(backend=backend.name, outcome=_failure_reason(exc))
+                    raise LLMUnavailable(502, f"LLM stream broke off: {exc}") from exc
+                settled = True
+                backend.breaker.record_success()
+                LLM_ATTEMPTS.inc(backend=backend.name, outcome="ok")
+                return
+            finally:
+                if not settled:
+                    backend.breaker.release()
+                    LLM_ATTEMPTS.inc(backend=backend.name, outcome="cancelled")
+                await deltas.aclose()
+
+        if last_error is None:
+            raise LLMUnavailable(503, "All LLM backends are unavailable (circuit open)")
+        detail = getattr(last_error, "detail", None) or str(last_error) or type(last_error).__name__
+        raise LLMUnavailable(502, f"All LLM attempts failed: {detail}") from last_error
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "name": backend.name,
+                "model": backend.model,
+                "url": backend.client.api_url,
+                "state": backend.breaker.state,
+                "consecutive_failures": backend.breaker.failures,
+            }
+            for backend in self.backends
+        ]
+
+    async def aclose(self) -> None:
+        for backend in self.backends:
+            await backend.client.aclose()
+
+
+def parse_backends(spec: str, default_url: str, default_headers: dict, default_model: Optional[str] = None):
+    """Backends from an ``LLM_BACKENDS`` JSON spec, or the default one."""
+    if not spec.strip():
+        return [LLMBackend("default", default_url, default_headers, default_model)]
+
+    backends = []
+    for index, entry in enumerate(json.loads(spec)):
+        api_key = entry.get("api_key") or os.getenv(entry.get("api_key_env", ""), "")
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        backends.append(
+            LLMBackend(entry.get("name") or f"backend{index}", entry["url"], headers, entry.get("model") or default_model)
+        )
+    return backends
+
+
+_router: Optional[LLMRouter] = None
+
+
+def get_llm_router(api_url: str, headers: dict, model: Optional[str] = None) -> LLMRouter:
+    global _router
+    if _router is None:
+        _router = LLMRouter(parse_backends(LLM_BACKENDS, api_url, headers, model))
+    return _router
+
+
+async def close_llm_router() -> None:
+    global _router
+    if _router is not None:
+        await _router.aclose()
+        _router = None
+
+
+_BREAKER_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def _router_metrics() -> list:
+    if _router is None:
+        return []
+    return counter_lines(
+        "llm_backend_circuit_state",
+        "Circuit breaker state per LLM backend (0 closed, 1 half-open, 2 open).",
+        {f'{{backend="{backend.name}"}}': _BREAKER_STATES[backend.breaker.state] for backend in _router.backends},
+        "gauge",
+    )
+
+
+registry.add_collector(_router_metrics)
@@ -1,5 +1,12 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from pymongo.errors import PyMongoError
 
 try:
     from dotenv import load_dotenv
@@ -12,14 +19,83 @@ if __package__:
     from .auth import router as auth_router
     from .resume_router import router as res_router
     from .interview_router import router as interview_router
-    from .db import ping_mongo
+    from .bulk_ingest import router as bulk_router
+    from .session_results import router as session_results_router
+    from .resume_router import HEADERS, HF_API_URL, HF_MODEL, job_queue
+    from .db import close_client, ensure_indexes_async, ping_mongo_async
+    from .embeddings import get_embedding_backend, is_backend_loaded, stop_batcher, warm_up
+    from .extraction import shutdown_extraction_pool
+    from .llm_router import close_llm_router, get_llm_router
+    from .metrics import METRICS_ENABLED, MetricsMiddleware, registry
+    from .profiling import PROFILING_ENABLED, ProfilingMiddleware
 else:
     from auth import router as auth_router
     from resume_router import router as res_router
     from interview_router import router as interview_router
-    from db import ping_mongo
+    from bulk_ingest import router as bulk_router
+    from session_results import router as session_results_router
+    from resume_router import HEADERS, HF_API_URL, HF_MODEL, job_queue
+    from db import close_client, ensure_indexes_async, ping_mongo_async
+    from embeddings import get_embedding_backend, is_backend_loaded, stop_batcher, warm_up
+    from extraction import shutdown_extraction_pool
+    from llm_router import close_llm_router, get_llm_router
+    from metrics import METRICS_ENABLED, MetricsMiddleware, registry
+    from profiling import PROFILING_ENABLED, ProfilingMiddleware
+
+
+def _env_flag(name: str, default: str = "0") -> bool:
+    return os.getenv(name, default).lower() in {"1", "true", "yes"}
+
+
+EMBEDDING_PRELOAD = _env_flag("EMBEDDING_PRELOAD")
+EMBEDDING_WARMUP = _env_flag("EMBEDDING_WARMUP", "1" if EMBEDDING_PRELOAD else "0")
+
+# Loading at import time lets a pre-forking server (e.g. gunicorn --preload
+# -k uvicorn.workers.UvicornWorker main:app) load the model once in the
+# master so workers share its pages copy-on-write.
+if EMBEDDING_PRELOAD:
+    get_embedding_backend()
+
+# Index creation is retried with backoff while MongoDB comes up; startup
+# fails if it still can't be reached after the last attempt.
+STARTUP_INDEX_ATTEMPTS = int(os.getenv("STARTUP_INDEX_ATTEMPTS", "5"))
+STARTUP_INDEX_RETRY_SECONDS = float(os.getenv("STARTUP_INDEX_RETRY_SECONDS", "2"))
+
+logger = logging.getLogger(__name__)
+
 
-app = FastAPI(title="AI Mock Interviews API")
+async def _ensure_indexes_at_startup() -> None:
+    for attempt in range(1, STARTUP_INDEX_ATTEMPTS + 1):
+        try:
+            await ensure_indexes_async()
+            return
+        except PyMongoError as exc:
+            if attempt >= STARTUP_INDEX_ATTEMPTS:
+                logger.error("Could not create MongoDB indexes after %d attempts: %s", attempt, exc)
+                raise
+            logger.warning("Creating MongoDB indexes failed (attempt %d/%d): %s", attempt, STARTUP_INDEX_ATTEMPTS, exc)
+            await asyncio.sleep(STARTUP_INDEX_RETRY_SECONDS * 2 ** (attempt - 1))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Everything here finishes before the server starts accepting requests.
+    await _ensure_indexes_at_startup()
+    get_llm_router(HF_API_URL, HEADERS, HF_MODEL)
+    if EMBEDDING_WARMUP:
+        await asyncio.to_thread(warm_up)
+    await job_queue.start()
+
+    yield
+
+    await job_queue.stop()
+    await close_llm_router()
+    shutdown_extraction_pool()
+    stop_batcher()
+    close_client()
+
+
+app = FastAPI(title="AI Mock Interviews API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,13 +104,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 app.include_router(auth_router)
 app.include_router(res_router)
 app.include_router(interview_router)
+app.include_router(bulk_router)
+app.include_router(session_results_router)
 
 
 @app.get("/health")
-def health_check():
-    mongo_ok = ping_mongo()
-    return {"status": "ok", "mongodb": "connected" if mongo_ok else "disconnected"}
+async def health_check():
+    mongo_ok = await ping_mongo_async()
+    return {
+        "status": "ok",
+        "mongodb": "connected" if mongo_ok else "disconnected",
+        "embedding_model": "loaded" if is_backend_loaded() else "not loaded",
+    }
+
+
+if METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,250 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, List, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in {"0", "false", "no"}
+
+# Seconds; spans a cached lookup up to a slow LLM call.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum.
+        self._values: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        # Callables returning exposition lines for values owned elsewhere
+        # (e.g. cache statistics), evaluated only when scraped.
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(
+    Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+)
+HTTP_LATENCY = registry.register(
+    Histogram("http_request_duration_seconds", "Time until the response headers are sent.", ("method", "route"))
+)
+HTTP_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "Requests currently being handled."))
+STAGE_LATENCY = registry.register(
+    Histogram("stage_duration_seconds", "Time spent in named processing stages.", ("stage",))
+)
+STAGE_ERRORS = registry.register(Counter("stage_errors_total", "Stages that raised.", ("stage",)))
+LLM_FAILURES = registry.register(Counter("llm_failures_total", "Failed LLM calls.", ("reason",)))
+LLM_ATTEMPTS = registry.register(
+    Counter("llm_attempts_total", "Upstream LLM attempts by backend and outcome.", ("backend", "outcome"))
+)
+LLM_HEDGES = registry.register(Counter("llm_hedged_attempts_total", "Duplicate LLM attempts started by hedging."))
+LLM_PARSE_ERRORS = registry.register(
+    Counter("llm_parse_errors_total", "LLM outputs that did not contain a JSON object.")
+)
+FALLBACK_QUESTIONS = registry.register(
+    Counter("fallback_questions_total", "Analyses that used fallback questions.", ("section",))
+)
+PROMPT_TOKENS = registry.register(
+    Histogram(
+        "resume_prompt_tokens",
+        "Resume tokens before and after prompt assembly.",
+        ("kind",),
+        buckets=(250, 500, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 16000),
+    )
+)
+PROMPT_TRIMMED = registry.register(Counter("resume_prompt_trimmed_total", "Resumes cut to fit the token budget."))
+SESSION_ANSWER_SCORES = registry.register(
+    Counter(
+        "session_answer_scores_total",
+        "Non-empty session answers scored, in the background as submitted or late at completion.",
+        ("when",),
+    )
+)
+
+_NOOP = nullcontext()
+
+
+@contextmanager
+def _timed_stage(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage=name)
+
+
+def stage(name: str):
+    """Time a block as ``stage_duration_seconds{stage=name}``.
+
+    Works around sync code and ``await`` alike. A shared no-op context when
+    metrics are disabled.
+    """
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _timed_stage(name)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight
+    requests, labelled by route template rather than raw path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                HTTP_LATENCY.observe(time.perf_counter() - started, method=scope["method"], route=_route(scope))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUESTS.inc(method=scope["method"], route=_route(scope), status=status["code"])
+
+
+def _route(scope) -> str:
+    # Set by the router once it has matched; unmatched paths share one label.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def counter_lines(name: str, help_text: str, values: Dict[str, float], kind: str = "counter") -> List[str]:
+    """Exposition lines for a metric whose values live outside the registry."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in values.items():
+        lines.append(f"{name}{labels} {_format_value(value)}")
+    return lines
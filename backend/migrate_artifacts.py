@@ -0,0 +1,119 @@
+"""Move raw fields of existing documents into compressed interview_artifacts.
+
+Interviews lose resume_text and llm_raw_output, sessions lose answers (and
+gain answer_count). Artifacts inherit the owner's created_at, so with a
+TTL configured, raw data older than the TTL expires shortly after the
+migration. Prints one JSON line per batch and a summary per collection;
+safe to re-run.
+
+    python migrate_artifacts.py --collections interviews --batch-size 500
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from datetime import datetime
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except Exception:
+    pass
+
+if __package__:
+    from .artifacts import INTERVIEW_RAW_FIELDS, SESSION_RAW_FIELDS, build_artifact, decompress, split_document
+    from .db import INTERVIEW_SESSIONS, INTERVIEWS, close_client, ensure_indexes, get_db, get_interview_artifacts_collection
+else:
+    from artifacts import INTERVIEW_RAW_FIELDS, SESSION_RAW_FIELDS, build_artifact, decompress, split_document
+    from db import INTERVIEW_SESSIONS, INTERVIEWS, close_client, ensure_indexes, get_db, get_interview_artifacts_collection
+
+RAW_FIELDS = {INTERVIEWS: INTERVIEW_RAW_FIELDS, INTERVIEW_SESSIONS: SESSION_RAW_FIELDS}
+
+
+def _existing_raw(artifacts, ids) -> dict:
+    """Raw fields already offloaded for ``ids`` (a re-run after a partial
+    migration), so they are merged rather than overwritten."""
+    existing = {}
+    for artifact in artifacts.find({"_id": {"$in": ids}}):
+        existing[artifact["_id"]] = json.loads(decompress(artifact["codec"], bytes(artifact["data"])))
+    return existing
+
+
+def migrate_collection(name: str, batch_size: int, dry_run: bool) -> dict:
+    fields = RAW_FIELDS[name]
+    collection = get_db()[name]
+    artifacts = get_interview_artifacts_collection()
+    query = {"$or": [{field: {"$exists": True}} for field in fields]}
+    projection = {**{field: 1 for field in fields}, "created_at": 1}
+    totals = {"event": "summary", "collection": name, "documents": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    # Migrated documents drop out of the query, so each batch starts over;
+    # a dry run walks a single cursor instead.
+    cursor = collection.find(query, projection=projection).batch_size(batch_size) if dry_run else None
+    while True:
+        if dry_run:
+            batch = [document for _, document in zip(range(batch_size), cursor)]
+        else:
+            batch = list(collection.find(query, projection=projection).limit(batch_size))
+        if not batch:
+            break
+
+        existing = {} if dry_run else _existing_raw(artifacts, [document["_id"] for document in batch])
+        new_artifacts = []
+        # Documents grouped by the fields set alongside the unset (the
+        # answer count for sessions), one update_many per group.
+        updates = defaultdict(list)
+        stats = {"event": "batch", "collection": name, "documents": len(batch), "raw_bytes": 0, "stored_bytes": 0}
+        for document in batch:
+            _, raw = split_document(document, fields)
+            extra = len(document.get("answers") or []) if name == INTERVIEW_SESSIONS else None
+            updates[extra].append(document["_id"])
+            if not raw:
+                continue
+            raw = {**existing.get(document["_id"], {}), **raw}
+            artifact = build_artifact(document["_id"], name, raw, document.get("created_at") or datetime.utcnow())
+            new_artifacts.append(artifact)
+            stats["raw_bytes"] += artifact["raw_bytes"]
+            stats["stored_bytes"] += artifact["stored_bytes"]
+
+        if not dry_run:
+            # Artifacts are written before the fields are removed, so an
+            # interrupted run never loses data.
+            if new_artifacts:
+                artifacts.delete_many({"_id": {"$in": [artifact["_id"] for artifact in new_artifacts]}})
+                artifacts.insert_many(new_artifacts, ordered=False)
+            for answer_count, ids in updates.items():
+                update = {"$unset": {field: "" for field in fields}}
+                if answer_count is not None:
+                    update["$set"] = {"answer_count": answer_count}
+                collection.update_many({"_id": {"$in": ids}}, update)
+
+        print(json.dumps(stats), flush=True)
+        for key in ("documents", "raw_bytes", "stored_bytes"):
+            totals[key] += stats[key]
+
+    totals["dry_run"] = dry_run
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collections", nargs="+", default=list(RAW_FIELDS), choices=list(RAW_FIELDS))
+    parser.add_argument("--batch-size", type=int, default=200, help="Documents per bulk write")
+    parser.add_argument("--dry-run", action="store_true", help="Report sizes without writing")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    try:
+        if not args.dry_run:
+            ensure_indexes()
+        for name in args.collections:
+            print(json.dumps(migrate_collection(name, args.batch_size, args.dry_run)), flush=True)
+    finally:
+        close_client()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import asyncio
+import cProfile
+import contextvars
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List, Optional
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0").lower() in {"1", "true", "yes"}
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+# When set, the header must carry this value; otherwise any value but "0" works.
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+_current: contextvars.ContextVar = contextvars.ContextVar("profile_session", default=None)
+# cProfile hooks the whole event-loop thread, so one request at a time.
+_busy = threading.Lock()
+
+
+class ProfileSession:
+    """One profiled request: the event-loop profile plus any parts captured
+    in worker threads or processes, merged into a single pstats file."""
+
+    def __init__(self, profile_id: str, directory: Path):
+        self.id = profile_id
+        self.directory = directory
+        self.profile = cProfile.Profile()
+        self._parts: List = []
+        self._lock = threading.Lock()
+
+    def part_path(self, label: str) -> str:
+        return str(self.directory / f"{self.id}.{label}.{uuid.uuid4().hex[:8]}.part")
+
+    def add_part(self, part) -> None:
+        # A pstats file path or a cProfile.Profile from another thread.
+        with self._lock:
+            self._parts.append(part)
+
+    def save(self, tags: dict) -> Path:
+        stats = pstats.Stats(self.profile)
+        with self._lock:
+            parts = list(self._parts)
+        for part in parts:
+            if isinstance(part, str):
+                if os.path.exists(part):
+                    stats.add(part)
+                    os.remove(part)
+            else:
+                stats.add(part)
+
+        path = self.directory / f"{self.id}.prof"
+        stats.dump_stats(str(path))
+        (self.directory / f"{self.id}.json").write_text(json.dumps(tags, indent=2))
+        _prune(self.directory)
+        return path
+
+
+def _prune(directory: Path) -> None:
+    profiles = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+    for stale in profiles[: max(0, len(profiles) - PROFILE_MAX_FILES)]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".json").unlink(missing_ok=True)
+
+
+def current_profile() -> Optional[ProfileSession]:
+    return _current.get()
+
+
+def profile_call(fn: Callable, *args, **kwargs):
+    """Run ``fn`` under its own profiler when the current request is being
+    profiled. For work handed to a thread pool, which the event-loop
+    profiler does not see."""
+    session = current_profile()
+    if session is None:
+        return fn(*args, **kwargs)
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows one active profiler per process; the
+        # request's profiler is that one and already sees this thread.
+        return fn(*args, **kwargs)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profile.disable()
+        session.add_part(profile)
+
+
+def run_with_profile(path: str, fn: Callable, *args):
+    """Process-pool entry point: profile ``fn`` and dump the stats to ``path``."""
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        return fn(*args)
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+
+class ProfilingMiddleware:
+    """Profiles requests that send ``PROFILE_HEADER`` or are picked by
+    ``PROFILE_SAMPLE_RATE``.
+
+    The profile id is returned in the ``X-Profile-Id`` response header; the
+    pstats file and a JSON file with route, input size and timing are
+    written to ``PROFILE_DIR`` once the response has finished. Other
+    requests running on the event loop meanwhile show up in the profile
+    too, so it is most precise on a quiet instance.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.directory = Path(PROFILE_DIR)
+
+    def _wanted(self, scope) -> Optional[str]:
+        header = PROFILE_HEADER.lower().encode("latin-1")
+        for name, value in scope.get("headers", []):
+            if name == header:
+                value = value.decode("latin-1")
+                if PROFILE_TOKEN:
+                    return "header" if value == PROFILE_TOKEN else None
+                return "header" if value not in {"", "0"} else None
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self._wanted(scope)
+        if trigger is None or not _busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            session = ProfileSession(f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}", self.directory)
+            status = {"code": 500}
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    status["code"] = message["status"]
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", session.id.encode())]}
+                await send(message)
+
+            token = _current.set(session)
+            started = time.perf_counter()
+            session.profile.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                session.profile.disable()
+                _current.reset(token)
+                headers = dict(scope.get("headers", []))
+                route = scope.get("route")
+                # Merging and writing the stats is file I/O; keep it off the loop.
+                await asyncio.to_thread(
+                    session.save,
+                    {
+                        "id": session.id,
+                        "trigger": trigger,
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": getattr(route, "path", None),
+                        "input_bytes": int(headers.get(b"content-length", b"0") or 0),
+                        "status": status["code"],
+                        "duration_seconds": round(time.perf_counter() - started, 4),
+                        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    },
+                )
+        finally:
+            _busy.release()
@@ -0,0 +1,181 @@
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import List, Optional, Tuple
+
+if __package__:
+    from .resume_parser import HEADER_RE, SECTION_KEYWORDS
+else:
+    from resume_parser import HEADER_RE, SECTION_KEYWORDS
+
+# Token budget for the resume part of the prompt; 0 disables trimming.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+# Optional HuggingFace tokenizer used for counting, e.g. the tokenizer of
+# HF_MODEL. Without one, tokens are estimated from the character count.
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "")
+CHARS_PER_TOKEN = 4
+
+# Most useful for question generation first; unknown sections and the
+# lines before the first header come after the ranked ones.
+SECTION_PRIORITY = ["skills", "projects", "work_experience", "internships", "summary", "education", "strengths", "hobbies"]
+PREAMBLE_MAX_LINES = 4
+
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+SPACE_RE = re.compile(r"[ \t\u00a0\u200b]+")
+DIGITS_RE = re.compile(r"\d+")
+# How close to the top or bottom of a page a running header/footer sits.
+PAGE_EDGE_LINES = 3
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+_tokenizer_failed = False
+
+
+def _get_tokenizer():
+    global _tokenizer, _tokenizer_failed
+    if not PROMPT_TOKENIZER or _tokenizer_failed:
+        return None
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None and not _tokenizer_failed:
+                try:
+                    from transformers import AutoTokenizer
+
+                    _tokenizer = AutoTokenizer.from_pretrained(PROMPT_TOKENIZER)
+                except Exception:
+                    # Counting falls back to the estimate rather than failing uploads.
+                    _tokenizer_failed = True
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _edge_key(line: str) -> str:
+    # Running headers often carry the page number ("Jane Doe - Page 2").
+    return DIGITS_RE.sub("#", line.lower())
+
+
+def clean_lines(text: str) -> Tuple[List[str], int]:
+    """Collapse whitespace and drop page numbers and running headers/footers.
+
+    Pages are separated by form feeds. A line counts as a running header or
+    footer when it is within ``PAGE_EDGE_LINES`` of the top or bottom of
+    more than one page; its first occurrence is kept. Lines repeated in the
+    body are left alone. Returns (lines, dropped line count).
+    """
+    pages: List[List[str]] = []
+    dropped = 0
+    for page in text.split("\f"):
+        page_lines = []
+        for raw_line in page.splitlines():
+            line = SPACE_RE.sub(" ", raw_line).strip()
+            if not line:
+                continue
+            if PAGE_NUMBER_RE.match(line):
+                dropped += 1
+                continue
+            page_lines.append(line)
+        pages.append(page_lines)
+
+    def at_edge(position: int, page_lines: List[str]) -> bool:
+        return position < PAGE_EDGE_LINES or position >= len(page_lines) - PAGE_EDGE_LINES
+
+    edge_pages = Counter()
+    for page_lines in pages:
+        edge_pages.update({_edge_key(line) for i, line in enumerate(page_lines) if at_edge(i, page_lines)})
+
+    lines: List[str] = []
+    seen = set()
+    for page_lines in pages:
+        for position, line in enumerate(page_lines):
+            key = _edge_key(line)
+            if edge_pages[key] > 1 and at_edge(position, page_lines):
+                if key in seen:
+                    dropped += 1
+                    continue
+                seen.add(key)
+            lines.append(line)
+    return lines, dropped
+
+
+def _split_sections(lines: List[str]) -> List[Tuple[Optional[str], List[str], bool]]:
+    # (field, lines, starts_with_header) in document order; field is None
+    # for the preamble and sections the parser doesn't map to a field.
+    blocks: List[Tuple[Optional[str], List[str], bool]] = [(None, [], False)]
+    for line in lines:
+        match = HEADER_RE.match(line) if len(line) <= 60 else None
+        if match:
+            blocks.append((SECTION_KEYWORDS[match.group("keyword").lower()], [line], True))
+        else:
+            blocks[-1][1].append(line)
+    preamble = blocks[0][1]
+    if len(preamble) > PREAMBLE_MAX_LINES:
+        # Keep the top lines (name, contact) apart from the rest of the
+        # unlabelled text, which ranks with the unknown sections.
+        blocks[0:1] = [(None, preamble[:PREAMBLE_MAX_LINES], False), (None, preamble[PREAMBLE_MAX_LINES:], False)]
+    return [block for block in blocks if block[1]]
+
+
+def _rank(index: int, field: Optional[str]) -> Tuple[int, int]:
+    if index == 0 and field is None:
+        return (-1, 0)  # name and contact lines
+    if field in SECTION_PRIORITY:
+        return (SECTION_PRIORITY.index(field), index)
+    return (len(SECTION_PRIORITY), index)
+
+
+def fit_resume_text(text: str, budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[str, dict]:
+    """Clean ``text`` and trim it to ``budget`` tokens.
+
+    Sections are admitted by priority (skills, projects, experience, ...)
+    until the budget runs out; the last admitted section may be cut short.
+    The result keeps the original section order. Returns (text, stats).
+    """
+    original_tokens = count_tokens(text)
+    lines, dropped_lines = clean_lines(text)
+    cleaned = "\n".join(lines)
+    cleaned_tokens = count_tokens(cleaned)
+
+    if budget <= 0 or cleaned_tokens <= budget:
+        return cleaned, {
+            "original_tokens": original_tokens,
+            "prompt_tokens": cleaned_tokens,
+            "dropped_lines": dropped_lines,
+            "truncated": False,
+        }
+
+    blocks = _split_sections(lines)
+    kept = {}
+    remaining = budget
+    for index in sorted(range(len(blocks)), key=lambda i: _rank(i, blocks[i][0])):
+        if remaining <= 0:
+            break
+        _, block_lines, has_header = blocks[index]
+        taken = []
+        spent = 0
+        for line in block_lines:
+            # +1 for the newline joining it to the previous line.
+            cost = count_tokens(line) + 1
+            if spent + cost > remaining:
+                break
+            taken.append(line)
+            spent += cost
+        # A header with none of its content isn't worth keeping.
+        if len(taken) > (1 if has_header else 0):
+            kept[index] = taken
+            remaining -= spent
+
+    trimmed = "\n".join(line for index in sorted(kept) for line in kept[index])
+    return trimmed, {
+        "original_tokens": original_tokens,
+        "prompt_tokens": count_tokens(trimmed),
+        "dropped_lines": dropped_lines + len(lines) - sum(len(block) for block in kept.values()),
+        "truncated": True,
+    }
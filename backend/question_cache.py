@@ -0,0 +1,255 @@
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+from bson import ObjectId
+from fastapi.concurrency import run_in_threadpool
+
+if __package__:
+    from .db import get_async_interviews_collection
+    from .embeddings import EMBEDDING_ID, encode_texts, pack_embeddings, unpack_embeddings
+    from .metrics import Histogram, counter_lines, registry
+    from .skill_taxonomy import get_skill_matcher
+else:
+    from db import get_async_interviews_collection
+    from embeddings import EMBEDDING_ID, encode_texts, pack_embeddings, unpack_embeddings
+    from metrics import Histogram, counter_lines, registry
+    from skill_taxonomy import get_skill_matcher
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "1").lower() not in {"0", "false", "no"}
+# Cosine similarity of skills+summary embeddings needed to reuse a stored
+# question set instead of calling the LLM.
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+# Looser match accepted when the LLM call has failed.
+SEMANTIC_CACHE_DEGRADED_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_DEGRADED_THRESHOLD", "0.75"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "5000"))
+# How often a worker picks up profiles indexed by other workers.
+SEMANTIC_CACHE_REFRESH_SECONDS = float(os.getenv("SEMANTIC_CACHE_REFRESH_SECONDS", "300"))
+# Each refresh re-reads profiles embedded this long before the newest one it
+# has seen, so a write that commits late or comes from a worker with a
+# slower clock is not skipped. Re-read profiles replace their own rows.
+SEMANTIC_CACHE_REFRESH_OVERLAP_SECONDS = float(os.getenv("SEMANTIC_CACHE_REFRESH_OVERLAP_SECONDS", "60"))
+
+SIMILARITY = registry.register(
+    Histogram(
+        "semantic_cache_similarity",
+        "Best profile similarity found per semantic cache lookup.",
+        buckets=(0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.92, 0.95, 0.98, 1.0),
+    )
+)
+
+
+def profile_text(extracted_info: Optional[dict]) -> str:
+    """The part of a resume that decides which questions fit it."""
+    if not extracted_info:
+        return ""
+    matcher = get_skill_matcher()
+    skills = set()
+    for skill in extracted_info.get("skills") or []:
+        skill = str(skill).strip()
+        # "ReactJS" and "React.js" should embed the same way.
+        skills.update(name.lower() for name in matcher.detect(skill) or [skill] if name)
+    skills = sorted(skills)
+    summary = " ".join(str(extracted_info.get("summary") or "").split())
+    parts = []
+    if skills:
+        parts.append("Skills: " + ", ".join(skills))
+    if summary:
+        parts.append("Summary: " + summary)
+    return "\n".join(parts)
+
+
+class QuestionIndex:
+    """In-memory nearest-neighbour index of resume profiles.
+
+    Rows are unit vectors, so a single matrix-vector product gives the
+    cosine similarity to every stored profile. Built from the
+    ``profile_embedding`` field of ``interviews`` and topped up
+    incrementally by ``profile_embedded_at``. Rows live in a preallocated
+    ring buffer of ``max_entries``, so the oldest profile is overwritten
+    once it is full; an interview added again replaces its own row.
+    """
+
+    def __init__(self, max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._ids: List[Optional[str]] = []
+        # interview id -> row, so a profile seen twice is stored once.
+        self._slots: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = asyncio.Lock()
+        self._loaded_until: Optional[datetime] = None
+        self._last_refresh = 0.0
+        self.lookups = 0
+        self.hits = 0
+        self.degraded_hits = 0
+        self.similarity_total = 0.0
+
+    def add(self, interview_id: str, vector: np.ndarray) -> None:
+        self.add_many([interview_id], [vector])
+
+    def add_many(self, interview_ids: List[str], vectors: List[np.ndarray]) -> None:
+        if self.max_entries <= 0 or not vectors:
+            return
+        rows = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(rows, axis=1)
+        # The last vector wins for an id given more than once.
+        latest = {interview_id: index for index, interview_id in enumerate(interview_ids) if norms[index] > 0}
+        if not latest:
+            return
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != rows.shape[1]:
+                self._matrix = np.zeros((self.max_entries, rows.shape[1]), dtype=np.float32)
+                self._ids = [None] * self.max_entries
+                self._slots = {}
+                self._size = self._next = 0
+            for index in sorted(latest.values())[-self.max_entries:]:
+                interview_id = interview_ids[index]
+                position = self._slots.get(interview_id)
+                if position is None:
+                    position = self._next
+                    evicted = self._ids[position]
+                    if evicted is not None:
+                        del self._slots[evicted]
+                    self._ids[position] = interview_id
+                    self._slots[interview_id] = position
+                    self._next = (position + 1) % self.max_entries
+                    self._size = min(self.max_entries, self._size + 1)
+                self._matrix[position] = rows[index] / norms[index]
+
+    def search(self, vector: np.ndarray):
+        """Returns (interview_id, similarity) of the closest profile, or None."""
+        norm = float(np.linalg.norm(vector))
+        with self._lock:
+            if not norm or self._matrix is None or not self._size or self._matrix.shape[1] != len(vector):
+                return None
+            # Unfilled rows sit after _size until the buffer wraps.
+            similarities = self._matrix[: self._size] @ (np.asarray(vector, dtype=np.float32) / norm)
+            best = int(np.argmax(similarities))
+            return self._ids[best], float(similarities[best])
+
+    async def refresh(self) -> None:
+        if time.monotonic() - self._last_refresh < SEMANTIC_CACHE_REFRESH_SECONDS:
+            return
+        async with self._refresh_lock:
+            if time.monotonic() - self._last_refresh < SEMANTIC_CACHE_REFRESH_SECONDS:
+                return
+            # Keyed on when the profile was embedded, not when the interview
+            # was created: the embedding is written after the insert.
+            query = {"profile_embedding.model": EMBEDDING_ID}
+            if self._loaded_until is not None:
+                since = self._loaded_until - timedelta(seconds=SEMANTIC_CACHE_REFRESH_OVERLAP_SECONDS)
+                query["profile_embedded_at"] = {"$gt": since}
+            cursor = (
+                get_async_interviews_collection()
+                .find(query, projection={"profile_embedding": 1, "profile_embedded_at": 1})
+                .sort("profile_embedded_at", -1)
+                .limit(self.max_entries)
+            )
+            documents = await cursor.to_list(length=self.max_entries)
+            ids, vectors = [], []
+            for document in reversed(documents):
+                for vector in unpack_embeddings(document["profile_embedding"]).values():
+                    ids.append(str(document["_id"]))
+                    vectors.append(vector)
+                embedded_at = document.get("profile_embedded_at")
+                if embedded_at is not None:
+                    self._loaded_until = max(self._loaded_until or embedded_at, embedded_at)
+            self.add_many(ids, vectors)
+            self._last_refresh = time.monotonic()
+
+    async def lookup(self, extracted_info: Optional[dict], degraded: bool = False) -> Optional[dict]:
+        """Find a stored question set for a resume with a similar profile.
+
+        Returns the stored ``interview_questions`` and ``group_discussion``
+        plus the source interview id and similarity, or None on a miss.
+        """
+        text = profile_text(extracted_info)
+        if not SEMANTIC_CACHE_ENABLED or not text:
+            return None
+        await self.refresh()
+
+        vector = (await run_in_threadpool(encode_texts, [text]))[0]
+        match = self.search(vector)
+        self.lookups += 1
+        if match is None:
+            return None
+        interview_id, similarity = match
+        SIMILARITY.observe(similarity)
+        threshold = SEMANTIC_CACHE_DEGRADED_THRESHOLD if degraded else SEMANTIC_CACHE_THRESHOLD
+        if similarity < threshold:
+            return None
+
+        document = await get_async_interviews_collection().find_one(
+            {"_id": ObjectId(interview_id)},
+            projection={"interview_questions": 1, "group_discussion": 1},
+        )
+        if not document or "group_discussion" not in document:
+            return None
+
+        if degraded:
+            self.degraded_hits += 1
+        else:
+            self.hits += 1
+        self.similarity_total += similarity
+        return {
+            "interview_id": interview_id,
+            "similarity": round(similarity, 4),
+            "degraded": degraded,
+            "interview_questions": document["interview_questions"],
+            "group_discussion": document["group_discussion"],
+        }
+
+    async def index_profile(self, interview_id: str, extracted_info: dict) -> None:
+        """Embed and store the profile of a freshly generated interview."""
+        text = profile_text(extracted_info)
+        if not SEMANTIC_CACHE_ENABLED or not text:
+            return
+        matrix = await run_in_threadpool(encode_texts, [text])
+        await get_async_interviews_collection().update_one(
+            {"_id": ObjectId(interview_id)},
+            {"$set": {"profile_embedding": pack_embeddings([text], matrix), "profile_embedded_at": datetime.utcnow()}},
+        )
+        self.add(interview_id, matrix[0])
+
+    def stats(self) -> dict:
+        served = self.hits + self.degraded_hits
+        return {
+            "enabled": SEMANTIC_CACHE_ENABLED,
+            "entries": self._size,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "degraded_hits": self.degraded_hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "avg_hit_similarity": round(self.similarity_total / served, 4) if served else 0.0,
+            "threshold": SEMANTIC_CACHE_THRESHOLD,
+            "degraded_threshold": SEMANTIC_CACHE_DEGRADED_THRESHOLD,
+        }
+
+
+question_index = QuestionIndex()
+
+
+def _index_metrics() -> list:
+    stats = question_index.stats()
+    return [
+        *counter_lines(
+            "semantic_cache_lookups_total",
+            "Semantic question cache lookups by outcome.",
+            {
+                '{result="hit"}': stats["hits"],
+                '{result="degraded_hit"}': stats["degraded_hits"],
+                '{result="miss"}': stats["lookups"] - stats["hits"] - stats["degraded_hits"],
+            },
+        ),
+        *counter_lines("semantic_cache_entries", "Profiles in the semantic question index.", {"": stats["entries"]}, "gauge"),
+    ]
+
+
+registry.add_collector(_index_metrics)
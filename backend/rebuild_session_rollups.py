@@ -0,0 +1,98 @@
+"""Recompute session rollups from the stored sessions.
+
+Rollups are kept up to date as sessions complete; run this once after
+deploying them (to cover older sessions) or to repair a missed update.
+The grouping runs inside MongoDB, so only one row per day, mode and
+result combination comes back. Sessions completing while a day is being
+rebuilt may be missed; rebuild that day again afterwards.
+
+    python rebuild_session_rollups.py --from 2026-01-01 --to 2026-01-31
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+except Exception:
+    pass
+
+if __package__:
+    from .db import close_client, ensure_indexes, get_interview_sessions_collection, get_session_rollups_collection
+    from .session_results import DISTRIBUTION_FIELDS, FINISHED
+else:
+    from db import close_client, ensure_indexes, get_interview_sessions_collection, get_session_rollups_collection
+    from session_results import DISTRIBUTION_FIELDS, FINISHED
+
+
+def _pipeline(date_from, date_to) -> list:
+    created_at = {}
+    if date_from:
+        created_at["$gte"] = datetime.combine(date_from, datetime.min.time())
+    if date_to:
+        created_at["$lt"] = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+    score = "$summary.average_answer_score"
+    return [
+        # Drafts are folded in when they complete, not before.
+        {"$match": {**FINISHED, "created_at": created_at} if created_at else FINISHED},
+        {
+            "$group": {
+                "_id": {
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "mode": {"$ifNull": ["$session_mode", "interview"]},
+                    **{field: f"$summary.{field}" for field in DISTRIBUTION_FIELDS},
+                },
+                "sessions": {"$sum": 1},
+                "scored_sessions": {"$sum": {"$cond": [{"$isNumber": score}, 1, 0]}},
+                "score_sum": {"$sum": score},
+                "completion_sum": {"$sum": "$summary.completion_rate"},
+            }
+        },
+    ]
+
+
+def rebuild(date_from=None, date_to=None) -> dict:
+    rollups = defaultdict(lambda: {"sessions": 0, "scored_sessions": 0, "score_sum": 0.0, "completion_sum": 0.0})
+    for group in get_interview_sessions_collection().aggregate(_pipeline(date_from, date_to), allowDiskUse=True):
+        key = group["_id"]
+        rollup = rollups[(key["day"], key["mode"])]
+        for total in ("sessions", "scored_sessions", "score_sum", "completion_sum"):
+            rollup[total] += group[total]
+        for field in DISTRIBUTION_FIELDS:
+            if key.get(field):
+                counts = rollup.setdefault(field, {})
+                counts[key[field]] = counts.get(key[field], 0) + group["sessions"]
+
+    day_range = {}
+    if date_from:
+        day_range["$gte"] = date_from.isoformat()
+    if date_to:
+        day_range["$lte"] = date_to.isoformat()
+    collection = get_session_rollups_collection()
+    collection.delete_many({"day": day_range} if day_range else {})
+    now = datetime.utcnow()
+    documents = [{"day": day, "mode": mode, **rollup, "updated_at": now} for (day, mode), rollup in rollups.items()]
+    if documents:
+        collection.insert_many(documents, ordered=False)
+    return {"event": "summary", "rollups": len(documents), "sessions": sum(d["sessions"] for d in documents)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First UTC day (inclusive)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last UTC day (inclusive)")
+    args = parser.parse_args()
+
+    try:
+        ensure_indexes()
+        print(json.dumps(rebuild(args.date_from, args.date_to)), flush=True)
+    finally:
+        close_client()
+
+
+if __name__ == "__main__":
+    main()
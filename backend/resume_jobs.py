@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from bson import Binary, ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+
+if __package__:
+    from .db import get_async_resume_jobs_collection
+else:
+    from db import get_async_resume_jobs_collection
+
+RESUME_JOB_WORKERS = int(os.getenv("RESUME_JOB_WORKERS", "4"))
+RESUME_JOB_MAX_PENDING = int(os.getenv("RESUME_JOB_MAX_PENDING", "500"))
+RESUME_JOB_MAX_ATTEMPTS = int(os.getenv("RESUME_JOB_MAX_ATTEMPTS", "4"))
+RESUME_JOB_RETRY_BASE_SECONDS = float(os.getenv("RESUME_JOB_RETRY_BASE_SECONDS", "2"))
+RESUME_JOB_LEASE_SECONDS = float(os.getenv("RESUME_JOB_LEASE_SECONDS", "300"))
+RESUME_JOB_POLL_SECONDS = float(os.getenv("RESUME_JOB_POLL_SECONDS", "2"))
+RESUME_JOB_RETENTION_HOURS = float(os.getenv("RESUME_JOB_RETENTION_HOURS", "24"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """Raised by a processor for failures that retrying cannot fix."""
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class ResumeJobQueue:
+    """Mongo-backed queue of resume analyses drained by a fixed worker pool.
+
+    Jobs survive restarts: a job left ``running`` by a dead worker is
+    picked up again once its lease expires. Failed attempts are retried
+    with exponential backoff up to ``RESUME_JOB_MAX_ATTEMPTS``; that cap
+    also covers attempts lost to expired leases.
+
+    ``processor(file_bytes, use_cache, final_attempt)`` gets
+    ``final_attempt=True`` on a job's last attempt. Earlier attempts should
+    raise rather than settle for a degraded result, so the queue retries
+    them.
+    """
+
+    def __init__(self, processor: Callable[[bytes, bool, bool], Awaitable[dict]], workers: int = RESUME_JOB_WORKERS):
+        self._processor = processor
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def enqueue(self, file_bytes: bytes, filename: Optional[str], use_cache: bool) -> str:
+        jobs = get_async_resume_jobs_collection()
+        pending = await jobs.count_documents({"status": {"$in": [QUEUED, RUNNING]}})
+        if pending >= RESUME_JOB_MAX_PENDING:
+            raise JobQueueFull()
+
+        now = datetime.utcnow()
+        insert_result = await jobs.insert_one(
+            {
+                "status": QUEUED,
+                "filename": filename,
+                "file": Binary(file_bytes),
+                "use_cache": use_cache,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        self._wakeup.set()
+        return str(insert_result.inserted_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        try:
+            object_id = ObjectId(job_id)
+        except InvalidId:
+            return None
+        return await get_async_resume_jobs_collection().find_one({"_id": object_id}, projection={"file": 0})
+
+    async def start(self) -> None:
+        for index in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work(), name=f"resume-job-worker-{index}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        # Interrupted jobs are retried after their lease expires.
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await get_async_resume_jobs_collection().find_one_and_update(
+            {
+                "$or": [
+                    {"status": QUEUED, "next_attempt_at": {"$lte": now}},
+                    {"status": RUNNING, "lease_expires_at": {"$lte": now}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "lease_expires_at": now + timedelta(seconds=RESUME_JOB_LEASE_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("next_attempt_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                # Mongo unavailable; try again after the poll interval.
+                job = None
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=RESUME_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except Exception:
+                # Usually a failed status write; the lease expiring hands
+                # the job to a worker again.
+                logger.exception("Resume job %s could not be processed", job["_id"])
+
+    async def _fail(self, job: dict, error: str) -> None:
+        now = datetime.utcnow()
+        await get_async_resume_jobs_collection().update_one(
+            {"_id": job["_id"]},
+            {
+                "$set": {
+                    "status": FAILED,
+                    "error": error,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(hours=RESUME_JOB_RETENTION_HOURS),
+                },
+                "$unset": {"file": "", "lease_expires_at": ""},
+            },
+        )
+
+    async def _run(self, job: dict) -> None:
+        jobs = get_async_resume_jobs_collection()
+        if job["attempts"] > RESUME_JOB_MAX_ATTEMPTS:
+            # Reclaimed after its last attempt's lease expired (the worker
+            # died or hung mid-job): don't run it again.
+            await self._fail(job, job.get("error") or "Job lease expired")
+            return
+        try:
+            result = await self._processor(
+                bytes(job["file"]), job.get("use_cache", True), job["attempts"] >= RESUME_JOB_MAX_ATTEMPTS
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            if isinstance(exc, PermanentJobError) or job["attempts"] >= RESUME_JOB_MAX_ATTEMPTS:
+                await self._fail(job, str(exc) or type(exc).__name__)
+                return
+
+            now = datetime.utcnow()
+            delay = RESUME_JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+            delay *= random.uniform(0.8, 1.2)
+            await jobs.update_one(
+                {"_id": job["_id"]},
+                {
+                    "$set": {
+                        "status": QUEUED,
+                        "error": str(exc) or type(exc).__name__,
+                        "next_attempt_at": now + timedelta(seconds=delay),
+                        "updated_at": now,
+                    },
+                    "$unset": {"lease_expires_at": ""},
+                },
+            )
+            return
+
+        now = datetime.utcnow()
+        await jobs.update_one(
+            {"_id": job["_id"]},
+            {
+                "$set": {
+                    "status": DONE,
+                    "result": result,
+                    "error": None,
+                    "updated_at": now,
+                    "expires_at": now + timedelta(hours=RESUME_JOB_RETENTION_HOURS),
+                },
+                "$unset": {"file": "", "lease_expires_at": ""},
+            },
+        )
+
+
+def job_to_out(job: dict) -> dict:
+    return {
+        "job_id": str(job["_id"]),
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "error": job.get("error"),
+        "result": job.get("result"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
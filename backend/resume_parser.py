@@ -0,0 +1,183 @@
+import re
+from typing import Dict, List, Optional
+
+# Header keyword -> extracted_information field. None marks sections we
+# recognise only so their lines don't run into the previous section.
+SECTION_KEYWORDS = {
+    "summary": "summary",
+    "professional summary": "summary",
+    "career objective": "summary",
+    "objective": "summary",
+    "profile": "summary",
+    "about me": "summary",
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core competencies": "skills",
+    "education": "education",
+    "academic background": "education",
+    "academic details": "education",
+    "qualifications": "education",
+    "projects": "projects",
+    "academic projects": "projects",
+    "personal projects": "projects",
+    "internship": "internships",
+    "internships": "internships",
+    "work experience": "work_experience",
+    "professional experience": "work_experience",
+    "employment history": "work_experience",
+    "experience": "work_experience",
+    "strengths": "strengths",
+    "advantages": "strengths",
+    "hobbies": "hobbies",
+    "interests": "hobbies",
+    "personal details": None,
+    "contact": None,
+    "certifications": None,
+    "achievements": None,
+    "awards": None,
+    "languages": None,
+    "declaration": None,
+    "references": None,
+}
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+URL_RE = re.compile(r"(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com/\S*", re.IGNORECASE)
+# One alternation for every header keyword, longest first so "work
+# experience" wins over "experience". A header is the keyword alone on its
+# line, optionally followed by a colon and inline content.
+HEADER_RE = re.compile(
+    r"^[\W_]*(?P<keyword>"
+    + "|".join(re.escape(k) for k in sorted(SECTION_KEYWORDS, key=len, reverse=True))
+    + r")\b[^\w:]*(?::\s*(?P<rest>.*))?$",
+    re.IGNORECASE,
+)
+SKILL_SPLIT_RE = re.compile(r"[,;|•·●▪\n\t]|\s{2,}|\s+-\s+")
+BULLET_RE = re.compile(r"^[\s•·●▪*\-–—>]+")
+NAME_RE = re.compile(r"^[A-Za-z][A-Za-z .'-]{1,60}$")
+
+MAX_SKILLS = 40
+MAX_SKILL_LENGTH = 40
+MAX_SKILL_WORDS = 4
+# parse_resume() output is trusted only with skills plus this many of the
+# narrative sections; multi-column PDFs interleave text and usually fail.
+MIN_RELIABLE_SECTIONS = 2
+
+
+def _clean(line: str) -> str:
+    return BULLET_RE.sub("", line).strip()
+
+
+def extract_sections(text: str) -> Dict[str, str]:
+    sections: Dict[str, List[str]] = {field: [] for field in set(SECTION_KEYWORDS.values()) if field}
+    current: Optional[str] = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        match = HEADER_RE.match(line) if len(line) <= 60 else None
+        if match:
+            field = SECTION_KEYWORDS[match.group("keyword").lower()]
+            rest = (match.group("rest") or "").strip()
+            if field is None and rest and current:
+                # A label inside a section, e.g. "Languages: Python, Go" under Skills.
+                sections[current].append(line)
+                continue
+            current = field
+            if current and rest:
+                sections[current].append(rest)
+            continue
+        if current:
+            sections[current].append(line)
+
+    return {field: "\n".join(lines).strip() for field, lines in sections.items()}
+
+
+def split_skills(skills_text: str) -> List[str]:
+    skills: List[str] = []
+    seen = set()
+    for line in skills_text.splitlines():
+        # "Languages: Python, Java" -> keep what follows the label.
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in SKILL_SPLIT_RE.split(line):
+            item = _clean(item).strip(" .")
+            if (
+                not item
+                or len(item) > MAX_SKILL_LENGTH
+                or len(item.split()) > MAX_SKILL_WORDS
+                or item.lower() in seen
+            ):
+                continue
+            seen.add(item.lower())
+            skills.append(item)
+            if len(skills) >= MAX_SKILLS:
+                return skills
+    return skills
+
+
+def extract_basic_details(text: str) -> Dict[str, str]:
+    email = EMAIL_RE.search(text)
+    phone = ""
+    for candidate in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", candidate.group())
+        if 10 <= len(digits) <= 15:
+            phone = candidate.group().strip()
+            break
+
+    name = ""
+    for raw_line in text.splitlines()[:10]:
+        line = URL_RE.sub("", EMAIL_RE.sub("", raw_line)).strip(" |,-")
+        if not line or HEADER_RE.match(line) or PHONE_RE.search(line):
+            continue
+        if NAME_RE.match(line) and len(line.split()) <= 5:
+            name = line
+            break
+
+    return {"name": name, "email": email.group() if email else "", "phone": phone}
+
+
+def parse_resume(text: str) -> dict:
+    """Rule-based extraction into the ``extracted_information`` shape."""
+    sections = extract_sections(text)
+    return {
+        **extract_basic_details(text),
+        "summary": sections["summary"],
+        "skills": split_skills(sections["skills"]),
+        "education": sections["education"],
+        "projects": sections["projects"],
+        "internships": sections["internships"],
+        "work_experience": sections["work_experience"],
+        "strengths": sections["strengths"],
+        "hobbies": sections["hobbies"],
+    }
+
+
+def is_reliable(info: dict) -> bool:
+    narrative = ("summary", "education", "projects", "internships", "work_experience")
+    return bool(info.get("skills")) and sum(1 for field in narrative if info.get(field)) >= MIN_RELIABLE_SECTIONS
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + " ..."
+
+
+def section_summary(info: dict, max_chars: int = 600) -> str:
+    """Compact, labelled digest of the parsed resume for the LLM prompt."""
+    parts = []
+    if info.get("skills"):
+        parts.append("Skills: " + ", ".join(info["skills"]))
+    for field, label in (
+        ("summary", "Summary"),
+        ("work_experience", "Work Experience"),
+        ("internships", "Internships"),
+        ("projects", "Projects"),
+        ("education", "Education"),
+        ("strengths", "Strengths"),
+    ):
+        if info.get(field):
+            parts.append(f"{label}: {_shorten(info[field], max_chars)}")
+    return "\n".join(parts)
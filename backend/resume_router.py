@@ -1,23 +1,53 @@
 import os
 import json
 import re
-import requests
-import pdfplumber
-import docx
-from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from datetime import datetime
+import hashlib
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from datetime import datetime, timedelta
+from typing import Optional
 
 if __package__:
-    from .db import get_interviews_collection
+    from .artifacts import INTERVIEW_RAW_FIELDS, load_raw_fields, prepare_offload, save_artifacts
+    from .auth import get_optional_admin
+    from .cache import TTLCache
+    from .db import INTERVIEWS, get_async_interviews_collection
+    from .embeddings import encode_texts, normalize_text, pack_embeddings
+    from .extraction import RESUME_MAX_BYTES, ExtractionError, check_upload_size, extract_resume_text
+    from .json_stream import IncrementalJSONParser
+    from .resume_jobs import JobQueueFull, PermanentJobError, ResumeJobQueue, job_to_out
+    from .resume_parser import is_reliable, parse_resume, section_summary
+    from .llm_client import LLMError
+    from .llm_router import LLMRejected, get_llm_router
+    from .metrics import FALLBACK_QUESTIONS, LLM_FAILURES, LLM_PARSE_ERRORS, PROMPT_TOKENS, PROMPT_TRIMMED, stage
+    from .prompt_budget import PROMPT_TOKEN_BUDGET, count_tokens, fit_resume_text
+    from .question_cache import question_index
+    from .skill_taxonomy import get_skill_matcher
 else:
-    from db import get_interviews_collection
+    from artifacts import INTERVIEW_RAW_FIELDS, load_raw_fields, prepare_offload, save_artifacts
+    from auth import get_optional_admin
+    from cache import TTLCache
+    from db import INTERVIEWS, get_async_interviews_collection
+    from embeddings import encode_texts, normalize_text, pack_embeddings
+    from extraction import RESUME_MAX_BYTES, ExtractionError, check_upload_size, extract_resume_text
+    from json_stream import IncrementalJSONParser
+    from resume_jobs import JobQueueFull, PermanentJobError, ResumeJobQueue, job_to_out
+    from resume_parser import is_reliable, parse_resume, section_summary
+    from llm_client import LLMError
+    from llm_router import LLMRejected, get_llm_router
+    from metrics import FALLBACK_QUESTIONS, LLM_FAILURES, LLM_PARSE_ERRORS, PROMPT_TOKENS, PROMPT_TRIMMED, stage
+    from prompt_budget import PROMPT_TOKEN_BUDGET, count_tokens, fit_resume_text
+    from question_cache import question_index
+    from skill_taxonomy import get_skill_matcher
 
 router = APIRouter()
 
 HF_API_KEY = os.getenv("HF_API_KEY", "")
 HF_MODEL = "meta-llama/Meta-Llama-3-8B-Instruct"
-HF_API_URL = "https://router.huggingface.co/v1/chat/completions"
+HF_API_URL = os.getenv("HF_API_URL", "https://router.huggingface.co/v1/chat/completions")
 
 HEADERS = {
     "Authorization": f"Bearer {HF_API_KEY}",
@@ -38,6 +68,34 @@ DEFAULT_EXTRACTED_INFO = {
     "hobbies": "",
 }
 
+# Fields returned when reading an interview back; embeddings and raw
+# artifacts are left out unless asked for.
+INTERVIEW_PROJECTION = {
+    "extracted_information": 1,
+    "interview_questions": 1,
+    "group_discussion": 1,
+    "skill_tags": 1,
+    "llm_parse_error": 1,
+    "extraction_source": 1,
+    "semantic_match": 1,
+    "created_at": 1,
+}
+
+RESUME_CACHE_ENABLED = os.getenv("RESUME_CACHE_ENABLED", "1").lower() not in {"0", "false", "no"}
+RESUME_CACHE_TTL_SECONDS = float(os.getenv("RESUME_CACHE_TTL_SECONDS", "86400"))
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "512"))
+
+_result_cache = TTLCache(RESUME_CACHE_MAX_ENTRIES, RESUME_CACHE_TTL_SECONDS)
+
+# Fill extracted_information with the rule-based parser and ask the LLM for
+# questions only. Resumes the parser can't read reliably use the full prompt.
+RESUME_LOCAL_EXTRACTION = os.getenv("RESUME_LOCAL_EXTRACTION", "1").lower() not in {"0", "false", "no"}
+
+# When every LLM backend fails and no similar resume is stored, build the
+# interview from _fallback_questions instead of returning an error.
+LLM_FALLBACK_QUESTIONS = os.getenv("LLM_FALLBACK_QUESTIONS", "1").lower() not in {"0", "false", "no"}
+LLM_UNAVAILABLE_ERROR = "LLM unavailable; fallback questions used"
+
 
 def _extract_json_object(text: str):
     cleaned = text.strip()
@@ -66,24 +124,38 @@ def _to_string_list(value):
     return []
 
 
-def _fallback_questions(resume_text: str, extracted_info: dict):
-    known_skills = [
-        "Python",
-        "FastAPI",
-        "Django",
-        "Spring Boot",
-        "MongoDB",
-        "SQL",
-        "React",
-        "Java",
-        "Kafka",
-    ]
+# Technical fallback question per skill category; others use the default.
+FALLBACK_TEMPLATES = {
+    "database": "How did you design the data model and queries for a project that used {skill}?",
+    "cloud": "How have you used {skill} to deploy or run a service?",
+    "devops": "How have you used {skill} to build, ship or monitor an application?",
+    "frontend": "Walk me through a user-facing feature you built with {skill}.",
+    "mobile": "Walk me through an app screen or feature you built with {skill}.",
+    "data": "Describe a piece of work where you used {skill} and how you checked your results.",
+    "ml": "Describe a model or experiment where you used {skill} and how you measured it.",
+    "testing": "How did you use {skill} to catch bugs before they reached users?",
+    "security": "How did you apply {skill} to protect a system you worked on?",
+    "cs": "Where have you applied {skill} in a project, and what did you learn from it?",
+    "methodology": "How has your team used {skill}, and what would you change about it?",
+    "design": "Walk me through a project where you used {skill}.",
+}
+DEFAULT_FALLBACK_TEMPLATE = "Explain one production issue you solved using {skill}."
+# Not a basis for technical questions; used for the behavioral set instead.
+SOFT_SKILL_CATEGORIES = {"soft"}
 
-    skills = _to_string_list(extracted_info.get("skills"))
-    skill_text = " ".join(skills) + " " + resume_text
-    detected = [skill for skill in known_skills if re.search(rf"\b{re.escape(skill)}\b", skill_text, re.IGNORECASE)]
 
-    technical = [f"Explain one production issue you solved using {skill}." for skill in detected[:5]]
+def _fallback_questions(resume_text: str, extracted_info: dict):
+    matcher = get_skill_matcher()
+    skills = _to_string_list(extracted_info.get("skills"))
+    # Listed skills first, then whatever the resume mentions most.
+    detected = list(dict.fromkeys(matcher.detect(", ".join(skills)) + matcher.detect(resume_text)))
+    technical_skills = [skill for skill in detected if matcher.category(skill) not in SOFT_SKILL_CATEGORIES]
+    soft_skills = [skill for skill in detected if matcher.category(skill) in SOFT_SKILL_CATEGORIES]
+
+    technical = [
+        FALLBACK_TEMPLATES.get(matcher.category(skill), DEFAULT_FALLBACK_TEMPLATE).format(skill=skill)
+        for skill in technical_skills[:5]
+    ]
     while len(technical) < 5:
         technical.append(
             [
@@ -105,6 +177,8 @@ def _fallback_questions(resume_text: str, extracted_info: dict):
         "Describe a situation where you had conflicting priorities and how you handled it.",
         "Tell me about a time you found a critical bug and how you managed the fix.",
     ]
+    if soft_skills:
+        behavioral[0] = f"Your resume mentions {soft_skills[0].lower()}. Tell me about a time it made a difference to your team."
 
     gd_topic = (
         "Discuss how you would design and deliver a production-ready backend feature "
@@ -123,14 +197,19 @@ def _fallback_questions(resume_text: str, extracted_info: dict):
     }
 
 
-def _normalize_result(parsed: dict, resume_text: str):
-    extracted = parsed.get("extracted_information")
+def _normalize_extracted_info(extracted) -> dict:
     if not isinstance(extracted, dict):
         extracted = {}
 
     normalized_extracted = DEFAULT_EXTRACTED_INFO.copy()
     normalized_extracted.update(extracted)
     normalized_extracted["skills"] = _to_string_list(normalized_extracted.get("skills"))
+    return normalized_extracted
+
+
+def _normalize_result(parsed: dict, resume_text: str):
+    """Returns (normalized result, sections filled with fallback questions)."""
+    normalized_extracted = _normalize_extracted_info(parsed.get("extracted_information"))
 
     questions = parsed.get("interview_questions")
     if not isinstance(questions, dict):
@@ -151,18 +230,24 @@ def _normalize_result(parsed: dict, resume_text: str):
     elif isinstance(gd, str):
         gd_topic = gd.strip()
 
-    if not normalized_questions["technical"] or not normalized_questions["hr"] or not normalized_questions["behavioral"]:
+    fallback = None
+    fallback_sections = [section for section in ("technical", "hr", "behavioral") if not normalized_questions[section]]
+    if fallback_sections:
         fallback = _fallback_questions(resume_text, normalized_extracted)
+        for section in fallback_sections:
+            FALLBACK_QUESTIONS.inc(section=section)
         normalized_questions["technical"] = normalized_questions["technical"] or fallback["technical"]
         normalized_questions["hr"] = normalized_questions["hr"] or fallback["hr"]
         normalized_questions["behavioral"] = normalized_questions["behavioral"] or fallback["behavioral"]
 
     if not gd_topic:
-        fallback = _fallback_questions(resume_text, normalized_extracted)
+        fallback_sections.append("group_discussion")
+        FALLBACK_QUESTIONS.inc(section="group_discussion")
+        fallback = fallback or _fallback_questions(resume_text, normalized_extracted)
         gd_topic = fallback["group_discussion"]["topic"]
         gd_expected = gd_expected or fallback["group_discussion"]["expected_answer"]
 
-    return {
+    normalized = {
         "extracted_information": normalized_extracted,
         "interview_questions": normalized_questions,
         "group_discussion": {
@@ -170,27 +255,7 @@ def _normalize_result(parsed: dict, resume_text: str):
             "expected_answer": gd_expected,
         },
     }
-
-
-# -----------------------------------
-# Extract Text from PDF
-# -----------------------------------
-def extract_text_from_pdf(file_path):
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text
-
-
-# -----------------------------------
-# Extract Text from DOCX
-# -----------------------------------
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return "\n".join([para.text for para in doc.paragraphs])
+    return normalized, fallback_sections
 
 
 # -----------------------------------
@@ -264,12 +329,131 @@ Resume:
     return prompt
 
 
+def build_questions_prompt(profile_summary):
+
+    prompt = f"""
+You are an AI Interview Assistant.
+
+Based on the candidate profile below, generate:
+- 5 Technical Interview Questions
+- 3 HR Questions
+- 2 Behavioral Questions
+- 1 Random Group Discussion (GD) topic that is NOT related to technical skills, programming, software, or the candidate's resume domain
+
+Difficulty and style requirements:
+- Keep all interview questions easy and beginner-friendly.
+- Use simple, clear language.
+- Avoid advanced or tricky wording.
+
+Important output rules:
+- Return JSON only. Do not include markdown, code fences, explanations, or extra keys.
+- Follow the schema exactly.
+- `technical`, `hr`, and `behavioral` must be arrays of strings.
+- `group_discussion.topic` and `group_discussion.expected_answer` must be non-empty strings.
+
+Return ONLY valid JSON in this format:
+
+{{
+  "interview_questions": {{
+      "technical": [],
+      "hr": [],
+      "behavioral": []
+  }},
+  "group_discussion": {{
+      "topic": "",
+      "expected_answer": ""
+  }}
+}}
+
+Candidate profile:
+{profile_summary}
+"""
+    return prompt
+
+
+def _prepare_prompt(resume_text: str):
+    """Returns (prompt, locally extracted info or None)."""
+    if RESUME_LOCAL_EXTRACTION:
+        with stage("resume.local_parse"):
+            extracted_info = parse_resume(resume_text)
+        if is_reliable(extracted_info):
+            summary = section_summary(extracted_info)
+            PROMPT_TOKENS.observe(count_tokens(resume_text), kind="original")
+            PROMPT_TOKENS.observe(count_tokens(summary), kind="prompt")
+            return build_questions_prompt(summary), extracted_info
+
+    with stage("resume.prompt_budget"):
+        fitted_text, prompt_stats = fit_resume_text(resume_text)
+    PROMPT_TOKENS.observe(prompt_stats["original_tokens"], kind="original")
+    PROMPT_TOKENS.observe(prompt_stats["prompt_tokens"], kind="prompt")
+    if prompt_stats["truncated"]:
+        PROMPT_TRIMMED.inc()
+    return build_prompt(fitted_text), None
+
+
+# Changes to the prompt templates, budget or model invalidate every cached analysis.
+PROMPT_VERSION = hashlib.sha256(
+    (
+        f"{HF_MODEL}\n{PROMPT_TOKEN_BUDGET}\n{build_prompt('')}\n"
+        f"{build_questions_prompt('') if RESUME_LOCAL_EXTRACTION else ''}"
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+
 # -----------------------------------
-# Call HuggingFace API
+# Cached Analysis Lookup
 # -----------------------------------
-def call_llm(prompt):
+def _cache_key(file_bytes: bytes) -> str:
+    return f"{hashlib.sha256(file_bytes).hexdigest()}:{PROMPT_VERSION}"
+
+
+async def _get_cached_analysis(cache_key: str):
+    """Earlier analysis of the same file bytes, or None.
+
+    A hit reuses that interview rather than storing a new one: identical
+    uploads share one ``interview_id``, so sessions and scores of every
+    such upload refer to the same interview document.
+    """
+    cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Fall back to the interviews collection so the cache survives restarts
+    # and is shared between workers.
+    with stage("resume.cache_lookup"):
+        document = await get_async_interviews_collection().find_one(
+            {
+                "cache_key": cache_key,
+                "degraded": {"$ne": True},
+                # Documents stored before the degraded flag.
+                "llm_parse_error": None,
+                "group_discussion": {"$exists": True},
+                "semantic_match.degraded": {"$ne": True},
+                "created_at": {"$gte": datetime.utcnow() - timedelta(seconds=RESUME_CACHE_TTL_SECONDS)},
+            },
+            projection={"extracted_information": 1, "interview_questions": 1, "group_discussion": 1},
+            sort=[("created_at", -1)],
+        )
+    if not document:
+        return None
+
+    cached = {
+        "interview_id": str(document["_id"]),
+        "data": {
+            "extracted_information": document["extracted_information"],
+            "interview_questions": document["interview_questions"],
+            "group_discussion": document["group_discussion"],
+        },
+    }
+    _result_cache.put(cache_key, cached)
+    return cached
 
-    payload = {
+
+# -----------------------------------
+# Call HuggingFace API
+# -----------------------------------
+def _llm_payload(prompt):
+    return {
         "model": HF_MODEL,
         "messages": [
             {"role": "user", "content": prompt}
@@ -278,72 +462,476 @@ def call_llm(prompt):
         "temperature": 0.3,
     }
 
-    response = requests.post(HF_API_URL, headers=HEADERS, json=payload, timeout=120)
 
-    if response.status_code != 200:
-        raise HTTPException(status_code=500, detail=response.text)
+def _completion_text(result: dict) -> str:
+    return result.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-    result = response.json()
-    output_text = result.get("choices", [{}])[0].get("message", {}).get("content", "")
 
-    return output_text
+def _llm_router():
+    return get_llm_router(HF_API_URL, HEADERS, HF_MODEL)
 
 
-@router.post("/analyze-resume/")
-async def analyze_resume(file: UploadFile = File(...)):
+async def call_llm_async(prompt):
+    # Non-blocking variant used by the request handlers; retries, hedging
+    # and failover between backends happen in the router.
+    try:
+        with stage("resume.llm"):
+            result = await _llm_router().complete(_llm_payload(prompt))
+    except LLMError as exc:
+        LLM_FAILURES.inc(reason=f"http_{exc.status_code}")
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
 
+    return _completion_text(result)
+
+
+# -----------------------------------
+# Semantic Question Cache
+# -----------------------------------
+async def _semantic_lookup(extracted_info: Optional[dict], degraded: bool = False) -> Optional[dict]:
+    try:
+        with stage("resume.semantic_lookup"):
+            return await question_index.lookup(extracted_info, degraded=degraded)
+    except Exception:
+        # The index is an optimisation; a broken lookup means a cache miss.
+        return None
+
+
+def _semantic_output(match: dict) -> str:
+    # Same shape as a questions-only completion, so it is parsed and stored
+    # like one.
+    return json.dumps(
+        {"interview_questions": match["interview_questions"], "group_discussion": match["group_discussion"]}
+    )
+
+
+def _match_summary(match: Optional[dict]) -> Optional[dict]:
+    if match is None:
+        return None
+    return {"interview_id": match["interview_id"], "similarity": match["similarity"], "degraded": match["degraded"]}
+
+
+async def _generate_questions(resume_text: str, allow_degraded: bool = True):
+    """Reuse the question set of a similar stored resume, or call the LLM.
+
+    If the LLM fails, a looser match is accepted, then fallback questions;
+    with ``allow_degraded`` off the error is raised instead. Returns (llm_output, extracted_info, semantic_match); llm_output is
+    None when the LLM was unavailable.
+    """
+    prompt, extracted_info = _prepare_prompt(resume_text)
+    match = await _semantic_lookup(extracted_info)
+    if match is not None:
+        return _semantic_output(match), extracted_info, _match_summary(match)
+
+    try:
+        llm_output = await call_llm_async(prompt)
+    except HTTPException as exc:
+        # A rejected LLM request is a configuration problem; stored or
+        # fallback questions would only hide it.
+        if exc.status_code < 500 or isinstance(exc.__cause__, LLMRejected) or not allow_degraded:
+            raise
+        extracted_info = extracted_info or parse_resume(resume_text)
+        match = await _semantic_lookup(extracted_info, degraded=True)
+        if match is not None:
+            return _semantic_output(match), extracted_info, _match_summary(match)
+        if not LLM_FALLBACK_QUESTIONS:
+            raise
+        return None, extracted_info, None
+    return llm_output, extracted_info, None
+
+
+async def _read_upload(file: UploadFile) -> bytes:
     if not HF_API_KEY:
         raise HTTPException(status_code=500, detail="HF_API_KEY not set")
 
-    file_path = Path(f"temp_{file.filename}")
+    if file.size is not None and file.size > RESUME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds {RESUME_MAX_BYTES} bytes")
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    file_bytes = await file.read(RESUME_MAX_BYTES + 1)
+    try:
+        check_upload_size(file_bytes)
+    except ExtractionError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+    return file_bytes
 
-    # Extract text
-    if file_path.suffix.lower() == ".pdf":
-        resume_text = extract_text_from_pdf(file_path)
-    elif file_path.suffix.lower() == ".docx":
-        resume_text = extract_text_from_docx(file_path)
-    else:
-        raise HTTPException(status_code=400, detail="Only PDF and DOCX supported")
 
-    if not resume_text.strip():
-        raise HTTPException(status_code=400, detail="Could not extract text")
+def _cached_response(cached: dict) -> dict:
+    return {
+        "message": "Resume analyzed and saved successfully",
+        "interview_id": cached["interview_id"],
+        "data": cached["data"],
+        "parse_error": None,
+        "cached": True,
+    }
 
-    prompt = build_prompt(resume_text)
-    llm_output = call_llm(prompt)
 
-    parse_error = None
+async def _extract_text(file_bytes: bytes) -> str:
     try:
-        parsed_json = _extract_json_object(llm_output)
-    except Exception as exc:
-        parsed_json = {}
-        parse_error = str(exc)
-
-    normalized_result = _normalize_result(parsed_json, resume_text)
+        with stage("resume.extract"):
+            resume_text = await extract_resume_text(file_bytes)
+    except ExtractionError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
 
-    # -------------------------
-    # Save to MongoDB
-    # -------------------------
-    interviews_collection = get_interviews_collection()
+    if not resume_text.strip():
+        raise HTTPException(status_code=400, detail="Could not extract text")
+    return resume_text
+
+
+def _build_interview_document(
+    resume_text: str,
+    llm_output: Optional[str],
+    cache_key: str,
+    extracted_info: Optional[dict] = None,
+    semantic_match: Optional[dict] = None,
+):
+    """Parse the LLM output into the stored interview document.
+
+    ``extracted_info`` (from the local parser) takes the place of the
+    LLM's extracted_information. ``semantic_match`` marks questions reused
+    from a similar resume rather than generated; a None ``llm_output``
+    means the LLM was unavailable and fallback questions are used.
+    Returns (document, normalized_result, parse_error).
+    """
+    parse_error = None
+    with stage("resume.parse"):
+        if llm_output is None:
+            parsed_json = {}
+            parse_error = LLM_UNAVAILABLE_ERROR
+        else:
+            try:
+                parsed_json = _extract_json_object(llm_output)
+            except Exception as exc:
+                parsed_json = {}
+                parse_error = str(exc)
+                LLM_PARSE_ERRORS.inc()
+
+        if extracted_info is not None:
+            parsed_json["extracted_information"] = extracted_info
+        normalized_result, fallback_sections = _normalize_result(parsed_json, resume_text)
+        # Canonical skill names, for grouping interviews in analytics.
+        skill_tags = get_skill_matcher().detect(
+            ", ".join(normalized_result["extracted_information"]["skills"]) + "\n" + resume_text
+        )
 
     document = {
         "extracted_information": normalized_result["extracted_information"],
         "interview_questions": normalized_result["interview_questions"],
+        "group_discussion": normalized_result["group_discussion"],
+        "skill_tags": skill_tags,
         "resume_text": resume_text,
-        "llm_raw_output": llm_output,
+        "llm_raw_output": None if semantic_match else llm_output,
         "llm_parse_error": parse_error,
+        "extraction_source": "local" if extracted_info is not None else "llm",
+        "semantic_match": semantic_match,
+        "fallback_sections": fallback_sections,
+        # Fallback questions or a loose match served while the LLM was down:
+        # kept for the candidate, but never replayed from the result cache.
+        "degraded": bool(parse_error or fallback_sections or (semantic_match and semantic_match["degraded"])),
+        "cache_key": cache_key,
         "created_at": datetime.utcnow()
     }
+    return document, normalized_result, parse_error
 
-    insert_result = interviews_collection.insert_one(document)
 
-    file_path.unlink(missing_ok=True)
+def _analysis_response(
+    interview_id: str,
+    normalized_result: dict,
+    parse_error,
+    cache_key: str,
+    semantic_match: Optional[dict] = None,
+    degraded: bool = False,
+) -> dict:
+    # Degraded results (see _build_interview_document) are not worth replaying.
+    if not degraded:
+        _result_cache.put(cache_key, {"interview_id": interview_id, "data": normalized_result})
 
     return {
         "message": "Resume analyzed and saved successfully",
-        "interview_id": str(insert_result.inserted_id),
+        "interview_id": interview_id,
         "data": normalized_result,
         "parse_error": parse_error,
+        "cached": False,
+        "semantic_match": semantic_match,
     }
+
+
+async def _save_analysis(
+    resume_text: str,
+    llm_output: Optional[str],
+    cache_key: str,
+    extracted_info: Optional[dict] = None,
+    semantic_match: Optional[dict] = None,
+) -> dict:
+    document, normalized_result, parse_error = _build_interview_document(
+        resume_text, llm_output, cache_key, extracted_info, semantic_match
+    )
+
+    # -------------------------
+    # Save to MongoDB
+    # -------------------------
+    document, artifact = prepare_offload(document, INTERVIEWS, INTERVIEW_RAW_FIELDS)
+    with stage("resume.db_insert"):
+        # The artifact goes first so an interview never points at raw
+        # text that was not stored.
+        await save_artifacts([artifact])
+        insert_result = await get_async_interviews_collection().insert_one(document)
+
+    return _analysis_response(
+        str(insert_result.inserted_id), normalized_result, parse_error, cache_key, semantic_match, document["degraded"]
+    )
+
+
+def _question_texts(normalized_result: dict) -> list:
+    """Normalized, deduplicated expected side of every question."""
+    questions = normalized_result["interview_questions"]
+    gd = normalized_result["group_discussion"]
+    texts = [
+        *questions["technical"],
+        *questions["hr"],
+        *questions["behavioral"],
+        gd["topic"],
+        gd["expected_answer"],
+    ]
+    return list(dict.fromkeys(normalize_text(text) for text in texts if normalize_text(text)))
+
+
+async def _pack_question_embeddings(normalized_results: list) -> list:
+    """``question_embeddings`` values for several interviews from one
+    batched encode call; None for an interview without question text."""
+    texts = [_question_texts(result) for result in normalized_results]
+    flat = [text for group in texts for text in group]
+    if not flat:
+        return [None] * len(texts)
+    matrix = await run_in_threadpool(encode_texts, flat)
+    packed, offset = [], 0
+    for group in texts:
+        packed.append(pack_embeddings(group, matrix[offset : offset + len(group)]) if group else None)
+        offset += len(group)
+    return packed
+
+
+async def _precompute_question_embeddings(interview_id: str, normalized_result: dict) -> None:
+    """Embed the expected side of every question so scoring only has to
+    encode the candidate's answers."""
+    packed = (await _pack_question_embeddings([normalized_result]))[0]
+    if packed is None:
+        return
+    await get_async_interviews_collection().update_one(
+        {"_id": ObjectId(interview_id)},
+        {"$set": {"question_embeddings": packed}},
+    )
+
+
+async def _index_analysis(response: dict) -> None:
+    """Post-insert work for a new interview: question embeddings, and the
+    resume profile for the semantic cache when its questions are new."""
+    await _precompute_question_embeddings(response["interview_id"], response["data"])
+    if response["parse_error"] is None and response.get("semantic_match") is None:
+        await question_index.index_profile(response["interview_id"], response["data"]["extracted_information"])
+
+
+async def _analyze_bytes(file_bytes: bytes, use_cache: bool, allow_degraded: bool = True):
+    """Run the full analysis; returns (response, is_new_interview)."""
+    cache_key = _cache_key(file_bytes)
+
+    if use_cache:
+        cached = await _get_cached_analysis(cache_key)
+        if cached is not None:
+            return _cached_response(cached), False
+
+    resume_text = await _extract_text(file_bytes)
+
+    llm_output, extracted_info, semantic_match = await _generate_questions(resume_text, allow_degraded)
+
+    return await _save_analysis(resume_text, llm_output, cache_key, extracted_info, semantic_match), True
+
+
+# -----------------------------------
+# Background Jobs
+# -----------------------------------
+async def _run_resume_job(file_bytes: bytes, use_cache: bool, final_attempt: bool) -> dict:
+    # The queue retries LLM outages; fallback questions or a loose semantic
+    # match are only accepted once the job is out of retries.
+    try:
+        response, is_new = await _analyze_bytes(file_bytes, use_cache, allow_degraded=final_attempt)
+    except HTTPException as exc:
+        # Bad uploads fail for good; upstream/LLM errors are retried.
+        if exc.status_code < 500:
+            raise PermanentJobError(exc.detail) from exc
+        raise
+
+    if is_new:
+        try:
+            await _index_analysis(response)
+        except Exception:
+            # Scoring encodes the questions itself when vectors are missing.
+            pass
+    return response
+
+
+job_queue = ResumeJobQueue(_run_resume_job)
+
+
+@router.post("/analyze-resume/")
+async def analyze_resume(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    no_cache: bool = Query(False, description="Skip the result cache and force a fresh analysis"),
+    job: bool = Query(False, description="Queue the analysis and return a job id immediately"),
+):
+    file_bytes = await _read_upload(file)
+    use_cache = RESUME_CACHE_ENABLED and not no_cache
+
+    if job:
+        try:
+            job_id = await job_queue.enqueue(file_bytes, file.filename, use_cache)
+        except JobQueueFull:
+            raise HTTPException(status_code=429, detail="Too many resumes queued, retry later")
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+    response, is_new = await _analyze_bytes(file_bytes, use_cache)
+    if is_new:
+        background_tasks.add_task(_index_analysis, response)
+    return response
+
+
+@router.get("/analyze-resume/jobs/{job_id}")
+async def get_resume_job(job_id: str):
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_to_out(job)
+
+
+@router.get("/analyze-resume/llm-backends")
+async def llm_backend_stats():
+    return _llm_router().stats()
+
+
+@router.get("/analyze-resume/interviews/{interview_id}")
+async def get_interview(
+    interview_id: str,
+    include_raw: bool = Query(False, description="Also return the resume text and raw LLM output (admins only)"),
+    admin: Optional[dict] = Depends(get_optional_admin),
+):
+    if include_raw and admin is None:
+        # The resume text is personal data.
+        raise HTTPException(status_code=401, detail="Admin login required for include_raw")
+    try:
+        object_id = ObjectId(interview_id)
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    projection = dict(INTERVIEW_PROJECTION)
+    if include_raw:
+        # Documents stored before offloading still hold the raw fields.
+        projection.update({field: 1 for field in INTERVIEW_RAW_FIELDS})
+    document = await get_async_interviews_collection().find_one({"_id": object_id}, projection=projection)
+    if not document:
+        raise HTTPException(status_code=404, detail="Interview not found")
+
+    if include_raw:
+        raw = await load_raw_fields(document, INTERVIEW_RAW_FIELDS)
+        for field in INTERVIEW_RAW_FIELDS:
+            document[field] = raw.get(field)
+    document["interview_id"] = str(document.pop("_id"))
+    return document
+
+
+@router.get("/analyze-resume/semantic-cache")
+async def semantic_cache_stats():
+    return question_index.stats()
+
+
+# -----------------------------------
+# Streaming (SSE) Analysis
+# -----------------------------------
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _partial_event(path: tuple, value):
+    if path == ("extracted_information",):
+        return _sse("extracted_information", _normalize_extracted_info(value))
+    if len(path) == 2 and path[0] == "interview_questions" and path[1] in {"technical", "hr", "behavioral"}:
+        return _sse("questions", {"category": path[1], "questions": _to_string_list(value)})
+    if path == ("group_discussion",) and isinstance(value, dict):
+        return _sse("group_discussion", value)
+    return None
+
+
+async def _stream_analysis(file_bytes: bytes, cache_key: str, use_cache: bool, background_tasks: BackgroundTasks):
+    try:
+        if use_cache:
+            cached = await _get_cached_analysis(cache_key)
+            if cached is not None:
+                yield _sse("result", _cached_response(cached))
+                return
+
+        resume_text = await _extract_text(file_bytes)
+
+        prompt, extracted_info = _prepare_prompt(resume_text)
+        if extracted_info is not None:
+            # Known before the LLM is even called.
+            yield _sse("extracted_information", _normalize_extracted_info(extracted_info))
+
+        match = await _semantic_lookup(extracted_info)
+        if match is None:
+            parser = IncrementalJSONParser()
+            chunks = []
+            try:
+                # Includes time the client takes to read the partial events.
+                with stage("resume.llm_stream"):
+                    async for delta in _llm_router().stream(_llm_payload(prompt)):
+                        chunks.append(delta)
+                        for path, value in parser.feed(delta):
+                            if extracted_info is not None and path == ("extracted_information",):
+                                continue
+                            event = _partial_event(path, value)
+                            if event:
+                                yield event
+                llm_output = "".join(chunks)
+            except LLMError as exc:
+                LLM_FAILURES.inc(reason=f"http_{exc.status_code}")
+                if isinstance(exc, LLMRejected):
+                    raise
+                extracted_info = extracted_info or parse_resume(resume_text)
+                match = await _semantic_lookup(extracted_info, degraded=True)
+                if match is None and not LLM_FALLBACK_QUESTIONS:
+                    raise
+                llm_output = None
+
+        semantic_match = _match_summary(match)
+        if match is not None:
+            llm_output = _semantic_output(match)
+            for category in ("technical", "hr", "behavioral"):
+                yield _partial_event(("interview_questions", category), match["interview_questions"][category])
+            yield _partial_event(("group_discussion",), match["group_discussion"])
+
+        # The final payload goes through the same normalization and
+        # persistence as the non-streaming endpoint.
+        response = await _save_analysis(resume_text, llm_output, cache_key, extracted_info, semantic_match)
+        # Runs once the stream has been fully sent.
+        background_tasks.add_task(_index_analysis, response)
+        yield _sse("result", response)
+    except HTTPException as exc:
+        yield _sse("error", {"status_code": exc.status_code, "detail": exc.detail})
+    except LLMError as exc:
+        yield _sse("error", {"status_code": exc.status_code, "detail": exc.detail})
+    except Exception as exc:
+        # Headers are already sent, so the stream has to carry the 500.
+        yield _sse("error", {"status_code": 500, "detail": f"Resume analysis failed: {exc}"})
+
+
+@router.post("/analyze-resume/stream")
+async def analyze_resume_stream(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    no_cache: bool = Query(False, description="Skip the result cache and force a fresh analysis"),
+):
+    file_bytes = await _read_upload(file)
+    use_cache = RESUME_CACHE_ENABLED and not no_cache
+    return StreamingResponse(
+        _stream_analysis(file_bytes, _cache_key(file_bytes), use_cache, background_tasks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
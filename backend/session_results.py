@@ -0,0 +1,225 @@
+import base64
+import binascii
+import json
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Literal, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+if __package__:
+    from .auth import get_current_admin
+    from .db import get_async_interview_sessions_collection, get_async_session_rollups_collection
+else:
+    from auth import get_current_admin
+    from db import get_async_interview_sessions_collection, get_async_session_rollups_collection
+
+router = APIRouter(prefix="/admin/sessions", tags=["Admin Sessions"])
+
+# Session statuses. Sessions stored before the start/answers/complete
+# lifecycle have no status and count as completed.
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+# Filter matching every finished session, old or new.
+FINISHED = {"status": {"$ne": IN_PROGRESS}}
+
+SESSION_LIST_DEFAULT_LIMIT = 50
+SESSION_LIST_MAX_LIMIT = 200
+
+# Fields returned per session in the listing; answers live in artifacts.
+SESSION_LIST_PROJECTION = {
+    "session_mode": 1,
+    "interview_id": 1,
+    "candidate_email": 1,
+    "candidate_name": 1,
+    "status": 1,
+    "answer_count": 1,
+    "summary": 1,
+    "created_at": 1,
+}
+
+# Summary fields counted per value in each rollup.
+DISTRIBUTION_FIELDS = ("overall_result", "confidence_level", "nervousness_level")
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored timestamps are naive UTC (datetime.utcnow()).
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------------------------
+
+
+def encode_cursor(document: dict) -> str:
+    position = {"t": document["created_at"].isoformat(), "id": str(document["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """(created_at, _id) of the last session on the previous page."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(position["t"]), ObjectId(position["id"])
+    except (binascii.Error, ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def session_query(
+    candidate_email: Optional[str] = None,
+    session_mode: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    after: Optional[tuple] = None,
+    status: str = COMPLETED,
+) -> dict:
+    """Filter for one page, sorted by (created_at, _id) descending. Every
+    combination is served by one of the compound session indexes."""
+    query = dict(FINISHED) if status == COMPLETED else {"status": status}
+    if candidate_email:
+        query["candidate_email"] = candidate_email
+    if session_mode:
+        query["session_mode"] = session_mode
+    created_at = {}
+    if date_from:
+        created_at["$gte"] = _utc_naive(date_from)
+    if date_to:
+        created_at["$lt"] = _utc_naive(date_to)
+    if created_at:
+        query["created_at"] = created_at
+    if after:
+        created, last_id = after
+        query["$or"] = [
+            {"created_at": {"$lt": created}},
+            {"created_at": created, "_id": {"$lt": last_id}},
+        ]
+    return query
+
+
+def _session_out(document: dict) -> dict:
+    document["session_id"] = str(document.pop("_id"))
+    return document
+
+
+@router.get("")
+async def list_sessions(
+    candidate_email: Optional[str] = Query(None),
+    session_mode: Optional[Literal["interview", "gd"]] = Query(None),
+    date_from: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at"),
+    date_to: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at"),
+    status: Literal["completed", "in_progress"] = Query(COMPLETED, description="in_progress lists unfinished drafts"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(SESSION_LIST_DEFAULT_LIMIT, ge=1, le=SESSION_LIST_MAX_LIMIT),
+    admin: dict = Depends(get_current_admin),
+):
+    # No total count: counting matches is a full index scan at scale.
+    query = session_query(
+        candidate_email, session_mode, date_from, date_to, decode_cursor(cursor) if cursor else None, status
+    )
+    documents = (
+        await get_async_interview_sessions_collection()
+        .find(query, projection=SESSION_LIST_PROJECTION)
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    return {
+        "sessions": [_session_out(document) for document in documents[:limit]],
+        "next_cursor": next_cursor,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+
+def rollup_key(created_at: datetime, session_mode: Optional[str]) -> dict:
+    """Rollup bucket of a session: its UTC day and mode."""
+    return {"day": created_at.strftime("%Y-%m-%d"), "mode": session_mode or "interview"}
+
+
+def rollup_increment(summary: dict) -> dict:
+    """``$inc`` that adds one session with ``summary`` to its bucket."""
+    increment = {"sessions": 1}
+    score = summary.get("average_answer_score")
+    if isinstance(score, (int, float)):
+        increment["scored_sessions"] = 1
+        increment["score_sum"] = float(score)
+    completion = summary.get("completion_rate")
+    if isinstance(completion, (int, float)):
+        increment["completion_sum"] = float(completion)
+    for field in DISTRIBUTION_FIELDS:
+        if summary.get(field):
+            increment[f"{field}.{summary[field]}"] = 1
+    return increment
+
+
+async def record_session(document: dict) -> None:
+    """Fold a newly stored session into its day/mode rollup."""
+    await get_async_session_rollups_collection().update_one(
+        rollup_key(document["created_at"], document.get("session_mode")),
+        {"$inc": rollup_increment(document.get("summary") or {}), "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+    )
+
+
+def _merge(rows: Iterable[dict]) -> dict:
+    merged = Counter()
+    distributions = {field: Counter() for field in DISTRIBUTION_FIELDS}
+    for row in rows:
+        for key in ("sessions", "scored_sessions", "score_sum", "completion_sum"):
+            merged[key] += row.get(key, 0)
+        for field in DISTRIBUTION_FIELDS:
+            distributions[field].update(row.get(field) or {})
+    return {"totals": merged, "distributions": distributions}
+
+
+def rollup_out(rows: List[dict]) -> dict:
+    """Averages and distributions of one or more rollup rows."""
+    merged = _merge(rows)
+    totals = merged["totals"]
+    sessions, scored = totals["sessions"], totals["scored_sessions"]
+    return {
+        "sessions": sessions,
+        "average_answer_score": round(totals["score_sum"] / scored, 2) if scored else None,
+        "average_completion_rate": round(totals["completion_sum"] / sessions, 3) if sessions else None,
+        **{field: dict(merged["distributions"][field]) for field in DISTRIBUTION_FIELDS},
+    }
+
+
+@router.get("/rollups")
+async def session_rollups(
+    date_from: Optional[date] = Query(None, description="First UTC day, inclusive"),
+    date_to: Optional[date] = Query(None, description="Last UTC day, inclusive"),
+    session_mode: Optional[Literal["interview", "gd"]] = Query(None),
+    group_by: Literal["day", "mode", "day_mode"] = Query("day_mode"),
+    admin: dict = Depends(get_current_admin),
+):
+    query = {}
+    if date_from or date_to:
+        query["day"] = {}
+        if date_from:
+            query["day"]["$gte"] = date_from.isoformat()
+        if date_to:
+            query["day"]["$lte"] = date_to.isoformat()
+    if session_mode:
+        query["mode"] = session_mode
+
+    rows = await get_async_session_rollups_collection().find(query).sort([("day", 1), ("mode", 1)]).to_list(length=None)
+
+    fields = ("day", "mode") if group_by == "day_mode" else (group_by,)
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[field] for field in fields), []).append(row)
+    return {
+        "group_by": group_by,
+        "rollups": [{**dict(zip(fields, key)), **rollup_out(group)} for key, group in groups.items()],
+        "total": rollup_out(rows),
+    }
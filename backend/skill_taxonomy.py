@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+from collections import Counter, deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# JSON file of {"skills": [{"name", "category", "aliases", "exact"}]}. Names
+# and aliases match case-insensitively; "exact" lists case-sensitive forms
+# (e.g. "Go") and, when present, replaces the case-insensitive name.
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
+
+# ASCII-only lowercasing keeps every character at its original offset.
+_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    category: str
+    start: int
+    end: int
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _normalize_term(term: str) -> str:
+    return " ".join(term.split()).translate(_LOWER)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every skill name and alias.
+
+    ``find_all`` scans the text once, whatever the size of the taxonomy.
+    Matches must sit on word boundaries, runs of whitespace in the text
+    match a single space in a term, and overlapping matches resolve to
+    the leftmost, longest one ("Spring Boot" rather than "Spring").
+    """
+
+    def __init__(self, entries: Iterable[dict]):
+        self.skills: List[Tuple[str, str]] = []
+        self._categories: Dict[str, str] = {}
+        # Trie as parallel lists: transitions, failure links and outputs of
+        # (term length, skill index, case-sensitive form or None).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int, Optional[str]]]] = [[]]
+        self.terms = 0
+
+        for entry in entries:
+            index = len(self.skills)
+            name, category = entry["name"], entry.get("category", "")
+            self.skills.append((name, category))
+            self._categories[name.lower()] = category
+            forms = [] if "exact" in entry else [name]
+            for alias in (*forms, *entry.get("aliases", [])):
+                self._add(_normalize_term(alias), index, None)
+            for form in entry.get("exact", []):
+                self._add(_normalize_term(form), index, " ".join(form.split()))
+        self._build()
+
+    def _add(self, term: str, skill_index: int, exact: Optional[str]) -> None:
+        if not term:
+            return
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((len(term), skill_index, exact))
+        self.terms += 1
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        lowered = text.translate(_LOWER)
+        goto, fail, out = self._goto, self._fail, self._out
+        # Original offset of every character fed to the automaton, so a
+        # match can be mapped back after whitespace runs were collapsed.
+        positions: List[int] = []
+        candidates = []
+        node = 0
+        previous_space = True
+
+        for offset, char in enumerate(lowered):
+            if char.isspace():
+                if previous_space:
+                    continue
+                char, previous_space = " ", True
+            else:
+                previous_space = False
+            positions.append(offset)
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, skill_index, exact in out[node]:
+                start = positions[len(positions) - length]
+                end = offset + 1
+                if exact is not None and " ".join(text[start:end].split()) != exact:
+                    continue
+                if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(char) and end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                candidates.append((start, end, skill_index))
+
+        matches: List[SkillMatch] = []
+        covered_until = -1
+        for start, end, skill_index in sorted(candidates, key=lambda c: (c[0], c[0] - c[1])):
+            if start < covered_until:
+                continue
+            name, category = self.skills[skill_index]
+            matches.append(SkillMatch(name, category, start, end))
+            covered_until = end
+        return matches
+
+    def counts(self, text: str) -> Counter:
+        return Counter(match.skill for match in self.find_all(text))
+
+    def detect(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Canonical skill names found in ``text``, most mentioned first
+        (ties keep the order of first mention)."""
+        counts = self.counts(text)
+        ranked = sorted(counts, key=lambda skill: -counts[skill])
+        return ranked[:limit] if limit is not None else ranked
+
+    def category(self, skill: str) -> Optional[str]:
+        return self._categories.get(skill.lower())
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+def load_taxonomy(path: str = SKILL_TAXONOMY_PATH) -> List[dict]:
+    with open(path, "r", encoding="utf-8") as taxonomy_file:
+        return json.load(taxonomy_file)["skills"]
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Shared matcher, built from the taxonomy file on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
@@ -0,0 +1,50 @@
+"""Test setup: mongomock instead of a server, the hash embedding backend
+instead of the sentence-transformers model, the semantic question cache
+off, and no LLM unless a test starts a stub server. Backend modules are
+imported the way main.py imports them, and bench/ helpers are importable."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+sys.path.insert(0, str(BACKEND.parent / "bench"))
+
+os.environ["MONGO_URI"] = "mongomock://"
+os.environ["MONGO_DB_NAME"] = "ai_mock_interviews_test"
+os.environ["EMBEDDING_BACKEND"] = "hash"
+os.environ["SEMANTIC_CACHE_ENABLED"] = "0"
+os.environ.setdefault("HF_API_KEY", "test")
+os.environ.setdefault("HF_API_URL", "http://127.0.0.1:9/unused")
+
+import db  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    yield
+    db.get_client().drop_database(os.environ["MONGO_DB_NAME"])
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(client):
+    account = {"email": "admin@example.com", "password": "secret1"}
+    client.post(
+        "/auth/admin/register",
+        json={**account, "first_name": "Ada", "last_name": "Admin", "profession": "HR", "confirm_password": "secret1"},
+    )
+    token = client.post("/auth/admin/login", json=account).json()["token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,49 @@
+import asyncio
+
+import db
+
+
+def test_admin_register_and_login_round_trip(client, admin_headers):
+    assert client.get("/auth/admin/details", headers=admin_headers).json()["email"] == "admin@example.com"
+
+    duplicate = client.post(
+        "/auth/admin/register",
+        json={
+            "email": "admin@example.com",
+            "password": "secret1",
+            "confirm_password": "secret1",
+            "first_name": "A",
+            "last_name": "B",
+            "profession": "HR",
+        },
+    )
+    assert duplicate.status_code == 400
+    assert client.post("/auth/admin/login", json={"email": "admin@example.com", "password": "nope"}).status_code == 401
+
+
+def test_session_completion_is_visible_to_the_sync_layer(client):
+    payload = {
+        "candidate_email": "jane@example.com",
+        "answers": [
+            {"question": "What is an index?", "expected_answer": "A sorted lookup structure", "answer_text": "a sorted lookup structure"},
+            {"question": "Why this role?", "expected_answer": "Growth", "answer_text": ""},
+        ],
+        "face_metrics": {
+            "confidence_level": "High",
+            "nervousness_level": "Low",
+            "confidence_score": 80,
+            "nervousness_score": 10,
+        },
+    }
+    response = client.post("/interview/session/complete", json=payload)
+    assert response.status_code == 200
+
+    # Both layers share one mongomock store.
+    stored = db.get_interview_sessions_collection().find_one({"candidate_email": "jane@example.com"})
+    scores = stored["summary"]["question_scores"]
+    assert scores[0] == 10.0 and scores[1] == 0.0
+
+    async def count():
+        return await db.get_async_interview_sessions_collection().count_documents({})
+
+    assert asyncio.run(count()) == 1
@@ -0,0 +1,39 @@
+import auth
+import db
+
+
+def test_repeat_requests_are_served_from_the_admin_cache(client, admin_headers, monkeypatch):
+    lookups = []
+    collection = auth.get_async_admins_collection
+
+    def counting_collection():
+        admins = collection()
+        find_one = admins.find_one
+
+        async def counted(*args, **kwargs):
+            lookups.append(args)
+            return await find_one(*args, **kwargs)
+
+        admins.find_one = counted
+        return admins
+
+    monkeypatch.setattr(auth, "get_async_admins_collection", counting_collection)
+    for _ in range(3):
+        assert client.get("/auth/admin/details", headers=admin_headers).status_code == 200
+    assert len(lookups) == 1
+
+
+def test_password_reset_flow_drops_the_cached_admin(client, admin_headers):
+    assert client.get("/auth/admin/protected", headers=admin_headers).json() == {"message": "Hello Ada"}
+
+    db.get_admins_collection().update_one({"email": "admin@example.com"}, {"$set": {"first_name": "Grace"}})
+    # Still cached: the direct write went around the handlers.
+    assert client.get("/auth/admin/protected", headers=admin_headers).json() == {"message": "Hello Ada"}
+
+    assert client.post("/auth/admin/forgot-password", json={"email": "admin@example.com"}).status_code == 200
+    assert client.get("/auth/admin/protected", headers=admin_headers).json() == {"message": "Hello Grace"}
+
+
+def test_tampered_tokens_are_rejected(client, admin_headers):
+    token = admin_headers["Authorization"] + "x"
+    assert client.get("/auth/admin/details", headers={"Authorization": token}).status_code == 401
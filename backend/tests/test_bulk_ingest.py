@@ -0,0 +1,151 @@
+import asyncio
+import json
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+import bulk_ingest
+import db
+from artifacts import decompress
+from embeddings import HashEmbeddingBackend
+
+LLM_OUTPUT = json.dumps(
+    {
+        "interview_questions": {"technical": [{"question": "What is Python?", "expected_answer": "A language"}]},
+        "group_discussion": {"topic": "Remote work"},
+    }
+)
+
+
+@pytest.fixture
+def offline_analysis(monkeypatch):
+    async def extract(data):
+        return data.decode()
+
+    async def generate(resume_text):
+        return LLM_OUTPUT, {"name": resume_text, "skills": ["Python"]}, None
+
+    monkeypatch.setattr(bulk_ingest, "_extract_text", extract)
+    monkeypatch.setattr(bulk_ingest, "_generate_questions", generate)
+
+
+def _ingest(names):
+    async def collect():
+        items = [(name, name.encode()) for name in names]
+        return [event async for event in bulk_ingest.ingest_resumes(items, use_cache=False)]
+
+    events = asyncio.run(collect())
+    return {event["file"]: event for event in events if event["event"] == "file"}, events[-1]
+
+
+def test_failed_artifacts_fail_only_their_files(monkeypatch, offline_analysis):
+    save_artifacts = bulk_ingest.save_artifacts
+
+    async def flaky_save(artifacts):
+        artifacts = list(artifacts)
+        resumes = [json.loads(decompress(artifact["codec"], artifact["data"]))["resume_text"] for artifact in artifacts]
+        bad = resumes.index("bob")
+        await save_artifacts(artifacts[:bad] + artifacts[bad + 1 :])
+        raise BulkWriteError({"writeErrors": [{"index": bad, "errmsg": "artifact rejected"}]})
+
+    monkeypatch.setattr(bulk_ingest, "save_artifacts", flaky_save)
+    results, summary = _ingest(["alice", "bob", "carol"])
+
+    assert results["bob"]["status"] == "error" and results["bob"]["error"] == "artifact rejected"
+    assert {results[name]["status"] for name in ("alice", "carol")} == {"ok"}
+    assert summary == {"event": "summary", "total": 3, "succeeded": 2, "failed": 1}
+    interviews = db.get_db()[db.INTERVIEWS]
+    assert interviews.count_documents({}) == 2
+    for name in ("alice", "carol"):
+        assert interviews.find_one({"_id": ObjectId(results[name]["interview_id"])})
+
+
+def test_failed_interview_insert_is_reported_and_its_artifact_removed(monkeypatch, offline_analysis):
+    class FailingInterviews:
+        async def insert_many(self, documents, ordered):
+            raise BulkWriteError({"writeErrors": [{"index": 0, "errmsg": "insert rejected"}]})
+
+    monkeypatch.setattr(bulk_ingest, "get_async_interviews_collection", lambda: FailingInterviews())
+    results, _ = _ingest(["alice"])
+    assert results["alice"]["status"] == "error" and results["alice"]["error"] == "insert rejected"
+    assert db.get_db()[db.INTERVIEW_ARTIFACTS].count_documents({}) == 0
+
+
+def test_write_failures_map_indexes_to_ids():
+    ids = [ObjectId(), ObjectId(), ObjectId()]
+    error = BulkWriteError({"writeErrors": [{"index": 2, "errmsg": "dup"}]})
+    assert bulk_ingest._write_failures(error, ids) == {ids[2]: "dup"}
+
+
+def test_question_embeddings_are_stored_from_one_encode_call(monkeypatch, offline_analysis):
+    import resume_router
+
+    calls = []
+    encode_texts = resume_router.encode_texts
+
+    def counting_encode(texts):
+        calls.append(len(texts))
+        return encode_texts(texts)
+
+    monkeypatch.setattr(resume_router, "encode_texts", counting_encode)
+    results, _ = _ingest(["alice", "bob", "carol"])
+
+    assert len(calls) == 1
+    for name in ("alice", "bob", "carol"):
+        stored = db.get_db()[db.INTERVIEWS].find_one({"_id": ObjectId(results[name]["interview_id"])})
+        assert stored["question_embeddings"]["texts"]
+        assert stored["question_embeddings"]["dim"] == HashEmbeddingBackend.dim
+
+
+def test_oversized_batches_raise_a_domain_error(monkeypatch, client):
+    monkeypatch.setattr(bulk_ingest, "BULK_MAX_FILES", 1)
+    with pytest.raises(bulk_ingest.BatchTooLarge):
+        bulk_ingest.expand_uploads([("a.pdf", b"%PDF-1"), ("b.pdf", b"%PDF-1")])
+
+    files = [("files", ("a.pdf", b"%PDF-1", "application/pdf")), ("files", ("b.pdf", b"%PDF-1", "application/pdf"))]
+    response = client.post("/analyze-resume/bulk", files=files)
+    assert response.status_code == 413 and response.json()["detail"] == "Batch exceeds 1 files"
+
+
+def test_uploads_are_read_only_up_to_their_limit(monkeypatch, client, offline_analysis):
+    from starlette.datastructures import UploadFile
+
+    read_sizes = []
+    read = UploadFile.read
+
+    async def recording_read(self, size=-1):
+        read_sizes.append(size)
+        return await read(self, size)
+
+    monkeypatch.setattr(UploadFile, "read", recording_read)
+    monkeypatch.setattr(bulk_ingest, "RESUME_MAX_BYTES", 100)
+    files = [
+        ("files", ("big.pdf", b"%PDF-" + b"x" * 5000, "application/pdf")),
+        ("files", ("alice", b"alice", "application/pdf")),
+    ]
+    response = client.post("/analyze-resume/bulk", files=files, params={"no_cache": True})
+    events = {event["file"]: event for event in map(json.loads, response.text.splitlines()) if event["event"] == "file"}
+
+    assert events["big.pdf"]["status_code"] == 413 and events["alice"]["status"] == "ok"
+    assert all(0 < size <= 101 for size in read_sizes)
+
+    monkeypatch.setattr(bulk_ingest, "BULK_MAX_TOTAL_BYTES", 8)
+    files = [("files", (name, b"12345", "application/pdf")) for name in ("a", "b")]
+    response = client.post("/analyze-resume/bulk", files=files)
+    assert response.status_code == 413 and response.json()["detail"] == "Batch exceeds 8 bytes"
+
+
+def test_a_failing_write_batch_still_ends_the_stream(monkeypatch, offline_analysis):
+    def broken_offload(*args):
+        raise RuntimeError("offload failed")
+
+    monkeypatch.setattr(bulk_ingest, "prepare_offload", broken_offload)
+
+    async def collect():
+        items = [("alice", b"alice"), ("bob", b"bob")]
+        return [event async for event in bulk_ingest.ingest_resumes(items, use_cache=False)]
+
+    events = asyncio.run(asyncio.wait_for(collect(), timeout=10))
+    assert {event["file"]: event["error"] for event in events[:-1]} == {"alice": "offload failed", "bob": "offload failed"}
+    assert events[-1] == {"event": "summary", "total": 2, "succeeded": 0, "failed": 2}
@@ -0,0 +1,40 @@
+import cache
+from cache import TTLCache
+
+
+def test_lru_eviction():
+    entries = TTLCache(2, 60)
+    entries.put("a", 1)
+    entries.put("b", 2)
+    assert entries.get("a") == 1
+    entries.put("c", 3)
+    assert entries.get("b") is None
+    assert entries.get("a") == 1
+    assert entries.get("c") == 3
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    entries = TTLCache(10, 30)
+    entries.put("a", 1)
+    entries.put("b", 2, ttl_seconds=5)
+    now[0] += 10
+    assert entries.get("b") is None
+    assert entries.get("a") == 1
+    now[0] += 25
+    assert entries.get("a") is None
+    assert entries.stats() == {"entries": 0, "hits": 1, "misses": 2}
+
+
+def test_per_entry_ttl_is_capped_and_disabled_cache_stores_nothing(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    entries = TTLCache(10, 30)
+    entries.put("a", 1, ttl_seconds=3600)
+    now[0] += 31
+    assert entries.get("a") is None
+
+    disabled = TTLCache(0, 30)
+    disabled.put("a", 1)
+    assert len(disabled) == 0
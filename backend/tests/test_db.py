@@ -0,0 +1,28 @@
+import asyncio
+
+from pymongo import ASCENDING, DESCENDING
+
+import db
+
+
+def _create_obsolete_indexes():
+    sessions = db.get_interview_sessions_collection()
+    sessions.create_index([("created_at", ASCENDING)])
+    sessions.create_index([("candidate_email", ASCENDING), ("created_at", DESCENDING)])
+    sessions.create_index([("session_mode", ASCENDING), ("created_at", DESCENDING)])
+    return sessions
+
+
+def test_ensure_indexes_drops_superseded_session_indexes():
+    sessions = _create_obsolete_indexes()
+    db.ensure_indexes()
+    names = set(sessions.index_information())
+    assert not names & set(db.OBSOLETE_INDEXES[db.INTERVIEW_SESSIONS])
+    assert "created_at_-1__id_-1" in names
+    db.ensure_indexes()  # idempotent
+
+
+def test_ensure_indexes_async_drops_superseded_session_indexes():
+    sessions = _create_obsolete_indexes()
+    asyncio.run(db.ensure_indexes_async())
+    assert not set(sessions.index_information()) & set(db.OBSOLETE_INDEXES[db.INTERVIEW_SESSIONS])
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import embeddings
+from embeddings import EmbeddingCache
+
+
+class CountingBackend(embeddings.EmbeddingBackend):
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_cache_evicts_by_bytes_and_persists(tmp_path):
+    vector = np.ones(4, dtype=np.float32)
+    cache = EmbeddingCache(max_bytes=2 * vector.nbytes, path=str(tmp_path / "vectors.sqlite"))
+    cache.put_many("m", {"a": vector, "b": vector, "c": vector})
+    assert cache.stats()["entries"] == 2 and cache.stats()["bytes"] == 2 * vector.nbytes
+
+    found = cache.get_many("m", ["a", "c", "missing"])
+    assert set(found) == {"a", "c"}
+    assert (cache.hits, cache.persistent_hits, cache.misses) == (1, 1, 1)
+
+    reopened = EmbeddingCache(max_bytes=1024, path=str(tmp_path / "vectors.sqlite"))
+    assert np.array_equal(reopened.get_many("m", ["b"])["b"], vector)
+    assert reopened.get_many("other-model", ["b"]) == {}
+
+
+def test_encode_texts_batches_misses_and_skips_uncacheable(monkeypatch):
+    model = CountingBackend()
+    monkeypatch.setattr(embeddings, "_backend", model)
+    monkeypatch.setattr(embeddings, "embedding_cache", EmbeddingCache(max_bytes=1 << 20))
+
+    first = embeddings.encode_texts(["What is  REST?", "What is REST?", "my answer"], cacheable=[True, True, False])
+    assert model.calls == [["What is REST?", "my answer"]]
+    assert np.array_equal(first[0], first[1])
+
+    embeddings.encode_texts(["What is REST?", "my answer"], cacheable=[True, False])
+    assert model.calls[-1] == ["my answer"]
+    assert embeddings.encode_texts([]).shape == (0, 0)
+
+
+def test_precomputed_vectors_round_trip_and_skip_the_model(monkeypatch):
+    model = CountingBackend()
+    monkeypatch.setattr(embeddings, "_backend", model)
+    monkeypatch.setattr(embeddings, "embedding_cache", EmbeddingCache(max_bytes=1 << 20))
+
+    texts = ["Explain indexing.", "Why this role?"]
+    matrix = np.array([[0.5, 0.25], [1.0, -1.0]], dtype=np.float32)
+    packed = embeddings.pack_embeddings(texts, matrix)
+    assert packed["dim"] == 2 and packed["model"] == embeddings.EMBEDDING_ID
+
+    precomputed = embeddings.unpack_embeddings(packed)
+    result = embeddings.encode_texts(texts + ["candidate answer"], precomputed=precomputed)
+    assert model.calls == [["candidate answer"]]
+    assert np.array_equal(result[:2], matrix)
+
+    assert embeddings.unpack_embeddings({**packed, "model": "some-other-model"}) == {}
+    assert embeddings.unpack_embeddings(None) == {}
+
+
+def test_hash_backend_is_registered_and_deterministic(monkeypatch):
+    backend = embeddings._BACKEND_FACTORIES["hash"]()
+    first = backend.encode(["Python and Go", "python  AND go"], batch_size=8)
+    assert first.shape == (2, embeddings.HashEmbeddingBackend.dim)
+    assert np.array_equal(first[0], first[1])
+
+    monkeypatch.setattr(embeddings, "_backend", None)
+    monkeypatch.setattr(embeddings, "EMBEDDING_BACKEND", "no-such-backend")
+    with pytest.raises(ValueError, match="Unknown EMBEDDING_BACKEND"):
+        embeddings.get_embedding_backend()
+
+
+def test_backends_must_implement_encode():
+    class Incomplete(embeddings.EmbeddingBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError, match="encode"):
+        Incomplete()
@@ -0,0 +1,91 @@
+import asyncio
+import io
+import os
+import time
+from pathlib import Path
+
+import docx
+import pytest
+
+import extraction
+from extraction import ExtractionError, extract_resume_text, extract_text_from_pdf, sniff_document_type
+
+SAMPLE_PDF = Path(__file__).resolve().parents[2] / "test" / "cv_kalki.pdf"
+
+
+@pytest.fixture(autouse=True)
+def extraction_pool():
+    yield
+    extraction.shutdown_extraction_pool()
+
+
+def _docx_bytes(*paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_pdf_and_docx_are_extracted_in_the_pool():
+    pdf = SAMPLE_PDF.read_bytes()
+    word = _docx_bytes("Jane Doe", "Skills: Python, Go")
+    assert sniff_document_type(pdf) == "pdf" and sniff_document_type(word) == "docx"
+
+    async def scenario():
+        return await asyncio.gather(extract_resume_text(pdf), extract_resume_text(word))
+
+    pdf_text, docx_text = asyncio.run(scenario())
+    assert "Kalkeesh" in pdf_text
+    assert docx_text == "Jane Doe\nSkills: Python, Go"
+
+
+@pytest.mark.parametrize(
+    "data, status_code, detail",
+    [
+        (b"plain text resume", 400, "Only PDF and DOCX supported"),
+        (b"PK\x03\x04 not really a zip", 400, "Only PDF and DOCX supported"),
+        (b"%PDF-1.4 truncated", 400, "Could not parse PDF file"),
+    ],
+)
+def test_unusable_uploads_are_rejected(data, status_code, detail):
+    with pytest.raises(ExtractionError) as error:
+        asyncio.run(extract_resume_text(data))
+    assert error.value.status_code == status_code and error.value.detail.startswith(detail)
+
+
+def test_size_and_page_limits(monkeypatch):
+    monkeypatch.setattr(extraction, "RESUME_MAX_BYTES", 10)
+    with pytest.raises(ExtractionError) as error:
+        asyncio.run(extract_resume_text(b"%PDF-1.4 more than ten bytes"))
+    assert error.value.status_code == 413
+
+    with pytest.raises(ExtractionError) as error:
+        extract_text_from_pdf(SAMPLE_PDF.read_bytes(), max_pages=0)
+    assert error.value.status_code == 413
+
+
+def _crash_worker(kind, data):
+    os._exit(1)
+
+
+def _hang_worker(kind, data):
+    time.sleep(30)
+
+
+@pytest.mark.parametrize(
+    "worker, status_code",
+    [(_crash_worker, 503), (_hang_worker, 504)],
+)
+def test_dead_or_stuck_workers_get_a_fresh_pool(monkeypatch, worker, status_code):
+    pdf = SAMPLE_PDF.read_bytes()
+    monkeypatch.setattr(extraction, "EXTRACT_TIMEOUT_SECONDS", 1)
+    monkeypatch.setattr(extraction, "_extract", worker)
+    with pytest.raises(ExtractionError) as error:
+        asyncio.run(extract_resume_text(pdf))
+    assert error.value.status_code == status_code
+    assert extraction._pool is None
+
+    monkeypatch.undo()
+    assert "Kalkeesh" in asyncio.run(extract_resume_text(pdf))
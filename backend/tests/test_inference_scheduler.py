@@ -0,0 +1,121 @@
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from inference_scheduler import BatchingEncoder
+
+
+def test_concurrent_callers_share_batches():
+    batch_sizes = []
+
+    def encode(texts):
+        batch_sizes.append(len(texts))
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+    encoder = BatchingEncoder(encode, max_batch_size=64, max_wait_seconds=0.1, torch_threads=0)
+    results = {}
+
+    def call(i):
+        results[i] = encoder.encode(["x" * i, "y" * (i + 1)])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(1, 9)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        encoder.stop()
+
+    for i in range(1, 9):
+        assert results[i][:, 0].tolist() == [i, i + 1]
+    assert sum(batch_sizes) == 16 and len(batch_sizes) < 8
+    stats = encoder.stats()
+    assert stats["requests"] == 8 and stats["batches"] == len(batch_sizes)
+
+
+def test_model_errors_reach_every_caller():
+    def encode(texts):
+        raise RuntimeError("model crashed")
+
+    encoder = BatchingEncoder(encode, max_batch_size=8, max_wait_seconds=0.01, torch_threads=0)
+    try:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            encoder.encode(["a"])
+        # The worker survives and keeps serving.
+        with pytest.raises(RuntimeError):
+            encoder.encode(["b"])
+    finally:
+        encoder.stop()
+
+
+def test_batches_never_exceed_the_cap():
+    batch_sizes = []
+
+    def encode(texts):
+        batch_sizes.append(len(texts))
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+    encoder = BatchingEncoder(encode, max_batch_size=4, max_wait_seconds=0.05, torch_threads=0)
+    requests = [["a"], ["bb", "cc", "dd"], ["eee", "fff"], ["g" * 7] * 6, ["h"]]
+    futures = []
+    # Queued before the worker starts, so all of them are waiting at once.
+    for texts in requests:
+        future = Future()
+        encoder._queue.put((texts, future))
+        futures.append(future)
+    encoder._ensure_started()
+    try:
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        encoder.stop()
+
+    for texts, vectors in zip(requests, results):
+        assert vectors[:, 0].tolist() == [len(text) for text in texts]
+    # The oversized request runs alone; everything else fits the cap.
+    assert batch_sizes == [4, 2, 6, 1]
+
+
+def test_callers_time_out_instead_of_waiting_forever():
+    release = threading.Event()
+
+    def encode(texts):
+        release.wait(5)
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+    encoder = BatchingEncoder(encode, max_batch_size=8, max_wait_seconds=0.01, torch_threads=0, timeout_seconds=0.1)
+    try:
+        with pytest.raises(TimeoutError, match="did not finish"):
+            encoder.encode(["stuck"])
+        release.set()
+        assert encoder.encode(["ok"])[:, 0].tolist() == [2]
+    finally:
+        encoder.stop()
+
+
+def test_failures_before_encoding_reach_every_dequeued_caller(monkeypatch):
+    import sys
+
+    encoder = BatchingEncoder(lambda texts: np.zeros((len(texts), 1)), max_wait_seconds=0.05, torch_threads=2)
+    # torch can't be imported, so setting the thread count fails.
+    monkeypatch.setitem(sys.modules, "torch", None)
+    try:
+        with pytest.raises(ImportError):
+            encoder.encode(["a"])
+    finally:
+        encoder.stop()
+
+    encoder = BatchingEncoder(lambda texts: np.zeros((len(texts), 1)), max_wait_seconds=0.05, torch_threads=0)
+    # A malformed request breaks flattening the batch it shares.
+    futures = [Future(), Future()]
+    encoder._queue.put((["a"], futures[0]))
+    encoder._queue.put((None, futures[1]))
+    encoder._ensure_started()
+    try:
+        for future in futures:
+            with pytest.raises(TypeError):
+                future.result(timeout=5)
+    finally:
+        encoder.stop()
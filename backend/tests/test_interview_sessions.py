@@ -0,0 +1,112 @@
+from bson import ObjectId
+
+import db
+
+FACE_METRICS = {"confidence_level": "High", "nervousness_level": "Low", "confidence_score": 80, "nervousness_score": 10}
+ANSWERS = [
+    {"question": "What is a REST API?", "expected_answer": "An HTTP API built around resources", "answer_text": "An HTTP API over resources"},
+    {"question": "Why do indexes help?", "expected_answer": "They avoid full collection scans", "answer_text": ""},
+    {"question": "What is Docker?", "expected_answer": "A container runtime", "answer_text": "It runs containers"},
+]
+
+
+def _session(session_id):
+    return db.get_interview_sessions_collection().find_one({"_id": ObjectId(session_id)})
+
+
+def test_lifecycle_matches_one_shot_summary(client):
+    one_shot = client.post("/interview/session/complete", json={"answers": ANSWERS, "face_metrics": FACE_METRICS}).json()
+
+    session_id = client.post("/interview/session/start", json={"candidate_email": "c@example.com"}).json()["session_id"]
+    for index, answer in enumerate(ANSWERS):
+        response = client.post(f"/interview/session/{session_id}/answers", json={"index": index, "answer": answer})
+        assert response.status_code == 202
+        assert response.json()["scoring"] == bool(answer["answer_text"])
+    draft = _session(session_id)
+    assert draft["status"] == "in_progress" and sorted(draft["answer_scores"]) == ["0", "2"]
+
+    completed = client.post(f"/interview/session/{session_id}/complete", json={"face_metrics": FACE_METRICS})
+    assert completed.status_code == 200
+    assert completed.json()["summary"] == one_shot["summary"]
+
+    stored = _session(session_id)
+    assert stored["status"] == "completed" and stored["answer_count"] == 3
+    assert not {"submitted_answers", "answer_scores", "expires_at"} & set(stored)
+
+
+def test_stale_or_missing_scores_are_computed_at_completion(client):
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    client.post(f"/interview/session/{session_id}/answers", json={"index": 0, "answer": ANSWERS[0]})
+    db.get_interview_sessions_collection().update_one(
+        {"_id": ObjectId(session_id)}, {"$set": {"answer_scores.0.key": "stale"}}
+    )
+    one_shot = client.post("/interview/session/complete", json={"answers": ANSWERS, "face_metrics": FACE_METRICS}).json()
+    completed = client.post(
+        f"/interview/session/{session_id}/complete", json={"answers": ANSWERS, "face_metrics": FACE_METRICS}
+    ).json()
+    assert completed["summary"] == one_shot["summary"]
+
+
+def test_completed_or_unknown_sessions_are_rejected(client):
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    assert client.post(f"/interview/session/{session_id}/complete", json={"face_metrics": FACE_METRICS}).status_code == 200
+    assert client.post(f"/interview/session/{session_id}/complete", json={"face_metrics": FACE_METRICS}).status_code == 404
+    answer = {"index": 0, "answer": ANSWERS[0]}
+    assert client.post(f"/interview/session/{session_id}/answers", json=answer).status_code == 404
+    assert client.post("/interview/session/not-an-id/answers", json=answer).status_code == 404
+    assert client.post(f"/interview/session/{session_id}/answers", json={**answer, "index": 10_000}).status_code == 422
+
+
+def test_retried_and_concurrent_completes(client, monkeypatch):
+    import interview_router
+
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    # A previous attempt stored the artifact and then failed.
+    db.get_db()[db.INTERVIEW_ARTIFACTS].insert_one({"_id": ObjectId(session_id), "codec": "none", "data": b"{}"})
+    complete = {"answers": ANSWERS, "face_metrics": FACE_METRICS}
+    assert client.post(f"/interview/session/{session_id}/complete", json=complete).status_code == 200
+
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    aggregate = interview_router._aggregate_answer_scores
+
+    async def racing_aggregate(session, answers):
+        # Another request completes the session while this one scores.
+        db.get_interview_sessions_collection().update_one({"_id": session["_id"]}, {"$set": {"status": "completed"}})
+        return await aggregate(session, answers)
+
+    monkeypatch.setattr(interview_router, "_aggregate_answer_scores", racing_aggregate)
+    assert client.post(f"/interview/session/{session_id}/complete", json=complete).status_code == 409
+
+
+def test_losing_complete_keeps_the_winners_artifact(client, monkeypatch):
+    import interview_router
+
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    winner = {"_id": ObjectId(session_id), "codec": "none", "data": b'{"answers": []}'}
+    aggregate = interview_router._aggregate_answer_scores
+
+    async def racing_aggregate(session, answers):
+        # The winning request stores its artifact and completes first.
+        db.get_db()[db.INTERVIEW_ARTIFACTS].insert_one(winner)
+        db.get_interview_sessions_collection().update_one({"_id": session["_id"]}, {"$set": {"status": "completed"}})
+        return await aggregate(session, answers)
+
+    monkeypatch.setattr(interview_router, "_aggregate_answer_scores", racing_aggregate)
+    complete = {"answers": ANSWERS, "face_metrics": FACE_METRICS}
+    assert client.post(f"/interview/session/{session_id}/complete", json=complete).status_code == 409
+    assert db.get_db()[db.INTERVIEW_ARTIFACTS].find_one({"_id": ObjectId(session_id)})["data"] == winner["data"]
+
+
+def test_answers_stay_inline_when_the_artifact_write_fails(client, monkeypatch):
+    import interview_router
+
+    async def broken_upsert(artifact):
+        raise RuntimeError("artifact store down")
+
+    monkeypatch.setattr(interview_router, "upsert_artifact", broken_upsert)
+    session_id = client.post("/interview/session/start", json={}).json()["session_id"]
+    complete = {"answers": ANSWERS, "face_metrics": FACE_METRICS}
+    assert client.post(f"/interview/session/{session_id}/complete", json=complete).status_code == 200
+    session = _session(session_id)
+    assert session["status"] == "completed"
+    assert [answer["question"] for answer in session["answers"]] == [answer["question"] for answer in ANSWERS]
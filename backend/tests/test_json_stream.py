@@ -0,0 +1,38 @@
+import json
+
+from json_stream import IncrementalJSONParser
+
+DOCUMENT = {
+    "extracted_information": {"name": "Ada", "skills": ["Python", "Go"]},
+    "interview_questions": {
+        "technical": [{"question": "What is a {brace}?", "expected_answer": "a \"quoted\" char"}],
+        "hr": ["Why us?"],
+    },
+    "group_discussion": {"topic": "AI, jobs and [you]"},
+}
+
+
+def _feed(text, chunk_size, max_depth=2):
+    parser = IncrementalJSONParser(max_depth=max_depth)
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events.extend(parser.feed(text[start : start + chunk_size]))
+    return parser, events
+
+
+def test_members_are_reported_as_they_close_in_any_chunking():
+    text = "```json\n" + json.dumps(DOCUMENT) + "\n```"
+    for chunk_size in (1, 3, 17, len(text)):
+        parser, events = _feed(text, chunk_size)
+        found = dict(events)
+        assert parser.done
+        assert found[("interview_questions", "technical")] == DOCUMENT["interview_questions"]["technical"]
+        assert found[("interview_questions", "hr")] == ["Why us?"]
+        assert found[("extracted_information", "skills")] == ["Python", "Go"]
+        assert found[("group_discussion",)] == DOCUMENT["group_discussion"]
+
+
+def test_depth_limit_and_nothing_after_the_object():
+    parser, events = _feed(json.dumps(DOCUMENT) + '{"ignored": 1}', 5, max_depth=1)
+    assert {path for path, _ in events} == {("extracted_information",), ("interview_questions",), ("group_discussion",)}
+    assert parser.feed('{"more": 2}') == []
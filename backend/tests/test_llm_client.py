@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from stub_llm import CANNED_RESULT, StubLLMServer
+
+from llm_client import AsyncLLMClient, LLMError
+
+PAYLOAD = {"messages": [{"role": "user", "content": "Resume"}]}
+
+
+def test_complete_returns_the_parsed_response():
+    async def scenario(url):
+        client = AsyncLLMClient(url, {})
+        try:
+            return await client.complete(PAYLOAD)
+        finally:
+            await client.aclose()
+
+    with StubLLMServer(latency=0) as stub:
+        result = asyncio.run(scenario(stub.url))
+    assert json.loads(result["choices"][0]["message"]["content"]) == CANNED_RESULT
+
+
+def test_in_flight_requests_are_capped():
+    async def elapsed(url, max_concurrency):
+        client = AsyncLLMClient(url, {}, max_concurrency=max_concurrency)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            await asyncio.gather(*(client.complete(PAYLOAD) for _ in range(4)))
+        finally:
+            await client.aclose()
+        return loop.time() - started
+
+    with StubLLMServer(latency=0.2) as stub:
+        assert asyncio.run(elapsed(stub.url, 1)) >= 0.75
+        assert asyncio.run(elapsed(stub.url, 4)) < 0.6
+        assert stub.requests == 8
+
+
+def test_non_200_raises_llm_error():
+    async def scenario():
+        client = AsyncLLMClient("http://llm.test/v1/chat/completions", {})
+        await client._http.aclose()
+        client._http = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(429, text="slow down")))
+        try:
+            await client.complete(PAYLOAD)
+        finally:
+            await client.aclose()
+
+    with pytest.raises(LLMError) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 429 and error.value.detail == "slow down"
@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+from stub_llm import StubLLMServer
+
+from llm_client import LLMError
+from llm_router import CircuitBreaker, LLMBackend, LLMRejected, LLMRouter
+
+PAYLOAD = {"messages": [{"role": "user", "content": "Resume:\nPython developer"}]}
+
+
+def _router(stubs, **settings):
+    backends = [LLMBackend(f"stub{index}", stub.url, {}) for index, stub in enumerate(stubs)]
+    for backend in backends:
+        backend.breaker = CircuitBreaker(threshold=settings.pop("threshold", 2), cooldown=60)
+    options = dict(attempt_timeout=5, total_budget=10, hedge_delay=0, max_attempts=3)
+    options.update(settings)
+    return LLMRouter(backends, **options)
+
+
+async def _complete(router, calls=1):
+    try:
+        return [await router.complete(PAYLOAD) for _ in range(calls)]
+    finally:
+        await router.aclose()
+
+
+def test_hedge_answers_before_a_slow_primary():
+    with StubLLMServer(latency=2.0) as slow, StubLLMServer(latency=0.01) as fast:
+        router = _router([slow, fast], hedge_delay=0.1)
+        loop_time = asyncio.run(_timed(router))
+        assert loop_time < 1.0
+        assert slow.requests == 1 and fast.requests == 1
+
+
+async def _timed(router):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await _complete(router)
+    return loop.time() - started
+
+
+def test_failed_attempt_fails_over_to_next_backend():
+    with StubLLMServer(latency=0.01, failure_rate=1.0) as broken, StubLLMServer(latency=0.01) as healthy:
+        results = asyncio.run(_complete(_router([broken, healthy]), calls=3))
+        assert len(results) == 3
+        # The breaker opened after two failures, so the third call skipped it.
+        assert broken.requests == 2 and healthy.requests == 3
+
+
+def test_all_circuits_open_is_503():
+    with StubLLMServer(latency=0.01, failure_rate=1.0) as broken:
+        router = _router([broken], max_attempts=1, threshold=1)
+
+        async def scenario():
+            with pytest.raises(LLMError) as first:
+                await router.complete(PAYLOAD)
+            with pytest.raises(LLMError) as second:
+                await router.complete(PAYLOAD)
+            await router.aclose()
+            return first.value.status_code, second.value.status_code
+
+        assert asyncio.run(scenario()) == (502, 503)
+
+
+def test_budget_exhausted_is_504():
+    with StubLLMServer(latency=2.0) as slow:
+        router = _router([slow], total_budget=0.2)
+        with pytest.raises(LLMError) as error:
+            asyncio.run(_complete(router))
+        assert error.value.status_code == 504
+
+
+def test_breaker_half_open_lets_one_trial_through(monkeypatch):
+    import llm_router
+
+    now = [100.0]
+    monkeypatch.setattr(llm_router.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] += 31
+    assert breaker.state == "half_open"
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+class _BrokenClient:
+    """Answers 200 with a body that isn't JSON, or a stream that errors."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def complete(self, payload):
+        self.calls += 1
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+    async def stream(self, payload):
+        self.calls += 1
+        yield "partial"
+        raise ValueError("bad chunk")
+
+    async def aclose(self):
+        pass
+
+
+def _half_open_backend(monkeypatch):
+    import llm_router
+
+    now = [100.0]
+    monkeypatch.setattr(llm_router.time, "monotonic", lambda: now[0])
+    backend = LLMBackend("broken", "http://unused", {})
+    backend.client = _BrokenClient()
+    backend.breaker = CircuitBreaker(threshold=1, cooldown=30)
+    backend.breaker.record_failure()
+    now[0] += 31
+    return backend, now
+
+
+def test_unexpected_error_in_half_open_trial_reopens_the_circuit(monkeypatch):
+    backend, now = _half_open_backend(monkeypatch)
+    router = LLMRouter([backend], attempt_timeout=5, total_budget=10, hedge_delay=0, max_attempts=1)
+    with pytest.raises(LLMError) as error:
+        asyncio.run(router.complete(PAYLOAD))
+    assert error.value.status_code == 502
+    assert backend.breaker.state == "open"
+    now[0] += 31
+    assert backend.breaker.allow()
+
+
+def test_stream_settles_the_trial_on_errors_and_early_close(monkeypatch):
+    backend, now = _half_open_backend(monkeypatch)
+    router = LLMRouter([backend], attempt_timeout=5, total_budget=10, hedge_delay=0, max_attempts=1)
+
+    async def consume():
+        return [delta async for delta in router.stream(PAYLOAD)]
+
+    with pytest.raises(LLMError):
+        asyncio.run(consume())
+    assert backend.breaker.state == "open"
+
+    now[0] += 31
+
+    async def close_early():
+        stream = router.stream(PAYLOAD)
+        assert await stream.__anext__() == "partial"
+        await stream.aclose()
+
+    asyncio.run(close_early())
+    assert backend.breaker.state == "half_open" and backend.breaker.allow()
+
+
+def test_rejected_requests_are_not_retried_or_counted():
+    with StubLLMServer(latency=0.01, failure_rate=1.0, failure_status=401) as rejecting, StubLLMServer(
+        latency=0.01
+    ) as healthy:
+        router = _router([rejecting, healthy], threshold=1)
+
+        async def scenario():
+            errors = []
+            try:
+                for _ in range(2):
+                    try:
+                        await router.complete(PAYLOAD)
+                    except LLMRejected as exc:
+                        errors.append(exc)
+                try:
+                    [delta async for delta in router.stream(PAYLOAD)]
+                except LLMRejected as exc:
+                    errors.append(exc)
+            finally:
+                await router.aclose()
+            return errors
+
+        errors = asyncio.run(scenario())
+        assert [(error.status_code, error.upstream_status) for error in errors] == [(500, 401)] * 3
+        assert rejecting.requests == 3 and healthy.requests == 0
+        breaker = router.backends[0].breaker
+        assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_rate_limited_requests_still_fail_over():
+    with StubLLMServer(latency=0.01, failure_rate=1.0, failure_status=429) as limited, StubLLMServer(
+        latency=0.01
+    ) as healthy:
+        router = _router([limited, healthy])
+        asyncio.run(_complete(router))
+        assert limited.requests == 1 and healthy.requests == 1
+        assert router.backends[0].breaker.failures == 1
+
+
+def test_rejected_requests_do_not_fall_back_to_canned_questions(monkeypatch):
+    from fastapi import HTTPException
+
+    import resume_router
+
+    with StubLLMServer(latency=0.01, failure_rate=1.0, failure_status=400) as rejecting:
+        router = _router([rejecting])
+        monkeypatch.setattr(resume_router, "_llm_router", lambda: router)
+        monkeypatch.setattr(resume_router, "LLM_FALLBACK_QUESTIONS", True)
+
+        async def generate():
+            try:
+                return await resume_router._generate_questions("Jane Doe\nSkills\nPython, Go\n")
+            finally:
+                await router.aclose()
+
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(generate())
+        assert error.value.status_code == 500
+        assert "rejected the request with HTTP 400" in error.value.detail
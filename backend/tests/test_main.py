@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+import main
+
+
+def test_index_creation_is_retried_then_fails_startup(monkeypatch):
+    calls = []
+
+    async def unreachable():
+        calls.append(1)
+        raise ServerSelectionTimeoutError("no servers")
+
+    monkeypatch.setattr(main, "ensure_indexes_async", unreachable)
+    monkeypatch.setattr(main, "STARTUP_INDEX_ATTEMPTS", 3)
+    monkeypatch.setattr(main, "STARTUP_INDEX_RETRY_SECONDS", 0)
+    with pytest.raises(ServerSelectionTimeoutError):
+        asyncio.run(main._ensure_indexes_at_startup())
+    assert len(calls) == 3
+
+
+def test_index_creation_recovers(monkeypatch):
+    outcomes = [ServerSelectionTimeoutError("starting"), None]
+
+    async def flaky():
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+
+    monkeypatch.setattr(main, "ensure_indexes_async", flaky)
+    monkeypatch.setattr(main, "STARTUP_INDEX_RETRY_SECONDS", 0)
+    asyncio.run(main._ensure_indexes_at_startup())
+    assert outcomes == []
@@ -0,0 +1,44 @@
+import pytest
+
+from metrics import Counter, Histogram, Registry, _Metric, stage
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests = registry.register(Counter("demo_total", "Demo counter.", ("route",)))
+    latency = registry.register(Histogram("demo_seconds", "Demo latency.", buckets=(0.1, 1.0)))
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="/a\\"b"} 3' in text
+    assert 'demo_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{le="1"} 2' in text
+    assert 'demo_seconds_bucket{le="+Inf"} 3' in text
+    assert "demo_seconds_count 3" in text
+
+
+def test_stage_records_latency_and_errors(client):
+    with pytest.raises(ValueError):
+        with stage("test.failing_stage"):
+            raise ValueError("boom")
+
+    client.get("/interview/embedding-cache")
+    text = client.get("/metrics").text
+    assert 'stage_errors_total{stage="test.failing_stage"} 1' in text
+    assert 'stage_duration_seconds_count{stage="test.failing_stage"} 1' in text
+    # The middleware labels requests by route template.
+    assert 'http_requests_total{method="GET",route="/interview/embedding-cache",status="200"}' in text
+    assert "embedding_cache_lookups_total" in text
+
+
+def test_metric_types_must_render_samples():
+    class Incomplete(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError, match="_samples"):
+        Incomplete("demo", "Incomplete metric.")
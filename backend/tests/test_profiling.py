@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+import profiling
+from profiling import ProfileSession, ProfilingMiddleware, profile_call
+
+
+class _ActiveProfiler:
+    """cProfile.Profile as on Python 3.12+ while another profiler runs."""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+
+def test_profile_call_runs_unprofiled_when_a_profiler_is_active(monkeypatch, tmp_path):
+    session = ProfileSession("p", tmp_path)
+    token = profiling._current.set(session)
+    monkeypatch.setattr(profiling.cProfile, "Profile", _ActiveProfiler)
+    try:
+        assert profile_call(sum, [1, 2, 3]) == 6
+    finally:
+        profiling._current.reset(token)
+    assert session._parts == []
+
+
+def test_middleware_writes_the_profile(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": str(profile_call(sum, range(10))).encode()})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/x", "headers": [(b"x-profile", b"1")]}
+    asyncio.run(ProfilingMiddleware(app)(scope, None, send))
+
+    profile_id = dict(sent[0]["headers"])[b"x-profile-id"].decode()
+    assert (tmp_path / f"{profile_id}.prof").exists()
+    tags = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    assert tags["status"] == 200 and tags["path"] == "/x"
+    assert not list(tmp_path.glob("*.part"))
@@ -0,0 +1,51 @@
+from prompt_budget import clean_lines, count_tokens, fit_resume_text
+
+RESUME = """Jane Doe
+jane@example.com | +1 415 555 0100
+Summary
+Backend engineer who likes distributed systems.
+Skills
+Python, Go, PostgreSQL, Kubernetes
+Experience
+Acme Corp - built payment APIs serving 2M requests a day.
+Education
+B.Tech Computer Science, 2019
+Hobbies
+Chess, hiking
+"""
+
+
+def test_clean_lines_drops_page_numbers():
+    lines, dropped = clean_lines("Skills\n  Python   Go \nPage 1 of 2\n3\n")
+    assert lines == ["Skills", "Python Go"]
+    assert dropped == 2
+
+
+def test_clean_lines_drops_running_headers_but_not_body_repeats():
+    page_one = "Jane Doe\nSkills\nPython\nExperience\nLed a team of 4\nAcme Corp\nLed a team of 4\nMore\nConfidential - page 1"
+    page_two = "Jane Doe\nProjects\nParser\nWrote tests\nWrote tests\nDone\nConfidential - page 2"
+    lines, dropped = clean_lines(page_one + "\f" + page_two + "\f")
+    assert lines.count("Jane Doe") == 1 and lines[0] == "Jane Doe"
+    assert lines.count("Confidential - page 1") == 1 and "Confidential - page 2" not in lines
+    assert lines.count("Led a team of 4") == 2 and lines.count("Wrote tests") == 2
+    assert dropped == 2
+
+    # Without page breaks (e.g. DOCX) nothing counts as a running header.
+    assert clean_lines("Python\nPython")[0] == ["Python", "Python"]
+
+
+def test_fit_within_budget_is_untouched():
+    text, stats = fit_resume_text(RESUME, budget=10_000)
+    assert not stats["truncated"]
+    assert text.splitlines()[0] == "Jane Doe"
+
+
+def test_trimming_keeps_contact_and_skills_before_hobbies():
+    padded = RESUME.replace("Hobbies\n", "Hobbies\n" + "Long hobby description line.\n" * 50)
+    text, stats = fit_resume_text(padded, budget=60)
+    assert stats["truncated"]
+    assert count_tokens(text) <= 60
+    assert "Jane Doe" in text and "Python, Go, PostgreSQL, Kubernetes" in text
+    assert "Long hobby description line." not in text
+    # Original section order is kept.
+    assert text.index("Skills") < text.index("Experience")
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import db
+import question_cache
+from question_cache import QuestionIndex
+
+PYTHON_PROFILE = {"skills": ["Python", "Django", "PostgreSQL"], "summary": "Backend developer"}
+DESIGN_PROFILE = {"skills": ["Figma", "Sketch"], "summary": "Product designer"}
+QUESTIONS = {"technical": ["Explain the Django ORM."], "hr": [], "behavioral": []}
+GD = {"topic": "Monoliths", "expected_answer": "Trade-offs"}
+
+
+def test_search_returns_the_closest_recent_profile():
+    index = QuestionIndex(max_entries=2)
+    index.add("a", np.array([1.0, 0.0, 0.0]))
+    index.add("b", np.array([0.0, 1.0, 0.0]))
+    index.add("c", np.array([0.0, 0.0, 2.0]))
+
+    assert index.search(np.array([0.0, 0.1, 1.0]))[0] == "c"
+    # "a" fell out of the capped index.
+    assert index.search(np.array([1.0, 0.0, 0.0]))[1] == 0.0
+    assert index.stats()["entries"] == 2
+    assert index.search(np.zeros(3)) is None
+
+
+def test_a_fresh_worker_loads_profiles_and_reuses_questions(monkeypatch):
+    monkeypatch.setattr(question_cache, "SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(question_cache, "SEMANTIC_CACHE_REFRESH_SECONDS", 0)
+    interviews = db.get_interviews_collection()
+    stored_id = interviews.insert_one(
+        {"created_at": datetime.utcnow() - timedelta(minutes=1), "interview_questions": QUESTIONS, "group_discussion": GD}
+    ).inserted_id
+    asyncio.run(QuestionIndex().index_profile(str(stored_id), PYTHON_PROFILE))
+
+    # Another worker only sees the profile through Mongo.
+    index = QuestionIndex()
+    hit = asyncio.run(index.lookup({**PYTHON_PROFILE, "skills": ["postgresql", "python", "django"]}))
+    assert hit["interview_id"] == str(stored_id)
+    assert hit["similarity"] > 0.99 and hit["degraded"] is False
+    assert hit["interview_questions"] == QUESTIONS and hit["group_discussion"] == GD
+
+    assert asyncio.run(index.lookup(DESIGN_PROFILE)) is None
+    assert asyncio.run(index.lookup(DESIGN_PROFILE, degraded=True)) is None
+    assert index.stats()["lookups"] == 3 and index.stats()["hits"] == 1
+
+
+def test_an_interview_is_stored_once_and_keeps_its_latest_vector():
+    index = QuestionIndex(max_entries=2)
+    index.add_many(["a", "a"], [np.array([1.0, 0.0]), np.array([0.0, 1.0])])
+    index.add("a", np.array([0.0, 3.0]))
+    assert index.stats()["entries"] == 1
+    assert index.search(np.array([0.0, 1.0])) == ("a", 1.0)
+
+    index.add("b", np.array([1.0, 0.0]))
+    index.add("c", np.array([1.0, 1.0]))
+    # "a" was overwritten by "c"; re-adding it takes a fresh row.
+    index.add("a", np.array([0.0, 1.0]))
+    assert index.stats()["entries"] == 2
+    assert index.search(np.array([1.0, 0.0]))[0] == "c"
+    assert index.search(np.array([0.0, 1.0]))[0] == "a"
+
+
+def test_refresh_picks_up_profiles_embedded_after_newer_interviews(monkeypatch):
+    monkeypatch.setattr(question_cache, "SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(question_cache, "SEMANTIC_CACHE_REFRESH_SECONDS", 0)
+    interviews = db.get_interviews_collection()
+    now = datetime.utcnow()
+    older = interviews.insert_one(
+        {"created_at": now - timedelta(minutes=5), "interview_questions": QUESTIONS, "group_discussion": GD}
+    ).inserted_id
+    newer = interviews.insert_one(
+        {"created_at": now - timedelta(minutes=1), "interview_questions": QUESTIONS, "group_discussion": GD}
+    ).inserted_id
+    writer, reader = QuestionIndex(), QuestionIndex()
+
+    asyncio.run(writer.index_profile(str(newer), DESIGN_PROFILE))
+    asyncio.run(reader.refresh())
+    assert reader.stats()["entries"] == 1
+
+    # The older interview's profile is embedded only now, e.g. by a slow
+    # background task.
+    asyncio.run(writer.index_profile(str(older), PYTHON_PROFILE))
+    asyncio.run(reader.refresh())
+    assert reader.stats()["entries"] == 2
+    assert asyncio.run(reader.lookup(PYTHON_PROFILE))["interview_id"] == str(older)
@@ -0,0 +1,176 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import db
+import resume_jobs
+from resume_jobs import DONE, FAILED, QUEUED, PermanentJobError, ResumeJobQueue
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def _job(job_id):
+    return db.get_db()[db.RESUME_JOBS].find_one({"_id": job_id})
+
+
+def test_claim_run_and_finish():
+    async def processor(data, use_cache, final_attempt):
+        return {"size": len(data), "use_cache": use_cache}
+
+    async def scenario():
+        queue = ResumeJobQueue(processor)
+        job_id = await queue.enqueue(b"resume", "cv.pdf", False)
+        job = await queue._claim()
+        assert str(job["_id"]) == job_id and job["attempts"] == 1
+        assert await queue._claim() is None
+        await queue._run(job)
+        return job["_id"]
+
+    stored = _job(_run(scenario()))
+    assert stored["status"] == DONE
+    assert stored["result"] == {"size": 6, "use_cache": False}
+    assert "file" not in stored
+
+
+def test_failures_are_retried_with_backoff_then_failed(monkeypatch):
+    monkeypatch.setattr(resume_jobs, "RESUME_JOB_MAX_ATTEMPTS", 2)
+
+    async def processor(data, use_cache, final_attempt):
+        raise RuntimeError("LLM down")
+
+    async def scenario():
+        queue = ResumeJobQueue(processor)
+        await queue.enqueue(b"resume", None, True)
+        job = await queue._claim()
+        await queue._run(job)
+        requeued = _job(job["_id"])
+        assert requeued["status"] == QUEUED and requeued["error"] == "LLM down"
+        assert requeued["next_attempt_at"] > datetime.utcnow()
+        assert await queue._claim() is None  # still backing off
+
+        db.get_db()[db.RESUME_JOBS].update_one({"_id": job["_id"]}, {"$set": {"next_attempt_at": datetime.utcnow()}})
+        job = await queue._claim()
+        assert job["attempts"] == 2
+        await queue._run(job)
+        return job["_id"]
+
+    assert _job(_run(scenario()))["status"] == FAILED
+
+
+def test_permanent_errors_are_not_retried():
+    async def processor(data, use_cache, final_attempt):
+        raise PermanentJobError("not a resume")
+
+    async def scenario():
+        queue = ResumeJobQueue(processor)
+        await queue.enqueue(b"resume", None, True)
+        job = await queue._claim()
+        await queue._run(job)
+        return job["_id"]
+
+    stored = _job(_run(scenario()))
+    assert stored["status"] == FAILED and stored["attempts"] == 1
+
+
+def test_expired_lease_is_reclaimed():
+    async def processor(data, use_cache, final_attempt):
+        return {}
+
+    async def scenario():
+        queue = ResumeJobQueue(processor)
+        await queue.enqueue(b"resume", None, True)
+        job = await queue._claim()
+        db.get_db()[db.RESUME_JOBS].update_one(
+            {"_id": job["_id"]}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        reclaimed = await queue._claim()
+        assert reclaimed["_id"] == job["_id"] and reclaimed["attempts"] == 2
+
+    _run(scenario())
+
+
+def test_lease_reclaimed_after_last_attempt_fails_the_job(monkeypatch):
+    monkeypatch.setattr(resume_jobs, "RESUME_JOB_MAX_ATTEMPTS", 1)
+    calls = []
+
+    async def processor(data, use_cache, final_attempt):
+        calls.append(data)
+        return {}
+
+    async def scenario():
+        queue = ResumeJobQueue(processor)
+        await queue.enqueue(b"resume", None, True)
+        job = await queue._claim()
+        db.get_db()[db.RESUME_JOBS].update_one(
+            {"_id": job["_id"]}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        await queue._run(await queue._claim())
+        return job["_id"]
+
+    stored = _job(_run(scenario()))
+    assert stored["status"] == FAILED and stored["error"] == "Job lease expired"
+    assert calls == [] and "file" not in stored
+
+
+def test_worker_survives_a_failed_status_write(monkeypatch):
+    monkeypatch.setattr(resume_jobs, "RESUME_JOB_POLL_SECONDS", 0.01)
+    processed = []
+
+    async def processor(data, use_cache, final_attempt):
+        processed.append(data)
+        if data == b"first":
+            return {"unencodable": object()}  # the DONE update raises
+        return {}
+
+    async def scenario():
+        queue = ResumeJobQueue(processor, workers=1)
+        await queue.enqueue(b"first", None, True)
+        second = await queue.enqueue(b"second", None, True)
+        await queue.start()
+        try:
+            for _ in range(200):
+                job = await queue.get(second)
+                if job["status"] == DONE:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await queue.stop()
+        return job
+
+    assert _run(scenario())["status"] == DONE
+    assert processed == [b"first", b"second"]
+
+
+def test_llm_outages_are_retried_before_fallback_questions(monkeypatch):
+    # Default configuration: fallback questions on, and HF_API_URL points
+    # at a closed port, so every LLM call fails.
+    from pathlib import Path
+
+    import extraction
+    import resume_router
+
+    assert resume_router.LLM_FALLBACK_QUESTIONS
+    monkeypatch.setattr(resume_jobs, "RESUME_JOB_MAX_ATTEMPTS", 2)
+    pdf = (Path(__file__).resolve().parents[2] / "test" / "cv_kalki.pdf").read_bytes()
+
+    async def scenario():
+        queue = ResumeJobQueue(resume_router._run_resume_job)
+        await queue.enqueue(pdf, "cv.pdf", False)
+        job = await queue._claim()
+        await queue._run(job)
+        first = _job(job["_id"])
+
+        db.get_db()[db.RESUME_JOBS].update_one({"_id": job["_id"]}, {"$set": {"next_attempt_at": datetime.utcnow()}})
+        await queue._run(await queue._claim())
+        return first, _job(job["_id"])
+
+    try:
+        first, last = _run(scenario())
+    finally:
+        extraction.shutdown_extraction_pool()
+
+    assert first["status"] == QUEUED and "LLM" in first["error"]
+    assert db.get_db()[db.INTERVIEWS].count_documents({}) == 1
+    assert last["status"] == DONE
+    assert last["result"]["parse_error"] == resume_router.LLM_UNAVAILABLE_ERROR
@@ -0,0 +1,24 @@
+from resume_parser import is_reliable, parse_resume
+
+RESUME = """Jane Doe
+jane@example.com | +1 415 555 0100
+Summary
+Backend engineer who likes distributed systems.
+Skills
+Python, Go, PostgreSQL, Kubernetes
+Experience
+Acme Corp - built payment APIs serving 2M requests a day.
+Education
+B.Tech Computer Science, 2019
+Hobbies
+Chess, hiking
+"""
+
+
+def test_parse_resume_sections_and_contact():
+    info = parse_resume(RESUME)
+    assert info["name"] == "Jane Doe"
+    assert info["email"] == "jane@example.com"
+    assert info["skills"] == ["Python", "Go", "PostgreSQL", "Kubernetes"]
+    assert info["work_experience"].startswith("Acme Corp")
+    assert is_reliable(info)
@@ -0,0 +1,75 @@
+import asyncio
+
+from artifacts import INTERVIEW_RAW_FIELDS, prepare_offload, save_artifacts
+import db
+
+
+def _store_interview():
+    document = {"extracted_information": {"name": "Jane"}, "resume_text": "Jane Doe, 555 0100", "llm_raw_output": "{}"}
+    hot, artifact = prepare_offload(document, db.INTERVIEWS, INTERVIEW_RAW_FIELDS)
+    asyncio.run(save_artifacts([artifact]))
+    return str(db.get_db()[db.INTERVIEWS].insert_one(hot).inserted_id)
+
+
+def test_raw_fields_need_an_admin(client, admin_headers):
+    interview_id = _store_interview()
+    url = f"/analyze-resume/interviews/{interview_id}"
+
+    public = client.get(url)
+    assert public.status_code == 200 and "resume_text" not in public.json()
+    assert client.get(url, params={"include_raw": True}).status_code == 401
+    bad_token = {"Authorization": "Bearer nope"}
+    assert client.get(url, params={"include_raw": True}, headers=bad_token).status_code == 401
+
+    raw = client.get(url, params={"include_raw": True}, headers=admin_headers).json()
+    assert raw["resume_text"] == "Jane Doe, 555 0100"
+
+
+def test_stream_reports_unexpected_errors_as_an_event(client, monkeypatch):
+    import resume_router
+
+    async def broken_extract(data):
+        raise RuntimeError("pool crashed")
+
+    monkeypatch.setattr(resume_router, "_extract_text", broken_extract)
+    response = client.post(
+        "/analyze-resume/stream", params={"no_cache": True}, files={"file": ("cv.pdf", b"%PDF-1.4", "application/pdf")}
+    )
+    assert response.status_code == 200
+    assert "event: error" in response.text
+    assert '"status_code": 500' in response.text and "pool crashed" in response.text
+
+
+def test_results_with_fallback_questions_are_not_replayed():
+    import json
+
+    import resume_router
+
+    complete = json.dumps(
+        {
+            "interview_questions": {"technical": ["Q1"], "hr": ["Q2"], "behavioral": ["Q3"]},
+            "group_discussion": {"topic": "Remote work", "expected_answer": "Both sides"},
+        }
+    )
+    # Parses fine, but the LLM left out the behavioral questions.
+    partial = json.dumps({"interview_questions": {"technical": ["Q1"], "hr": ["Q2"]}, "group_discussion": "AI"})
+
+    async def scenario():
+        resume_router._result_cache.clear()
+        partial_response = await resume_router._save_analysis("Jane Doe\nPython", partial, "partial-key")
+        resume_router._result_cache.clear()
+        complete_response = await resume_router._save_analysis("Jane Doe\nPython", complete, "complete-key")
+        resume_router._result_cache.clear()
+        return (
+            partial_response,
+            await resume_router._get_cached_analysis("partial-key"),
+            complete_response,
+            await resume_router._get_cached_analysis("complete-key"),
+        )
+
+    partial_response, partial_hit, complete_response, complete_hit = asyncio.run(scenario())
+    assert partial_response["parse_error"] is None and partial_hit is None
+    stored = db.get_db()[db.INTERVIEWS].find_one({"cache_key": "partial-key"})
+    assert stored["degraded"] and stored["fallback_sections"] == ["behavioral"]
+    # A hit hands back the earlier upload's interview.
+    assert complete_hit["interview_id"] == complete_response["interview_id"]
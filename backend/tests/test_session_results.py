@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import db
+from session_results import decode_cursor, encode_cursor, session_query
+
+
+def test_cursor_round_trip():
+    document = {"_id": ObjectId(), "created_at": datetime(2026, 1, 2, 3, 4, 5, 678000)}
+    assert decode_cursor(encode_cursor(document)) == (document["created_at"], document["_id"])
+
+
+@pytest.mark.parametrize("cursor", ["junk", "", "eyJ0IjogMX0"])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_query_after_cursor_breaks_ties_on_id():
+    created, last_id = datetime(2026, 1, 1), ObjectId()
+    query = session_query("a@b.co", "gd", after=(created, last_id))
+    assert query["candidate_email"] == "a@b.co" and query["session_mode"] == "gd"
+    assert query["$or"] == [{"created_at": {"$lt": created}}, {"created_at": created, "_id": {"$lt": last_id}}]
+
+
+def _complete(client, email, mode="interview"):
+    payload = {
+        "session_mode": mode,
+        "candidate_email": email,
+        "answers": [{"question": "What is Python?", "expected_answer": "A programming language", "answer_text": "A language"}],
+        "face_metrics": {"confidence_level": "High", "nervousness_level": "Low", "confidence_score": 80, "nervousness_score": 10},
+    }
+    assert client.post("/interview/session/complete", json=payload).status_code == 200
+
+
+def test_listing_pages_through_every_session_once(client, admin_headers):
+    for index in range(7):
+        _complete(client, f"c{index % 2}@example.com", "gd" if index % 3 == 0 else "interview")
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/admin/sessions", params=params, headers=admin_headers).json()
+        seen += [session["session_id"] for session in page["sessions"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 7
+    assert seen == sorted(seen, reverse=True)
+
+    by_candidate = client.get("/admin/sessions", params={"candidate_email": "c1@example.com"}, headers=admin_headers)
+    assert len(by_candidate.json()["sessions"]) == 3
+    future = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+    assert client.get("/admin/sessions", params={"date_from": future}, headers=admin_headers).json()["sessions"] == []
+    assert client.get("/admin/sessions").status_code in (401, 403)
+
+
+def test_rollups_follow_completed_sessions(client, admin_headers):
+    for mode in ("gd", "interview", "interview"):
+        _complete(client, "c@example.com", mode)
+    rollups = client.get("/admin/sessions/rollups", params={"group_by": "mode"}, headers=admin_headers).json()
+    assert {row["mode"]: row["sessions"] for row in rollups["rollups"]} == {"gd": 1, "interview": 2}
+    assert rollups["total"]["sessions"] == 3
+    assert rollups["total"]["confidence_level"] == {"High": 3}
+
+
+def test_drafts_are_listed_only_on_request_and_not_rolled_up(client, admin_headers):
+    from rebuild_session_rollups import rebuild
+
+    _complete(client, "done@example.com")
+    draft_id = client.post("/interview/session/start", json={"candidate_email": "draft@example.com"}).json()["session_id"]
+    # A session stored before sessions had a status.
+    db.get_interview_sessions_collection().insert_one({"created_at": datetime.utcnow(), "summary": {}})
+
+    listed = client.get("/admin/sessions", headers=admin_headers).json()["sessions"]
+    assert len(listed) == 2 and draft_id not in {session["session_id"] for session in listed}
+    drafts = client.get("/admin/sessions", params={"status": "in_progress"}, headers=admin_headers).json()["sessions"]
+    assert [session["session_id"] for session in drafts] == [draft_id]
+
+    assert rebuild()["sessions"] == 2
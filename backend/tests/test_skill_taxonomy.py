@@ -0,0 +1,35 @@
+from skill_taxonomy import SkillMatcher, get_skill_matcher
+
+ENTRIES = [
+    {"name": "Spring", "category": "backend"},
+    {"name": "Spring Boot", "category": "backend", "aliases": ["springboot"]},
+    {"name": "Go", "category": "language", "exact": ["Go", "Golang"], "aliases": ["golang"]},
+    {"name": "Machine Learning", "category": "ml", "aliases": ["ML"]},
+]
+
+
+def test_leftmost_longest_on_word_boundaries():
+    matcher = SkillMatcher(ENTRIES)
+    matches = matcher.find_all("Built Spring  Boot services; springs and Springfield don't count.")
+    assert [match.skill for match in matches] == ["Spring Boot"]
+    assert matches[0].start == 6 and matches[0].end == 18
+
+
+def test_exact_forms_are_case_sensitive():
+    matcher = SkillMatcher(ENTRIES)
+    assert matcher.detect("I go to work. Wrote Go and golang tools.") == ["Go"]
+    assert matcher.counts("I go to work. Wrote Go and golang tools.")["Go"] == 2
+
+
+def test_detect_orders_by_count_then_first_mention():
+    matcher = SkillMatcher(ENTRIES)
+    text = "machine learning with Spring, ML pipelines, Spring again, Go"
+    assert matcher.detect(text) == ["Machine Learning", "Spring", "Go"]
+    assert matcher.detect(text, limit=1) == ["Machine Learning"]
+    assert matcher.category("spring boot") == "backend"
+
+
+def test_shipped_taxonomy_loads():
+    matcher = get_skill_matcher()
+    assert len(matcher) > 100
+    assert "Python" in matcher.detect("Python, Docker and Kubernetes on AWS")
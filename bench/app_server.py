@@ -0,0 +1,29 @@
+"""Run backend/main.py under uvicorn for benchmarks.
+
+Meant to be started by bench/e2e.py with MONGO_URI=mongomock://,
+HF_API_URL pointing at a stub and EMBEDDING_BACKEND=hash, so answer
+scoring is exercised without downloading a model.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    from main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""End-to-end HTTP benchmark of the FastAPI app.
+
+Boots backend/main.py under uvicorn (via bench/app_server.py) against the
+stub LLM from bench/stub_llm.py and an in-memory Mongo (mongomock), then
+drives each scenario at several concurrency levels and reports
+throughput and p50/p95/p99 latency. Results are written as JSON so runs
+from different commits can be compared.
+
+    python bench/e2e.py
+    python bench/e2e.py --levels 1 16 64 --requests 200 --llm-latency 0.3
+    python bench/e2e.py --scenarios auth_details session_complete --compare bench/results/old.json
+
+Needs the dev requirements (mongomock-motor) and uvicorn. Answer scoring
+uses a hashing embedder unless --embedding-backend is given.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+SAMPLE_RESUME = REPO_DIR / "test" / "cv_kalki.pdf"
+QA_PAIRS = BENCH_DIR / "data" / "qa_pairs.json"
+RESULTS_DIR = BENCH_DIR / "results"
+
+ADMIN = {
+    "first_name": "Bench",
+    "last_name": "Admin",
+    "profession": "Recruiter",
+    "email": "bench-admin@example.com",
+    "password": "bench-password",
+    "confirm_password": "bench-password",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _wait_for(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args[1]} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+class Services:
+    """Stub LLM and app server, each in its own process so neither competes
+    with the load generator for the GIL."""
+
+    def __init__(self, args):
+        self.args = args
+        self.processes = []
+        self.base_url = ""
+
+    def __enter__(self):
+        llm_port, app_port = _free_port(), _free_port()
+        llm = subprocess.Popen(
+            [sys.executable, str(BENCH_DIR / "stub_llm.py"), "--port", str(llm_port), "--latency", str(self.args.llm_latency)],
+            stdout=subprocess.DEVNULL,
+        )
+        self.processes.append(llm)
+        _wait_for(f"http://127.0.0.1:{llm_port}/", llm)
+
+        env = {
+            **os.environ,
+            "MONGO_URI": "mongomock://",
+            "HF_API_KEY": "bench",
+            "HF_API_URL": f"http://127.0.0.1:{llm_port}/v1/chat/completions",
+            "EMBEDDING_BACKEND": self.args.embedding_backend,
+            "LLM_MAX_CONCURRENCY": str(max(self.args.levels)),
+        }
+        app = subprocess.Popen(
+            [sys.executable, str(BENCH_DIR / "app_server.py"), "--port", str(app_port)],
+            env=env,
+        )
+        self.processes.append(app)
+        self.base_url = f"http://127.0.0.1:{app_port}"
+        _wait_for(f"{self.base_url}/health", app)
+        return self
+
+    def __exit__(self, *exc):
+        for process in reversed(self.processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+# -----------------------------------
+# Scenarios
+# -----------------------------------
+async def _setup(client: httpx.AsyncClient) -> dict:
+    await client.post("/auth/admin/register", json=ADMIN)
+    response = await client.post("/auth/admin/login", json={"email": ADMIN["email"], "password": ADMIN["password"]})
+    response.raise_for_status()
+    token = response.json()["token"]
+
+    resume = SAMPLE_RESUME.read_bytes()
+    response = await client.post("/analyze-resume/", files={"file": ("resume.pdf", resume, "application/pdf")})
+    response.raise_for_status()
+
+    answers = [{**pair, "category": "technical"} for pair in json.loads(QA_PAIRS.read_text())][:10]
+    return {
+        "token": token,
+        "resume": resume,
+        "interview_id": response.json()["interview_id"],
+        "answers": answers,
+        "counter": itertools.count(),
+    }
+
+
+def _session_payload(state: dict) -> dict:
+    return {
+        "session_mode": "interview",
+        "interview_id": state["interview_id"],
+        "candidate_email": "candidate@example.com",
+        "candidate_name": "Bench Candidate",
+        "answers": state["answers"],
+        "face_metrics": {
+            "confidence_level": "High",
+            "nervousness_level": "Low",
+            "confidence_score": 80,
+            "nervousness_score": 20,
+        },
+    }
+
+
+SCENARIOS = {
+    "analyze_resume": lambda c, s: c.post(
+        "/analyze-resume/", params={"no_cache": "true"}, files={"file": ("resume.pdf", s["resume"], "application/pdf")}
+    ),
+    "analyze_resume_cached": lambda c, s: c.post(
+        "/analyze-resume/", files={"file": ("resume.pdf", s["resume"], "application/pdf")}
+    ),
+    "session_complete": lambda c, s: c.post("/interview/session/complete", json=_session_payload(s)),
+    "auth_register": lambda c, s: c.post(
+        "/auth/admin/register", json={**ADMIN, "email": f"bench-{next(s['counter'])}@example.com"}
+    ),
+    "auth_login": lambda c, s: c.post(
+        "/auth/admin/login", json={"email": ADMIN["email"], "password": ADMIN["password"]}
+    ),
+    "auth_details": lambda c, s: c.get("/auth/admin/details", headers={"Authorization": f"Bearer {s['token']}"}),
+    "auth_protected": lambda c, s: c.get("/auth/admin/protected", headers={"Authorization": f"Bearer {s['token']}"}),
+}
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def _measure(client, state, scenario: str, concurrency: int, total: int, warmup: int) -> dict:
+    send = SCENARIOS[scenario]
+    for _ in range(warmup):
+        await send(client, state)
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await send(client, state)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+async def _run(args, base_url: str) -> list:
+    limits = httpx.Limits(max_connections=max(args.levels), max_keepalive_connections=max(args.levels))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300.0) as client:
+        state = await _setup(client)
+        results = []
+        for scenario in args.scenarios:
+            for level in args.levels:
+                result = await _measure(client, state, scenario, level, args.requests, args.warmup)
+                results.append(result)
+                print(
+                    f"{scenario:<24}{level:>6}{result['throughput_rps']:>10}{result['p50_ms']:>10}"
+                    f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['errors']:>8}",
+                    flush=True,
+                )
+        return results
+
+
+def _compare(results: list, baseline_path: str) -> None:
+    baseline = {(r["scenario"], r["concurrency"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    print(f"\nvs {baseline_path}")
+    print(f"{'scenario':<24}{'conc':>6}{'rps %':>10}{'p95 %':>10}")
+    for result in results:
+        old = baseline.get((result["scenario"], result["concurrency"]))
+        if not old:
+            continue
+        rps = (result["throughput_rps"] / old["throughput_rps"] - 1) * 100 if old["throughput_rps"] else 0.0
+        p95 = (result["p95_ms"] / old["p95_ms"] - 1) * 100 if old["p95_ms"] else 0.0
+        print(f"{result['scenario']:<24}{result['concurrency']:>6}{rps:>+10.1f}{p95:>+10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario and level")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests before each run")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM response delay in seconds")
+    parser.add_argument("--embedding-backend", default="hash", help="EMBEDDING_BACKEND for the app (default: hash)")
+    parser.add_argument("--output", help="Results file (default: bench/results/e2e-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    print(f"{'scenario':<24}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    with Services(args) as services:
+        results = asyncio.run(_run(args, services.base_url))
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "levels": args.levels,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "llm_latency": args.llm_latency,
+            "embedding_backend": args.embedding_backend,
+        },
+        "results": results,
+    }
+    if args.output:
+        output = Path(args.output)
+    else:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"e2e-{commit}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Compare embedding backends for answer scoring.
+
+Each backend runs in its own subprocess so resident memory is measured in
+isolation. For every backend the script reports model load time, encode
+latency for the fixed Q/A corpus in bench/data/qa_pairs.json, peak RSS and
+how closely its ``question_scores`` track the first (reference) backend.
+
+    python bench/embedding_backends.py
+    python bench/embedding_backends.py --backends torch torch-int8 onnx \\
+        --small-model sentence-transformers/all-MiniLM-L6-v2
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent / "backend"
+CORPUS_PATH = BENCH_DIR / "data" / "qa_pairs.json"
+DEFAULT_MODEL = "sentence-transformers/all-mpnet-base-v2"
+
+
+def _worker(repeats: int) -> None:
+    # Configuration comes from EMBEDDING_BACKEND / EMBEDDING_MODEL.
+    os.environ["EMBED_BATCHING_ENABLED"] = "0"
+    os.environ["EMBEDDING_CACHE_MAX_BYTES"] = "0"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    import embeddings
+    from interview_router import QuestionAnswer, _score_answers_batch
+
+    answers = [QuestionAnswer(**pair) for pair in json.loads(CORPUS_PATH.read_text())]
+
+    started = time.perf_counter()
+    embeddings.get_embedding_backend()
+    load_seconds = time.perf_counter() - started
+    _score_answers_batch(answers[:2])
+
+    timings = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = _score_answers_batch(answers)
+        timings.append(time.perf_counter() - started)
+
+    print(
+        json.dumps(
+            {
+                "load_seconds": round(load_seconds, 3),
+                "latency_ms_p50": round(statistics.median(timings) * 1000, 2),
+                "latency_ms_min": round(min(timings) * 1000, 2),
+                "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                "question_scores": result["question_scores"],
+            }
+        )
+    )
+
+
+def _pearson(xs, ys) -> float:
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    var_y = sum((y - mean_y) ** 2 for y in ys)
+    return cov / (var_x * var_y) ** 0.5 if var_x and var_y else 0.0
+
+
+def _run(backend: str, model: str, repeats: int) -> dict:
+    env = {**os.environ, "EMBEDDING_BACKEND": backend, "EMBEDDING_MODEL": model}
+    completed = subprocess.run(
+        [sys.executable, __file__, "--worker", "--repeats", str(repeats)],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx"])
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--small-model", help="Also run the torch backend with this (smaller) model")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Write the full results as JSON to this path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.repeats)
+        return
+
+    runs = [(backend, args.model) for backend in args.backends]
+    if args.small_model:
+        runs.append(("torch", args.small_model))
+
+    results = []
+    reference = None
+    for backend, model in runs:
+        result = {"backend": backend, "model": model, **_run(backend, model, args.repeats)}
+        if "question_scores" in result:
+            if reference is None:
+                reference = result["question_scores"]
+            diffs = [abs(a - b) for a, b in zip(result["question_scores"], reference)]
+            result["score_correlation"] = round(_pearson(result["question_scores"], reference), 4)
+            result["score_mean_abs_diff"] = round(statistics.fmean(diffs), 3)
+        results.append(result)
+
+    header = f"{'backend':<12}{'model':<45}{'load s':>8}{'p50 ms':>9}{'RSS MB':>9}{'corr':>8}{'|diff|':>8}"
+    print(header)
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<12}{r['model']:<45}  error: {r['error']}")
+            continue
+        print(
+            f"{r['backend']:<12}{r['model']:<45}{r['load_seconds']:>8}{r['latency_ms_p50']:>9}"
+            f"{r['max_rss_mb']:>9}{r['score_correlation']:>8}{r['score_mean_abs_diff']:>8}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
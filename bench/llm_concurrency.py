@@ -0,0 +1,71 @@
+"""Throughput of the LLM stage of /analyze-resume/ under concurrent uploads.
+
+Compares a blocking request per upload (as the handler used to make it on
+the event loop) with the pooled ``call_llm_async`` client against a local
+stub.
+
+    python bench/llm_concurrency.py --latency 0.5 --requests 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from stub_llm import StubLLMServer  # noqa: E402
+
+
+def call_llm_blocking(resume_router, prompt: str) -> str:
+    """The old synchronous baseline: one unpooled request, no retries."""
+    response = httpx.post(
+        resume_router.HF_API_URL, headers=resume_router.HEADERS, json=resume_router._llm_payload(prompt), timeout=120
+    )
+    response.raise_for_status()
+    return resume_router._completion_text(response.json())
+
+
+async def _run(handler, total: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await handler("Resume:\nPython developer")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def main(args):
+    with StubLLMServer(latency=args.latency) as stub:
+        os.environ["HF_API_URL"] = stub.url
+        os.environ.setdefault("HF_API_KEY", "bench")
+        os.environ.setdefault("LLM_MAX_CONCURRENCY", str(max(args.levels)))
+
+        import resume_router
+        from llm_router import close_llm_router
+
+        async def blocking(prompt):
+            return call_llm_blocking(resume_router, prompt)
+
+        print(f"{'path':<8}{'concurrency':>12}{'requests':>10}{'seconds':>10}{'req/s':>10}")
+        for name, handler in (("sync", blocking), ("async", resume_router.call_llm_async)):
+            for level in args.levels:
+                elapsed = await _run(handler, args.requests, level)
+                print(f"{name:<8}{level:>12}{args.requests:>10}{elapsed:>10.2f}{args.requests / elapsed:>10.2f}")
+        await close_llm_router()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub response delay in seconds")
+    parser.add_argument("--requests", type=int, default=64, help="Uploads per concurrency level")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""Tail latency and failure handling of the LLM router against local stubs.
+
+Each scenario starts stub backends with injected tail latency and/or
+failures, sends the same stream of completions through an ``LLMRouter``
+and reports latency percentiles, failed calls (which the app would answer
+with fallback questions) and how many requests each stub received.
+
+    python bench/llm_routing.py --requests 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from llm_client import LLMError  # noqa: E402
+from llm_router import CircuitBreaker, LLMBackend, LLMRouter  # noqa: E402
+from stub_llm import StubLLMServer  # noqa: E402
+
+# name -> (stub settings per backend, router settings). Latencies are in
+# seconds and kept small so the whole run takes well under a minute.
+SCENARIOS = {
+    "single": (
+        [dict(latency=0.05, tail_rate=0.1, tail_latency=1.0)],
+        dict(hedge_delay=0),
+    ),
+    "single_hedged": (
+        [dict(latency=0.05, tail_rate=0.1, tail_latency=1.0)],
+        dict(hedge_delay=0.15),
+    ),
+    "two_hedged": (
+        [dict(latency=0.05, tail_rate=0.1, tail_latency=1.0), dict(latency=0.08)],
+        dict(hedge_delay=0.15),
+    ),
+    "failover": (
+        [dict(latency=0.05, failure_rate=0.3), dict(latency=0.08)],
+        dict(hedge_delay=0),
+    ),
+    "primary_down": (
+        [dict(latency=0.01, failure_rate=1.0), dict(latency=0.08)],
+        dict(hedge_delay=0),
+    ),
+    "budget_exhausted": (
+        [dict(latency=2.0), dict(latency=2.0)],
+        dict(hedge_delay=0.1, total_budget=0.5),
+    ),
+}
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(name: str, total: int, concurrency: int) -> dict:
+    stub_settings, router_settings = SCENARIOS[name]
+    with ExitStack() as stack:
+        stubs = [stack.enter_context(StubLLMServer(seed=index, **settings)) for index, settings in enumerate(stub_settings)]
+        backends = [LLMBackend(f"stub{index}", stub.url, {}) for index, stub in enumerate(stubs)]
+        for backend in backends:
+            backend.breaker = CircuitBreaker(threshold=5, cooldown=60)
+        router = LLMRouter(
+            backends,
+            attempt_timeout=router_settings.get("attempt_timeout", 5),
+            total_budget=router_settings.get("total_budget", 10),
+            hedge_delay=router_settings["hedge_delay"],
+            max_attempts=router_settings.get("max_attempts", 3),
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        failed = 0
+
+        async def one():
+            nonlocal failed
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    await router.complete({"messages": [{"role": "user", "content": "Resume:\nPython developer"}]})
+                except LLMError:
+                    failed += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(one() for _ in range(total)))
+        await router.aclose()
+
+        return {
+            "scenario": name,
+            "ok": total - failed,
+            "failed": failed,
+            "p50": statistics.median(latencies),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": max(latencies),
+            "upstream": [stub.requests for stub in stubs],
+        }
+
+
+async def main(args):
+    print(f"{'scenario':<18}{'ok':>6}{'failed':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  upstream requests")
+    for name in args.scenarios:
+        result = await run_scenario(name, args.requests, args.concurrency)
+        print(
+            f"{name:<18}{result['ok']:>6}{result['failed']:>8}"
+            f"{result['p50']:>8.3f}{result['p95']:>8.3f}{result['p99']:>8.3f}{result['max']:>8.3f}"
+            f"  {result['upstream']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Completions per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,181 @@
+"""Local stand-in for the HuggingFace chat-completions API.
+
+Serves a canned completion after a configurable delay so benchmarks can
+exercise the LLM path without network access or API keys. A share of
+requests can be made to fail or to take a much longer "tail" delay.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_RESULT = {
+    "extracted_information": {
+        "name": "Stub Candidate",
+        "email": "stub@example.com",
+        "phone": "",
+        "summary": "Backend developer.",
+        "skills": ["Python", "FastAPI", "MongoDB"],
+        "education": "",
+        "projects": "",
+        "internships": "",
+        "work_experience": "",
+        "strengths": "",
+        "hobbies": "",
+    },
+    "interview_questions": {
+        "technical": [
+            "What is a Python decorator?",
+            "How does FastAPI handle request validation?",
+            "What is an index in MongoDB?",
+            "What is the difference between a list and a tuple?",
+            "How do you write a unit test?",
+        ],
+        "hr": [
+            "Tell me about yourself.",
+            "Why do you want this role?",
+            "Where do you see yourself in five years?",
+        ],
+        "behavioral": [
+            "Describe a time you worked in a team.",
+            "Tell me about a mistake you learned from.",
+        ],
+    },
+    "group_discussion": {
+        "topic": "Should remote work become the default?",
+        "expected_answer": "Discuss productivity, collaboration, work-life balance and fairness.",
+    },
+}
+
+
+class StubLLMServer:
+    def __init__(
+        self,
+        latency: float = 0.5,
+        content: str = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        tail_rate: float = 0.0,
+        tail_latency: float = 0.0,
+        seed: int = None,
+    ):
+        self.latency = latency
+        self.content = content if content is not None else json.dumps(CANNED_RESULT)
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = 65536
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.requests += 1
+                    failing = server._random.random() < server.failure_rate
+                    slow = server._random.random() < server.tail_rate
+                latency = server.tail_latency if slow else server.latency
+                if failing:
+                    with server._lock:
+                        server.failures += 1
+                    time.sleep(latency)
+                    self._error()
+                    return
+                if request.get("stream"):
+                    self._stream(latency)
+                    return
+                time.sleep(latency)
+                body = json.dumps(
+                    {"choices": [{"message": {"role": "assistant", "content": server.content}}]}
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self):
+                body = json.dumps({"error": "injected failure"}).encode("utf-8")
+                self.send_response(server.failure_status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, latency: float, pieces: int = 40):
+                # Spread the latency over the deltas, like a token stream.
+                content = server.content
+                step = max(1, -(-len(content) // pieces))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for start in range(0, len(content), step):
+                    time.sleep(latency / pieces)
+                    chunk = {"choices": [{"delta": {"content": content[start:start + step]}}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        # The default backlog of 5 drops connection bursts (1s SYN retry).
+        ThreadingHTTPServer.request_queue_size = 128
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument("--failure-status", type=int, default=503)
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of requests delayed by --tail-latency")
+    parser.add_argument("--tail-latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubLLMServer(
+        latency=args.latency,
+        port=args.port,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_latency,
+    ) as stub:
+        print(f"Stub LLM listening on {stub.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
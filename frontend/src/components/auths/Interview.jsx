@@ -112,6 +112,7 @@ export default function Interview() {
   const activeDeviceLabelRef = useRef("");
   const countdownRef = useRef(null);
   const forceSubmittedRef = useRef(false);
+  const sessionIdRef = useRef(null);
 
   const [sessionStarted, setSessionStarted] = useState(false);
   const [currentIndex, setCurrentIndex] = useState(0);
@@ -679,6 +680,33 @@ export default function Interview() {
     forceSubmittedRef.current = false;
   };
 
+  const sessionInfo = () => ({
+    session_mode: sessionMode,
+    interview_id: interviewData?.interview_id || null,
+    candidate_email: extracted.email || localStorage.getItem("admin_email") || "",
+    candidate_name: extracted.name || "",
+  });
+
+  const beginServerSession = () => {
+    // Answers are scored on the server as they are submitted. Without a
+    // session id everything is sent in one request at the end instead.
+    sessionIdRef.current = null;
+    api
+      .post("/interview/session/start", sessionInfo())
+      .then((res) => {
+        sessionIdRef.current = res.data.session_id;
+      })
+      .catch(() => {
+        sessionIdRef.current = null;
+      });
+  };
+
+  const submitAnswer = (index, answer) => {
+    if (!sessionIdRef.current) return;
+    // Fire and forget: completion scores any answer that did not arrive.
+    api.post(`/interview/session/${sessionIdRef.current}/answers`, { index, answer }).catch(() => {});
+  };
+
   const startSession = async () => {
     setError("");
     setNextModePrompt(false);
@@ -696,6 +724,7 @@ export default function Interview() {
     }
 
     await startMic();
+    beginServerSession();
   };
 
   const saveCurrentAnswer = () => {
@@ -722,6 +751,9 @@ export default function Interview() {
       duration_seconds: Number(durationSeconds.toFixed(2)),
     };
     setAnswers(nextAnswers);
+    if (answerText) {
+      submitAnswer(currentIndex, nextAnswers[currentIndex]);
+    }
     return nextAnswers;
   };
 
@@ -794,6 +826,7 @@ export default function Interview() {
     setError("");
     setNextModePrompt(false);
     setTimeLeftSeconds(nextModeTimer * 60);
+    sessionIdRef.current = null;
     resetMetricsAndTracking();
   };
 
@@ -826,9 +859,7 @@ export default function Interview() {
     const nervousnessScore = clamp(movementScore * 55 + fillerRatio * 45, 0, 100);
 
     const payload = {
-      session_mode: sessionMode,
-      candidate_email: extracted.email || localStorage.getItem("admin_email") || "",
-      candidate_name: extracted.name || "",
+      ...sessionInfo(),
       answers: finalAnswers,
       face_metrics: {
         confidence_level: toLevel(confidenceScore),
@@ -842,7 +873,14 @@ export default function Interview() {
     };
 
     try {
-      const res = await api.post("/interview/session/complete", payload);
+      const sessionId = sessionIdRef.current;
+      const res = sessionId
+        ? await api.post(`/interview/session/${sessionId}/complete`, {
+            answers: payload.answers,
+            face_metrics: payload.face_metrics,
+          })
+        : await api.post("/interview/session/complete", payload);
+      sessionIdRef.current = null;
       const resultData = {
         ...res.data,
         payload,
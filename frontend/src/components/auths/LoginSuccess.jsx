@@ -24,6 +24,7 @@ export default function LoginSuccess() {
   const [analyzing, setAnalyzing] = useState(false);
   const [analyzeStep, setAnalyzeStep] = useState("");
   const [analyzeResult, setAnalyzeResult] = useState(null);
+  const [partialQuestions, setPartialQuestions] = useState({});
   const [selectedTimer, setSelectedTimer] = useState("5");
   const [adminName, setAdminName] = useState("");
   const [helloMessage, setHelloMessage] = useState("Welcome to your AI interview studio.");
@@ -89,6 +90,7 @@ export default function LoginSuccess() {
 
     setError("");
     setAnalyzeResult(null);
+    setPartialQuestions({});
     setAnalyzing(true);
 
     const steps = [
@@ -110,12 +112,27 @@ export default function LoginSuccess() {
     try {
       const formData = new FormData();
       formData.append("file", resumeFile);
-      const res = await api.upload("/analyze-resume/", formData);
+      const streamSteps = {
+        extracted_information: "Profile extracted",
+        group_discussion: "GD topic ready",
+      };
+      const res = await api.uploadStream("/analyze-resume/stream", formData, (event, data) => {
+        clearInterval(timer);
+        if (event === "questions") {
+          setAnalyzeStep(`${data.category} questions ready`);
+          setPartialQuestions((current) => ({ ...current, [data.category]: data.questions }));
+        } else if (streamSteps[event]) {
+          setAnalyzeStep(streamSteps[event]);
+        }
+      });
+      // The final result replaces whatever partial questions were shown.
+      setPartialQuestions({});
       setAnalyzeResult(res.data);
       localStorage.setItem("interview_payload", JSON.stringify(res.data));
       localStorage.removeItem("session_results");
       localStorage.removeItem("interview_result");
     } catch (err) {
+      setPartialQuestions({});
       const detail = err?.response?.data?.detail;
       setError(typeof detail === "string" ? detail : "Resume analysis failed.");
     } finally {
@@ -125,6 +142,11 @@ export default function LoginSuccess() {
     }
   };
 
+  const previewQuestions = analyzeResult?.interview_questions || partialQuestions;
+  const previewCategories = Object.entries(previewQuestions || {}).filter(
+    ([, questions]) => Array.isArray(questions) && questions.length
+  );
+
   const startInterview = () => {
     localStorage.setItem("session_mode", "interview");
     localStorage.setItem("session_timer_minutes", selectedTimer);
@@ -253,6 +275,21 @@ export default function LoginSuccess() {
             </div>
           )}
 
+          {previewCategories.length > 0 && (
+            <div className="question-preview">
+              {previewCategories.map(([category, questions]) => (
+                <div key={category} className="question-group">
+                  <p className="question-category">{category}</p>
+                  <ol>
+                    {questions.map((question, index) => (
+                      <li key={index}>{question}</li>
+                    ))}
+                  </ol>
+                </div>
+              ))}
+            </div>
+          )}
+
           {error && <div className="home-error">{error}</div>}
 
           {analyzeResult && (
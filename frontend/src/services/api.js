@@ -27,6 +27,67 @@ async function request(path, options = {}) {
   return { data, status: response.status };
 }
 
+function parseEventBlock(block) {
+  let event = "message";
+  const dataLines = [];
+  block.split("\n").forEach((line) => {
+    if (line.startsWith("event:")) event = line.slice(6).trim();
+    else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+  });
+  if (!dataLines.length) return null;
+  return { event, data: JSON.parse(dataLines.join("\n")) };
+}
+
+async function streamEvents(path, formData, onEvent, options = {}) {
+  const response = await fetch(`${BASE_URL}${path}`, {
+    method: "POST",
+    body: formData,
+    ...options,
+  });
+
+  if (!response.ok) {
+    const contentType = response.headers.get("content-type") || "";
+    const data = contentType.includes("application/json")
+      ? await response.json()
+      : await response.text();
+    const error = new Error("Request failed");
+    error.response = { status: response.status, data };
+    throw error;
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result = null;
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const parsed = parseEventBlock(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+      if (!parsed) continue;
+
+      if (parsed.event === "error") {
+        const error = new Error("Request failed");
+        error.response = { status: parsed.data?.status_code, data: parsed.data };
+        throw error;
+      }
+      if (parsed.event === "result") result = parsed.data;
+      if (onEvent) onEvent(parsed.event, parsed.data);
+    }
+  }
+
+  if (!result) {
+    throw new Error("Stream ended without a result");
+  }
+  return { data: result, status: response.status };
+}
+
 const api = {
   get(path, options = {}) {
     return request(path, { method: "GET", ...options });
@@ -45,6 +106,9 @@ const api = {
       ...options,
     });
   },
+  uploadStream(path, formData, onEvent, options = {}) {
+    return streamEvents(path, formData, onEvent, options);
+  },
 };
 
 export default api;